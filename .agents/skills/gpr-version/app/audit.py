@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from contextvars import ContextVar
 import json
 from typing import Any
 from sqlalchemy.orm import Session
@@ -7,6 +8,9 @@ from sqlalchemy.orm import Session
 from .models import AuditEvent
 from .metrics import domain_events_total
 
+# Set per request by MetricsAndAuditMiddleware; audit rows written during the request pick it up.
+correlation_id_var: ContextVar[str | None] = ContextVar("correlation_id", default=None)
+
 def log_event(
     db: Session,
     *,
@@ -23,7 +27,7 @@ def log_event(
         action=action,
         entity_type=entity_type,
         entity_id=str(entity_id),
-        correlation_id=correlation_id,
+        correlation_id=correlation_id or correlation_id_var.get(),
         details_json=json.dumps(details or {}, ensure_ascii=False),
     )
     db.add(ae)
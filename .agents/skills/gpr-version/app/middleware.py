@@ -2,43 +2,70 @@ from __future__ import annotations
 
 import time
 import uuid
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from sqlalchemy.orm import Session
 
+from .audit import correlation_id_var
 from .db import SessionLocal
 from .models import AuditEvent
 from .metrics import http_requests_total, http_request_latency_seconds
 
-class MetricsAndAuditMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class MetricsAndAuditMiddleware:
+    """Pure ASGI: no extra task or memory stream per request, streamed bodies pass through.
+
+    The correlation id is kept in ``correlation_id_var`` (and ``request.state``) for the whole
+    request, so audit rows written by routes and services carry it without passing it along.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start = time.time()
-        correlation_id = request.headers.get("x-correlation-id") or str(uuid.uuid4())
-        request.state.correlation_id = correlation_id
+        correlation_id = Headers(scope=scope).get("x-correlation-id") or str(uuid.uuid4())
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
+        token = correlation_id_var.set(correlation_id)
+        status_code = 500
 
-        response = await call_next(request)
+        async def send_with_correlation_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["x-correlation-id"] = correlation_id
+            await send(message)
 
-        path = request.url.path
-        method = request.method
-        status = str(response.status_code)
+        try:
+            await self.app(scope, receive, send_with_correlation_id)
+        finally:
+            # Recorded even when the route raised: no response was started, so it counts as a 500.
+            self._record(scope, status_code, time.time() - start, correlation_id)
+            correlation_id_var.reset(token)
+
+    @staticmethod
+    def _record(scope: Scope, status_code: int, elapsed: float, correlation_id: str) -> None:
+        path = scope["path"]
+        method = scope["method"]
+        status = str(status_code)
         http_requests_total.labels(method=method, path=path, status=status).inc()
-        http_request_latency_seconds.labels(method=method, path=path).observe(time.time() - start)
+        http_request_latency_seconds.labels(method=method, path=path).observe(elapsed)
 
         # Lightweight request audit
+        db: Session = SessionLocal()
         try:
-            db: Session = SessionLocal()
             ae = AuditEvent(
                 actor="anonymous",
                 action="http_request",
                 entity_type="http",
                 entity_id=f"{method} {path}",
                 correlation_id=correlation_id,
-                details_json=f'{{"status": {response.status_code}}}',
+                details_json=f'{{"status": {status_code}}}',
             )
             db.add(ae)
             db.commit()
         finally:
             db.close()
-
-        response.headers["x-correlation-id"] = correlation_id
-        return response
@@ -46,7 +46,6 @@ def create_card(payload: schemas.CardCreate, db: Session = Depends(get_db)):
         payload.title,
         payload.description,
         actor="anonymous",
-        corr=None,
     )
     return {"id": card.id}
 
@@ -56,7 +55,7 @@ def move_card(card_id: int, payload: schemas.CardMove, db: Session = Depends(get
     card = db.get(models.Card, card_id)
     if not card:
         raise HTTPException(status_code=404, detail="card not found")
-    services.move_card(db, card, payload.list_id, actor="anonymous", corr=None)
+    services.move_card(db, card, payload.list_id, actor="anonymous")
     return {"ok": True}
 
 
@@ -68,7 +67,6 @@ def create_incident(payload: schemas.IncidentCreate, db: Session = Depends(get_d
         payload.description,
         payload.severity,
         actor="anonymous",
-        corr=None,
     )
     return {"id": inc.id}
 
@@ -91,7 +89,7 @@ def add_incident_event(
     inc = db.get(models.Incident, incident_id)
     if not inc:
         raise HTTPException(status_code=404, detail="incident not found")
-    services.add_incident_event(db, inc, payload.kind, payload.message, actor="anonymous", corr=None)
+    services.add_incident_event(db, inc, payload.kind, payload.message, actor="anonymous")
     return {"ok": True}
 
 
@@ -104,7 +102,6 @@ def create_alert(payload: schemas.AlertCreate, db: Session = Depends(get_db)):
         payload.source,
         payload.message,
         actor="anonymous",
-        corr=None,
     )
     return {"id": alert.id, "fingerprint": alert.fingerprint}
 
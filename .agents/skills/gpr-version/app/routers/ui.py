@@ -41,23 +41,20 @@ def ui_home(request: Request, db: Session = Depends(get_db)):
 
 @router.post("/cards/create")
 def ui_create_card(
-    request: Request,
     title: str = Form(...),
     description: str | None = Form(None),
     list_id: int = Form(...),
     db: Session = Depends(get_db),
 ):
-    corr = getattr(request.state, "correlation_id", None)
-    services.create_card(db, list_id, title, description, actor="anonymous", corr=corr)
+    services.create_card(db, list_id, title, description, actor="anonymous")
     return RedirectResponse(url="/ui", status_code=303)
 
 
 @router.post("/cards/{card_id}/move")
-def ui_move_card(request: Request, card_id: int, list_id: int = Form(...), db: Session = Depends(get_db)):
-    corr = getattr(request.state, "correlation_id", None)
+def ui_move_card(card_id: int, list_id: int = Form(...), db: Session = Depends(get_db)):
     card = db.get(models.Card, card_id)
     if card:
-        services.move_card(db, card, list_id, actor="anonymous", corr=corr)
+        services.move_card(db, card, list_id, actor="anonymous")
     return HTMLResponse("OK")
 
 
@@ -69,15 +66,13 @@ def ui_incidents(request: Request, db: Session = Depends(get_db)):
 
 @router.post("/incidents/create")
 def ui_create_incident(
-    request: Request,
     title: str = Form(...),
     description: str | None = Form(None),
     severity: str = Form("medium"),
     db: Session = Depends(get_db),
 ):
-    corr = getattr(request.state, "correlation_id", None)
     sev = models.Severity(severity)
-    services.create_incident(db, title, description, sev, actor="anonymous", corr=corr)
+    services.create_incident(db, title, description, sev, actor="anonymous")
     return RedirectResponse(url="/ui/incidents", status_code=303)
 
 
@@ -98,16 +93,14 @@ def ui_incident_detail(request: Request, incident_id: int, db: Session = Depends
 
 @router.post("/incidents/{incident_id}/events")
 def ui_add_incident_event(
-    request: Request,
     incident_id: int,
     kind: str = Form("note"),
     message: str = Form(...),
     db: Session = Depends(get_db),
 ):
-    corr = getattr(request.state, "correlation_id", None)
     inc = db.get(models.Incident, incident_id)
     if inc:
-        services.add_incident_event(db, inc, kind, message, actor="anonymous", corr=corr)
+        services.add_incident_event(db, inc, kind, message, actor="anonymous")
     return RedirectResponse(url=f"/ui/incidents/{incident_id}", status_code=303)
 
 
@@ -119,16 +112,14 @@ def ui_alerts(request: Request, db: Session = Depends(get_db)):
 
 @router.post("/alerts/create")
 def ui_create_alert(
-    request: Request,
     name: str = Form(...),
     severity: str = Form("medium"),
     source: str = Form("manual"),
     message: str | None = Form(None),
     db: Session = Depends(get_db),
 ):
-    corr = getattr(request.state, "correlation_id", None)
     sev = models.Severity(severity)
-    services.create_alert(db, name, sev, source, message, actor="anonymous", corr=corr)
+    services.create_alert(db, name, sev, source, message, actor="anonymous")
     return RedirectResponse(url="/ui/alerts", status_code=303)
 
 
@@ -35,7 +35,6 @@ def create_card(
     title: str,
     description: str | None,
     actor: str,
-    corr: str | None,
 ):
     card = models.Card(list_id=list_id, title=title, description=description)
     db.add(card)
@@ -47,13 +46,12 @@ def create_card(
         action="card_created",
         entity_type="card",
         entity_id=card.id,
-        correlation_id=corr,
         details={"list_id": list_id, "title": title},
     )
     return card
 
 
-def move_card(db: Session, card: models.Card, new_list_id: int, actor: str, corr: str | None):
+def move_card(db: Session, card: models.Card, new_list_id: int, actor: str):
     old_list_id = card.list_id
     card.list_id = new_list_id
     card.updated_at = datetime.utcnow()
@@ -65,7 +63,6 @@ def move_card(db: Session, card: models.Card, new_list_id: int, actor: str, corr
         action="card_moved",
         entity_type="card",
         entity_id=card.id,
-        correlation_id=corr,
         details={"from_list_id": old_list_id, "to_list_id": new_list_id},
     )
 
@@ -76,7 +73,6 @@ def create_incident(
     description: str | None,
     severity: models.Severity,
     actor: str,
-    corr: str | None,
 ):
     inc = models.Incident(title=title, description=description, severity=severity)
     db.add(inc)
@@ -88,7 +84,6 @@ def create_incident(
         action="incident_created",
         entity_type="incident",
         entity_id=inc.id,
-        correlation_id=corr,
         details={"severity": severity.value, "title": title},
     )
     db.add(models.IncidentEvent(incident_id=inc.id, kind="note", message="Incident opened"))
@@ -102,7 +97,6 @@ def add_incident_event(
     kind: str,
     message: str,
     actor: str,
-    corr: str | None,
 ):
     ev = models.IncidentEvent(incident_id=inc.id, kind=kind, message=message)
     db.add(ev)
@@ -113,7 +107,6 @@ def add_incident_event(
         action="incident_event_added",
         entity_type="incident",
         entity_id=inc.id,
-        correlation_id=corr,
         details={"kind": kind, "message": message[:200]},
     )
 
@@ -130,7 +123,6 @@ def create_alert(
     source: str,
     message: str | None,
     actor: str,
-    corr: str | None,
 ):
     fp = fingerprint_alert(name, source, message)
     alert = models.Alert(name=name, severity=severity, source=source, message=message, fingerprint=fp)
@@ -143,7 +135,6 @@ def create_alert(
         action="alert_created",
         entity_type="alert",
         entity_id=alert.id,
-        correlation_id=corr,
         details={"severity": severity.value, "fingerprint": fp, "source": source},
     )
     return alert
@@ -0,0 +1,37 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.db import Base, SessionLocal, engine
+from app.middleware import MetricsAndAuditMiddleware
+from app.models import AuditEvent
+
+failing = FastAPI()
+failing.add_middleware(MetricsAndAuditMiddleware)
+
+
+@failing.get("/boom")
+def boom():
+    raise RuntimeError("route failed")
+
+
+def _requests_total(status):
+    return REGISTRY.get_sample_value(
+        "opsboard_http_requests_total", {"method": "GET", "path": "/boom", "status": status}
+    ) or 0
+
+
+def test_failing_route_is_recorded_as_500():
+    Base.metadata.create_all(bind=engine)
+    before = _requests_total("500")
+    r = TestClient(failing, raise_server_exceptions=False).get("/boom", headers={"x-correlation-id": "boom-1"})
+    assert r.status_code == 500
+    assert _requests_total("500") == before + 1
+
+    db = SessionLocal()
+    try:
+        event = db.query(AuditEvent).filter(AuditEvent.correlation_id == "boom-1").one()
+    finally:
+        db.close()
+    assert event.entity_id == "GET /boom"
+    assert event.details_json == '{"status": 500}'
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from postgrest.exceptions import APIError
+
+from app.obs import log_event
+
+OVERFLOW_POLICIES = {"block", "drop", "spill"}
+_STOP = object()
+# How a failed insert surfaces: PostgREST rejected it, or the request never got through.
+WRITE_ERRORS = (APIError, httpx.HTTPError, OSError)
+
+
+@dataclass
+class AuditSinkStats:
+    submitted: int = 0
+    written: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    failed_batches: int = 0
+
+
+class AuditSink:
+    """Bounded in-process queue of audit rows, written by a background thread in multi-row inserts.
+
+    A batch is flushed every ``batch_size`` rows or ``flush_interval_ms`` after its first row,
+    whichever comes first. When the queue is full ``overflow`` decides what happens:
+    ``block`` waits for room, ``drop`` discards the row, ``spill`` appends it to ``spill_path``
+    (NDJSON). Batches the writer fails on are spilled too when a spill file is configured. Spilled
+    rows are replayed on the next ``start()``; ``close()`` drains the queue before returning.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[list[dict[str, Any]]], None],
+        max_queue: int = 10_000,
+        batch_size: int = 100,
+        flush_interval_ms: float = 200,
+        overflow: str = "block",
+        spill_path: str | None = None,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {sorted(OVERFLOW_POLICIES)}")
+        if overflow == "spill" and not spill_path:
+            raise ValueError("overflow=spill needs spill_path")
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.overflow = overflow
+        self.spill_path = spill_path
+        self.stats = AuditSinkStats()
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue)
+        self._spill_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._replay_spill()
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self._thread.start()
+
+    def submit(self, row: dict[str, Any]) -> bool:
+        """Queue a row; returns False when it was dropped."""
+        self.stats.submitted += 1
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            pass
+        if self.overflow == "block":
+            self._queue.put(row)
+            return True
+        return self._overflow([row])
+
+    async def asubmit(self, row: dict[str, Any]) -> bool:
+        """``submit`` for the event loop: a blocking wait for room happens off the loop."""
+        self.stats.submitted += 1
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            pass
+        if self.overflow == "block":
+            await asyncio.to_thread(self._queue.put, row)
+            return True
+        return self._overflow([row])
+
+    def flush(self) -> None:
+        """Wait until every queued row has been handed to the writer."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _overflow(self, rows: list[dict[str, Any]]) -> bool:
+        if self.spill_path:
+            self._spill(rows)
+            return True
+        self.stats.dropped += len(rows)
+        return False
+
+    def _spill(self, rows: list[dict[str, Any]]) -> None:
+        with self._spill_lock, open(self.spill_path, "a", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(row, ensure_ascii=True) + "\n" for row in rows)
+        self.stats.spilled += len(rows)
+
+    def _replay_spill(self) -> None:
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        with self._spill_lock:
+            with open(self.spill_path, encoding="utf-8") as handle:
+                rows = [json.loads(line) for line in handle if line.strip()]
+            try:
+                for start in range(0, len(rows), self.batch_size):
+                    self.writer(rows[start : start + self.batch_size])
+            except WRITE_ERRORS as exc:
+                log_event("audit_spill_replay_failed", rows=len(rows), error=type(exc).__name__)
+                return
+            os.remove(self.spill_path)
+        self.stats.written += len(rows)
+        log_event("audit_spill_replayed", rows=len(rows))
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        try:
+            self.writer(batch)
+            self.stats.written += len(batch)
+        # Catch-all on purpose: the writer thread must survive any bad batch, or flush() and
+        # close() would hang.
+        except Exception as exc:  # noqa: BLE001
+            self.stats.failed_batches += 1
+            log_event("audit_write_failed", rows=len(batch), error=type(exc).__name__)
+            self._overflow(batch)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+        # Shutdown: whatever is still queued goes out in full batches.
+        rest: list[dict[str, Any]] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+            if item is not _STOP:
+                rest.append(item)
+        for start in range(0, len(rest), self.batch_size):
+            self._write(rest[start : start + self.batch_size])
@@ -0,0 +1,446 @@
+from __future__ import annotations
+
+import codecs
+import json
+import time
+import zlib
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import uuid4
+
+import httpx
+from postgrest.exceptions import APIError
+
+from app.db import EXPORT_PAGE_SIZE, RESTORE_ORDER, TABLES
+from app.obs import log_event
+
+BACKUP_FORMATS = {"json", "ndjson"}
+MEDIA_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+# Rows per staging insert; keeps each PostgREST request well under body-size limits.
+IMPORT_CHUNK_ROWS = 500
+UPLOAD_READ_BYTES = 64 * 1024
+# A single row larger than this means the file is not a backup we wrote.
+MAX_ROW_CHARS = 16 * 1024 * 1024
+
+# Audit actions that mark a row as deleted; delta replay turns them into tombstones.
+DELETE_ACTIONS = {"card_deleted": "cards"}
+# One DR import at a time across every process: the staging tables are shared. Renewed while
+# staging, so the TTL only matters when an importer dies without releasing it.
+RESTORE_LEASE = "dr-restore"
+RESTORE_LEASE_TTL = 300
+# Clocks of the writers (app replicas, audit sink) drift; deltas re-export a little before the
+# watermark. Replay is an upsert, so the overlap is harmless.
+DELTA_OVERLAP = timedelta(seconds=60)
+
+_MORE = object()
+
+
+class RestoreInProgress(Exception):
+    """Another import holds the restore lease (its staged rows must not be touched)."""
+
+
+def _dumps(row: dict[str, Any]) -> str:
+    return json.dumps(row, ensure_ascii=True, separators=(",", ":"))
+
+
+async def iter_table_pages(
+    db, table: str, page_size: int = EXPORT_PAGE_SIZE, since: str | None = None
+) -> AsyncIterator[list[dict[str, Any]]]:
+    cursor = None
+    while True:
+        page = await db.export_page(table, cursor=cursor, limit=page_size, since=since)
+        if page.items:
+            yield page.items
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
+
+
+def backup_meta(since: datetime | None, exported_at: datetime) -> dict[str, Any]:
+    """The ``meta`` entry written first in every export: what a delta covers, for chain checks."""
+    return {"since": since.isoformat() if since else None, "exported_at": exported_at.isoformat()}
+
+
+async def stream_backup(
+    db,
+    fmt: str = "json",
+    page_size: int = EXPORT_PAGE_SIZE,
+    since: datetime | None = None,
+    exported_at: datetime | None = None,
+) -> AsyncIterator[bytes]:
+    """Yield the backup one keyset page at a time, so memory is bounded by ``page_size`` rows.
+
+    ``json`` keeps the ``{"<table>": [rows...]}`` shape older backups have; ``ndjson`` writes one
+    ``{"table": ..., "row": ...}`` object per line. With ``since`` only rows changed after that
+    watermark (less :data:`DELTA_OVERLAP`) are written: a delta for :func:`restore_backup`.
+    With ``exported_at`` (the watermark the next delta starts from) a :func:`backup_meta`
+    entry comes first, ``"meta": {...}`` or a ``{"meta": {...}}`` line.
+    """
+    if fmt not in BACKUP_FORMATS:
+        raise ValueError(f"format must be one of {sorted(BACKUP_FORMATS)}")
+    watermark = (since - DELTA_OVERLAP).isoformat() if since else None
+    meta = backup_meta(since, exported_at) if exported_at else None
+    if fmt == "ndjson":
+        if meta:
+            yield (_dumps({"meta": meta}) + "\n").encode()
+        for table in TABLES:
+            async for rows in iter_table_pages(db, table, page_size, watermark):
+                yield "".join(_dumps({"table": table, "row": row}) + "\n" for row in rows).encode()
+        return
+
+    yield b"{"
+    if meta:
+        yield f'\n"meta":{_dumps(meta)},'.encode()
+    for index, table in enumerate(TABLES):
+        yield f'{"," if index else ""}\n"{table}":['.encode()
+        first = True
+        async for rows in iter_table_pages(db, table, page_size, watermark):
+            body = ",\n".join(_dumps(row) for row in rows)
+            yield (("\n" if first else ",\n") + body).encode()
+            first = False
+        yield b"]"
+    yield b"\n}\n"
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class BackupParser:
+    """Incremental parser for both backup formats, gzipped or not.
+
+    ``feed`` takes raw bytes as they arrive and returns the complete ``(table, row)`` pairs found
+    so far; ``close`` returns the rest and rejects a truncated file. Only the unparsed tail (at
+    most about one row) is kept between calls. JSON backups are walked token by token with
+    ``raw_decode``, so a multi-gigabyte ``{"table": [...]}`` document is never loaded whole.
+    The export's ``meta`` entry, when there is one, ends up in ``meta``.
+    """
+
+    def __init__(self, tables: list[str] = RESTORE_ORDER):
+        self.tables = set(tables)
+        self.format: str | None = None
+        self.meta: dict[str, Any] | None = None
+        self._head = b""
+        self._gunzip: Any = None
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._table: str | None = None
+
+    def feed(self, data: bytes) -> list[tuple[str, dict[str, Any]]]:
+        if self._head is not None:
+            # Need two bytes to recognise the gzip magic.
+            self._head += data
+            if len(self._head) < 2:
+                return []
+            data, self._head = self._head, None
+            if data[:2] == b"\x1f\x8b":
+                self._gunzip = zlib.decompressobj(31)
+        return self._consume(data, final=False)
+
+    def close(self) -> list[tuple[str, dict[str, Any]]]:
+        data, self._head = self._head or b"", None
+        rows = self._consume(data, final=True)
+        if self.format is None:
+            raise ValueError("Empty backup")
+        if self.format == "json" and self._state != "done":
+            raise ValueError("Truncated backup")
+        return rows
+
+    def _consume(self, data: bytes, final: bool) -> list[tuple[str, dict[str, Any]]]:
+        try:
+            if self._gunzip is not None:
+                data = self._gunzip.decompress(data) + (self._gunzip.flush() if final else b"")
+        except zlib.error as exc:
+            raise ValueError("Corrupt gzip stream") from exc
+        self._buf = self._buf[self._pos :] + self._text.decode(data, final=final)
+        self._pos = 0
+        if self.format is None and not self._sniff(final):
+            return []
+        rows = self._parse_ndjson(final) if self.format == "ndjson" else self._parse_json(final)
+        if len(self._buf) - self._pos > MAX_ROW_CHARS:
+            raise ValueError("Backup row too large")
+        return rows
+
+    def _sniff(self, final: bool) -> bool:
+        # NDJSON: the first line is a complete {"table", "row"} object. A JSON backup's first
+        # line is "{" (or, for a compact one-line file, an object keyed by table names).
+        self._buf = self._buf.lstrip()
+        newline = self._buf.find("\n")
+        if newline == -1 and not final:
+            return False
+        if not self._buf:
+            return False
+        try:
+            first = json.loads(self._buf[:newline] if newline != -1 else self._buf)
+        except ValueError:
+            first = None
+        ndjson = isinstance(first, dict) and ("row" in first or set(first) == {"meta"})
+        self.format = "ndjson" if ndjson else "json"
+        return True
+
+    def _meta(self, value: Any) -> None:
+        if not isinstance(value, dict):
+            # ValueError on purpose: every malformed backup is one error type, mapped to a 400.
+            raise ValueError("Backup meta is not an object")  # noqa: TRY004
+        self.meta = value
+
+    def _row(self, table: Any, row: Any) -> tuple[str, dict[str, Any]]:
+        if table not in self.tables:
+            raise ValueError(f"Unknown table {table!r}")
+        if not isinstance(row, dict):
+            raise ValueError(f"Row in {table} is not an object")  # noqa: TRY004 - see _meta
+        return table, row
+
+    def _parse_ndjson(self, final: bool) -> list[tuple[str, dict[str, Any]]]:
+        lines = self._buf.split("\n")
+        complete, self._buf = (lines, "") if final else (lines[:-1], lines[-1])
+        rows = []
+        for line in complete:
+            if line.strip():
+                entry = json.loads(line)
+                if isinstance(entry, dict) and set(entry) == {"meta"}:
+                    self._meta(entry["meta"])
+                    continue
+                rows.append(self._row(entry.get("table"), entry.get("row")))
+        return rows
+
+    def _decode(self, final: bool) -> Any:
+        try:
+            value, self._pos = self._json.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _MORE
+        return value
+
+    def _expect(self, char: str, allowed: str) -> None:
+        if char not in allowed:
+            raise ValueError(f"Unexpected {char!r} in backup")
+        self._pos += 1
+
+    def _parse_json(self, final: bool) -> list[tuple[str, dict[str, Any]]]:
+        rows = []
+        buf = self._buf
+        while True:
+            while self._pos < len(buf) and buf[self._pos].isspace():
+                self._pos += 1
+            if self._pos >= len(buf):
+                break
+            char, state = buf[self._pos], self._state
+            if state == "start":
+                self._expect(char, "{")
+                self._state = "key"
+            elif state == "key" and char == "}":
+                self._expect(char, "}")
+                self._state = "done"
+            elif state == "key":
+                table = self._decode(final)
+                if table is _MORE:
+                    break
+                self._table, self._state = table, "colon"
+            elif state == "colon":
+                self._expect(char, ":")
+                self._state = "open"
+            elif state == "open" and self._table == "meta":
+                meta = self._decode(final)
+                if meta is _MORE:
+                    break
+                self._meta(meta)
+                self._state = "after_table"
+            elif state == "open":
+                self._expect(char, "[")
+                self._state = "item"
+            elif state == "item" and char == "]":
+                self._expect(char, "]")
+                self._state = "after_table"
+            elif state == "item":
+                row = self._decode(final)
+                if row is _MORE:
+                    break
+                rows.append(self._row(self._table, row))
+                self._state = "after_item"
+            elif state == "after_item":
+                self._expect(char, ",]")
+                self._state = "item" if char == "," else "after_table"
+            elif state == "after_table":
+                self._expect(char, ",}")
+                self._state = "key" if char == "," else "done"
+            else:
+                raise ValueError("Unexpected data after backup")
+        return rows
+
+
+def load_backup(raw: bytes) -> dict[str, list[dict[str, Any]]]:
+    """Parse a whole backup held in memory (either format, optionally gzipped)."""
+    parser = BackupParser(TABLES)
+    tables: dict[str, list[dict[str, Any]]] = {}
+    for table, row in parser.feed(raw) + parser.close():
+        tables.setdefault(table, []).append(row)
+    return tables
+
+
+async def iter_upload(file, chunk_bytes: int = UPLOAD_READ_BYTES) -> AsyncIterator[bytes]:
+    while chunk := await file.read(chunk_bytes):
+        yield chunk
+
+
+async def read_upload_meta(file, chunk_bytes: int = UPLOAD_READ_BYTES) -> dict[str, Any] | None:
+    """The ``meta`` entry at the head of an uploaded backup (None for older exports); rewinds it."""
+    parser = BackupParser()
+    try:
+        while chunk := await file.read(chunk_bytes):
+            # The meta entry comes first: once rows appear there is none.
+            if parser.feed(chunk) or parser.meta is not None:
+                break
+    finally:
+        await file.seek(0)
+    return parser.meta
+
+
+def _meta_time(meta: dict[str, Any] | None, key: str) -> datetime | None:
+    value = (meta or {}).get(key)
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Bad {key} in backup meta") from exc
+
+
+def order_delta_chain(base: dict[str, Any] | None, deltas: list[dict[str, Any] | None]) -> list[int]:
+    """Replay order of ``deltas`` (their ``meta`` entries), by the watermark each one starts at.
+
+    Each delta has to start exactly where the previous file (the base first) ended: a gap would
+    silently lose changes and an overlap means two deltas were taken from the same watermark.
+    Filenames are not trusted. Raises ValueError for a delta without meta, a gap or an overlap.
+    Returns indexes into ``deltas``.
+    """
+    starts = []
+    for index, meta in enumerate(deltas):
+        since = _meta_time(meta, "since")
+        if since is None:
+            raise ValueError(f"Delta {index + 1} has no since watermark (re-export it)")
+        starts.append((since, index))
+    order = [index for _, index in sorted(starts)]
+    # Older base backups carry no meta; the chain is then checked from the first delta on.
+    previous = _meta_time(base, "exported_at")
+    for index in order:
+        since = _meta_time(deltas[index], "since")
+        if previous is not None and since != previous:
+            problem = "gap" if since > previous else "overlap"
+            raise ValueError(
+                f"Delta chain {problem}: a delta starts at {since.isoformat()}, "
+                f"expected {previous.isoformat()}"
+            )
+        previous = _meta_time(deltas[index], "exported_at")
+    return order
+
+
+class _RestoreLease:
+    """The ``dr-restore`` lease (migrations/007) held for one whole reset -> stage -> commit."""
+
+    def __init__(self, db, ttl: int = RESTORE_LEASE_TTL):
+        self.db = db
+        self.ttl = ttl
+        self.holder = f"restore:{uuid4().hex}"
+        self.held = False
+        self._renew_at = 0.0
+
+    async def acquire(self) -> None:
+        self.held = await self.db.acquire_lease(RESTORE_LEASE, self.holder, self.ttl)
+        if not self.held:
+            raise RestoreInProgress("Another restore is in progress")
+        self._renew_at = time.monotonic() + self.ttl / 2
+
+    async def keep(self) -> None:
+        """Renew once half the TTL has passed; fails if another import took the lease over."""
+        if time.monotonic() >= self._renew_at:
+            await self.acquire()
+
+    async def release(self) -> None:
+        if self.held:
+            self.held = False
+            await self.db.release_lease(RESTORE_LEASE, self.holder)
+
+
+async def _stage_backup(
+    db, chunks: AsyncIterator[bytes], delta: bool, chunk_rows: int, lease: _RestoreLease
+) -> dict[str, int]:
+    parser = BackupParser()
+    pending: dict[str, list[dict[str, Any]]] = {table: [] for table in RESTORE_ORDER}
+    staged = dict.fromkeys(RESTORE_ORDER, 0)
+    tombstones: dict[str, list[str]] = {}
+
+    async def flush(table: str) -> None:
+        rows, pending[table] = pending[table], []
+        if rows:
+            await lease.keep()
+            await db.restore_stage(table, rows, upsert=delta)
+            staged[table] += len(rows)
+            log_event("restore_progress", table=table, staged_rows=staged[table], delta=delta)
+
+    async def add(parsed: list[tuple[str, dict[str, Any]]]) -> None:
+        for table, row in parsed:
+            pending[table].append(row)
+            if delta and table == "audit_events" and row.get("action") in DELETE_ACTIONS:
+                tombstones.setdefault(DELETE_ACTIONS[row["action"]], []).append(row["entity_id"])
+            if len(pending[table]) >= chunk_rows:
+                await flush(table)
+
+    async for chunk in chunks:
+        await add(parser.feed(chunk))
+    await add(parser.close())
+    for table in RESTORE_ORDER:
+        await flush(table)
+    # After the delta's upserts: a row changed and then deleted inside the window must go.
+    for table, ids in tombstones.items():
+        await db.restore_discard(table, ids)
+    return staged
+
+
+async def restore_backup(
+    db,
+    backups: list[AsyncIterator[bytes]],
+    chunk_rows: int = IMPORT_CHUNK_ROWS,
+) -> dict[str, int]:
+    """Stream a base backup plus any deltas into the staging tables, then swap them in with one
+    ``restore_commit``.
+
+    ``backups[0]`` is a full export; the rest are ``?since=`` deltas in the order they were taken.
+    Delta rows are upserted over the staged base by id and the delta's ``card_deleted`` audit
+    events drop the deleted cards again. Rows are staged in ``chunk_rows`` batches per table as
+    they are parsed, so memory is bounded by the chunk size rather than the backup. Any error
+    (bad file, failed insert) discards the staging tables and leaves the live data as it was.
+    Returns the restored row count per table.
+
+    The staging tables are shared, so the whole cycle runs under the ``dr-restore`` lease;
+    a second import while one is running raises :class:`RestoreInProgress` and touches nothing.
+    """
+    lease = _RestoreLease(db)
+    await lease.acquire()
+    try:
+        await db.restore_reset()
+        try:
+            for index, chunks in enumerate(backups):
+                await _stage_backup(db, chunks, index > 0, chunk_rows, lease)
+            await lease.keep()
+            restored = await db.restore_commit()
+        except Exception as exc:
+            # A lost lease means the staged rows may be another import's by now.
+            if not isinstance(exc, RestoreInProgress):
+                try:
+                    await db.restore_reset()
+                except (APIError, httpx.HTTPError, OSError) as cleanup_exc:
+                    log_event("restore_cleanup_failed", error=type(cleanup_exc).__name__)
+            raise
+    finally:
+        await lease.release()
+    log_event("restore_committed", rows=restored, files=len(backups))
+    return restored
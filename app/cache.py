@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Protocol
+
+from app.config import get_settings
+from app.obs import log_event, metrics
+from app.pagination import Page
+
+# Listing namespaces and the tables whose writes make them stale.
+NAMESPACES = ("cards", "alerts", "incidents")
+CACHE_BACKENDS = {"memory", "redis", "off"}
+_REDIS_PREFIX = "opsboard:cache:"
+
+try:
+    from redis.exceptions import RedisError
+except ImportError:  # without the cache extra only the memory backend is available
+    REDIS_ERRORS: tuple[type[Exception], ...] = (OSError,)
+else:
+    # What a Redis outage looks like; anything else (a serializer bug) is not a cache miss.
+    REDIS_ERRORS = (RedisError, OSError)
+
+
+class CacheBackend(Protocol):
+    """Key-value store under :class:`ListingCache`; values are JSON-compatible dicts.
+
+    ``invalidate`` drops a whole namespace at once. The ``a``-prefixed twins are for the event
+    loop; a backend without I/O can simply call its sync methods.
+    """
+
+    def get(self, namespace: str, key: str) -> dict[str, Any] | None: ...
+
+    def set(self, namespace: str, key: str, value: dict[str, Any], ttl: float) -> None: ...
+
+    def invalidate(self, namespaces: tuple[str, ...]) -> None: ...
+
+    async def aget(self, namespace: str, key: str) -> dict[str, Any] | None: ...
+
+    async def aset(self, namespace: str, key: str, value: dict[str, Any], ttl: float) -> None: ...
+
+    async def ainvalidate(self, namespaces: tuple[str, ...]) -> None: ...
+
+
+class InMemoryCacheBackend:
+    """Per-process LRU with per-entry expiry, bounded to ``max_entries``.
+
+    Invalidation bumps the namespace's generation instead of scanning: entries of an older
+    generation are never read again and age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int, str], tuple[float, dict[str, Any]]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry_key = (namespace, self._generations.get(namespace, 0), key)
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[entry_key]
+                return None
+            self._entries.move_to_end(entry_key)
+            return value
+
+    def set(self, namespace: str, key: str, value: dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            entry_key = (namespace, self._generations.get(namespace, 0), key)
+            self._entries[entry_key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespaces: tuple[str, ...]) -> None:
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    async def aget(self, namespace: str, key: str) -> dict[str, Any] | None:
+        return self.get(namespace, key)
+
+    async def aset(self, namespace: str, key: str, value: dict[str, Any], ttl: float) -> None:
+        self.set(namespace, key, value, ttl)
+
+    async def ainvalidate(self, namespaces: tuple[str, ...]) -> None:
+        self.invalidate(namespaces)
+
+
+class RedisCacheBackend:
+    """Shared cache for several workers (or replicas) on a Redis-compatible server.
+
+    One hash per namespace, so a lookup is one ``HGET`` and invalidation one ``DEL``. Entries
+    carry their own expiry; the hash's ``EXPIRE`` only garbage-collects namespaces nobody reads.
+    Eviction is the server's job: run it with ``maxmemory-policy allkeys-lru``. Needs the
+    ``cache`` extra (redis-py).
+    """
+
+    def __init__(self, url: str, client: Any = None, async_client: Any = None):
+        if client is None or async_client is None:
+            try:
+                import redis
+                import redis.asyncio
+            except ImportError as exc:  # pragma: no cover
+                raise RuntimeError("CACHE_BACKEND=redis needs redis-py: pip install -e .[cache]") from exc
+            client = client or redis.Redis.from_url(url)
+            async_client = async_client or redis.asyncio.Redis.from_url(url)
+        self._client = client
+        self._async_client = async_client
+
+    @staticmethod
+    def _decode(raw: bytes | str | None) -> dict[str, Any] | None:
+        if raw is None:
+            return None
+        expires_at, value = json.loads(raw)
+        return value if expires_at > time.time() else None
+
+    @staticmethod
+    def _encode(value: dict[str, Any], ttl: float) -> str:
+        return json.dumps([time.time() + ttl, value], separators=(",", ":"))
+
+    def get(self, namespace: str, key: str) -> dict[str, Any] | None:
+        return self._decode(self._client.hget(_REDIS_PREFIX + namespace, key))
+
+    def set(self, namespace: str, key: str, value: dict[str, Any], ttl: float) -> None:
+        name = _REDIS_PREFIX + namespace
+        pipe = self._client.pipeline()
+        pipe.hset(name, key, self._encode(value, ttl))
+        pipe.expire(name, max(1, int(ttl * 10)))
+        pipe.execute()
+
+    def invalidate(self, namespaces: tuple[str, ...]) -> None:
+        self._client.delete(*(_REDIS_PREFIX + namespace for namespace in namespaces))
+
+    async def aget(self, namespace: str, key: str) -> dict[str, Any] | None:
+        return self._decode(await self._async_client.hget(_REDIS_PREFIX + namespace, key))
+
+    async def aset(self, namespace: str, key: str, value: dict[str, Any], ttl: float) -> None:
+        name = _REDIS_PREFIX + namespace
+        pipe = self._async_client.pipeline()
+        pipe.hset(name, key, self._encode(value, ttl))
+        pipe.expire(name, max(1, int(ttl * 10)))
+        await pipe.execute()
+
+    async def ainvalidate(self, namespaces: tuple[str, ...]) -> None:
+        await self._async_client.delete(*(_REDIS_PREFIX + namespace for namespace in namespaces))
+
+
+class ListingCache:
+    """Read-through cache of listing pages (``list_cards``/``list_alerts``/``list_incidents``).
+
+    DataAccess looks a page up by ``(namespace, limit, cursor, version)``, falls back to
+    Supabase on a miss and stores the result for ``ttl`` seconds; its mutations call
+    ``invalidate`` for the namespaces they touch. Redis and connection errors never fail a
+    request: they count as a miss (or a skipped store) and are logged. Other exceptions are
+    bugs and propagate. Lookups are counted in ``opsboard_cache_requests_total``.
+
+    ``version`` is the table's write counter (migration 012) read *before* the query, the same
+    value the route's ETag is made from. A page is only ever served for the version it was
+    fetched under, so a read racing a write, or a write from another process the memory
+    backend never hears about (the watcher), cannot put a stale page behind a current ETag.
+    Without a version, staleness is bounded by ``ttl`` where invalidation cannot reach: a
+    failed ``invalidate``, a read that started before a write and stores its page after it, and
+    writes from other processes when the backend is not shared.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def key(limit: int, cursor: str | None, version: int | None = None) -> str:
+        key = f"{limit}:{cursor or ''}"
+        return key if version is None else f"{key}@{version}"
+
+    def _count(self, namespace: str, result: str) -> None:
+        metrics.inc("opsboard_cache_requests_total", {"namespace": namespace, "result": result})
+
+    def _failed(self, operation: str, namespace: str, exc: Exception) -> None:
+        self._count(namespace, "error")
+        log_event("cache_failed", operation=operation, namespace=namespace, error=type(exc).__name__)
+
+    def _hit(self, namespace: str, value: dict[str, Any] | None) -> Page | None:
+        if value is None:
+            self._count(namespace, "miss")
+            return None
+        self._count(namespace, "hit")
+        return Page(items=value["items"], next_cursor=value["next_cursor"])
+
+    def get(
+        self, namespace: str, limit: int, cursor: str | None, version: int | None = None
+    ) -> Page | None:
+        try:
+            return self._hit(namespace, self.backend.get(namespace, self.key(limit, cursor, version)))
+        except REDIS_ERRORS as exc:
+            self._failed("get", namespace, exc)
+            return None
+
+    def set(
+        self, namespace: str, limit: int, cursor: str | None, page: Page, version: int | None = None
+    ) -> None:
+        try:
+            self.backend.set(namespace, self.key(limit, cursor, version), page.to_dict(), self.ttl)
+        except REDIS_ERRORS as exc:
+            self._failed("set", namespace, exc)
+
+    def invalidate(self, *namespaces: str) -> None:
+        try:
+            self.backend.invalidate(namespaces)
+        except REDIS_ERRORS as exc:
+            self._failed("invalidate", ",".join(namespaces), exc)
+
+    async def aget(
+        self, namespace: str, limit: int, cursor: str | None, version: int | None = None
+    ) -> Page | None:
+        try:
+            return self._hit(namespace, await self.backend.aget(namespace, self.key(limit, cursor, version)))
+        except REDIS_ERRORS as exc:
+            self._failed("get", namespace, exc)
+            return None
+
+    async def aset(
+        self, namespace: str, limit: int, cursor: str | None, page: Page, version: int | None = None
+    ) -> None:
+        try:
+            await self.backend.aset(namespace, self.key(limit, cursor, version), page.to_dict(), self.ttl)
+        except REDIS_ERRORS as exc:
+            self._failed("set", namespace, exc)
+
+    async def ainvalidate(self, *namespaces: str) -> None:
+        try:
+            await self.backend.ainvalidate(namespaces)
+        except REDIS_ERRORS as exc:
+            self._failed("invalidate", ",".join(namespaces), exc)
+
+
+@lru_cache
+def get_listing_cache() -> ListingCache | None:
+    """The process-wide cache, shared by the sync and async DataAccess pools."""
+    settings = get_settings()
+    if settings.cache_backend not in CACHE_BACKENDS:
+        raise ValueError(f"CACHE_BACKEND must be one of {sorted(CACHE_BACKENDS)}")
+    if settings.cache_backend == "off" or settings.cache_ttl_seconds <= 0:
+        return None
+    if settings.cache_backend == "redis":
+        backend: CacheBackend = RedisCacheBackend(settings.cache_redis_url)
+    else:
+        backend = InMemoryCacheBackend(settings.cache_max_entries)
+    return ListingCache(backend, settings.cache_ttl_seconds)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Deploy-specific part of every ETag, so a new release (templates, JSON shape) never matches
+# tags handed out by the previous one.
+_VERSION_FILE = Path(__file__).resolve().parent.parent / "VERSION"
+BUILD_TOKEN = "|".join(
+    [
+        _VERSION_FILE.read_text().strip() if _VERSION_FILE.exists() else "",
+        os.getenv("VERCEL_GIT_COMMIT_SHA", ""),
+    ]
+)
+
+
+class NotModified(Exception):
+    """Raised by the conditional-GET dependency; answered with an empty 304."""
+
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+def make_etag(request: Request, versions: dict[str, int], vary: str = "") -> str:
+    """Weak ETag of a response that depends only on the URL, the table versions and ``vary``."""
+    seed = "|".join(
+        [
+            BUILD_TOKEN,
+            request.url.path,
+            request.url.query,
+            ",".join(f"{table}={version}" for table, version in sorted(versions.items())),
+            vary,
+        ]
+    )
+    return f'W/"{hashlib.blake2b(seed.encode("utf-8"), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """``If-None-Match`` uses the weak comparison (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified_response(request: Request, exc: NotModified) -> Response:
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": "no-cache"})
+
+
+class ETagMiddleware:
+    """Adds the ETag a route's conditional-GET dependency computed to its 200 response.
+
+    Routes return TemplateResponse/JSONResponse objects, which FastAPI does not merge dependency
+    headers into, so the tag travels in ``request.state.etag`` and is set here on the way out.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                etag = scope.get("state", {}).get("etag")
+                if etag:
+                    headers = MutableHeaders(scope=message)
+                    headers["ETag"] = etag
+                    # Stored, but revalidated on every poll.
+                    headers["Cache-Control"] = "no-cache"
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
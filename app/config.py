@@ -8,7 +8,55 @@ class Settings(BaseModel):
     env: str = os.getenv("APP_ENV", "dev")
     supabase_url: str = os.getenv("SUPABASE_URL", "")
     supabase_anon_key: str = os.getenv("SUPABASE_ANON_KEY", "")
+    # Direct (session-mode) Postgres DSN; only the LISTEN-based watcher needs it.
+    database_url: str = os.getenv("DATABASE_URL", "")
     llm_api_key: str = os.getenv("LLM_API_KEY", "")
+    readiness_ttl_seconds: float = float(os.getenv("READINESS_TTL_SECONDS", "5"))
+    # Background audit writer; serverless runtimes freeze threads between invocations, so off there.
+    audit_async: bool = os.getenv("AUDIT_ASYNC", "0" if os.getenv("VERCEL") else "1") == "1"
+    audit_queue_size: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    audit_batch_size: int = int(os.getenv("AUDIT_BATCH_SIZE", "100"))
+    audit_flush_ms: float = float(os.getenv("AUDIT_FLUSH_MS", "200"))
+    audit_overflow: str = os.getenv("AUDIT_OVERFLOW", "block")
+    audit_spill_path: str = os.getenv("AUDIT_SPILL_PATH", "/tmp/opsboard-audit-spill.ndjson")
+    supabase_pool_size: int = int(os.getenv("SUPABASE_POOL_SIZE", "20"))
+    supabase_keepalive_seconds: float = float(os.getenv("SUPABASE_KEEPALIVE_SECONDS", "30"))
+    supabase_client_max_age_seconds: float = float(os.getenv("SUPABASE_CLIENT_MAX_AGE_SECONDS", "900"))
+    # A replaced client stays open this long for requests still running on it, then is closed.
+    supabase_client_retire_seconds: float = float(os.getenv("SUPABASE_CLIENT_RETIRE_SECONDS", "60"))
+    counts_estimated: bool = os.getenv("COUNTS_ESTIMATED", "").lower() in {"1", "true", "yes"}
+    supabase_timeout_seconds: float = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "10"))
+    # Read-through cache of the board/alerts/incidents listings: memory | redis | off.
+    cache_backend: str = os.getenv("CACHE_BACKEND", "memory")
+    cache_ttl_seconds: float = float(os.getenv("CACHE_TTL_SECONDS", "5"))
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    cache_redis_url: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    log_access_level: str = os.getenv("LOG_ACCESS_LEVEL", "INFO")
+    # Log writes on a background thread; like the audit sink, off on serverless.
+    log_async: bool = os.getenv("LOG_ASYNC", "0" if os.getenv("VERCEL") else "1") == "1"
+    log_queue_size: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Share of ordinary http_request lines kept; 5xx and slow requests are always logged.
+    log_http_sample_rate: float = float(os.getenv("LOG_HTTP_SAMPLE_RATE", "1"))
+    log_http_skip_routes: str = os.getenv("LOG_HTTP_SKIP_ROUTES", "/livez,/readyz")
+    log_http_slow_ms: float = float(os.getenv("LOG_HTTP_SLOW_MS", "1000"))
+    # Shared directory for per-worker metric files (uvicorn --workers / gunicorn); empty = in-process.
+    metrics_multiproc_dir: str = os.getenv("METRICS_MULTIPROC_DIR", "")
+    # Live page updates over SSE (/events); serverless runtimes cannot hold the connection open.
+    events_enabled: bool = os.getenv("EVENTS_ENABLED", "0" if os.getenv("VERCEL") else "1") == "1"
+    events_queue_size: int = int(os.getenv("EVENTS_QUEUE_SIZE", "64"))
+    events_history_size: int = int(os.getenv("EVENTS_HISTORY_SIZE", "256"))
+    events_heartbeat_seconds: float = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+    # Streams end after this long and the browser reconnects (resuming by event id), so a
+    # shutdown or deploy never waits on open viewers for more than one period.
+    events_max_stream_seconds: float = float(os.getenv("EVENTS_MAX_STREAM_SECONDS", "300"))
+    # memory: only this process's writes are pushed | redis: all workers and the watcher share
+    # events over pub/sub (EVENTS_REDIS_URL, defaults to the cache's Redis).
+    events_backend: str = os.getenv("EVENTS_BACKEND", "memory")
+    events_redis_url: str = os.getenv("EVENTS_REDIS_URL", os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"))
+    # memory backend only, opt-in: streams end with a resync this often so other processes'
+    # writes reach the page when several workers or the watcher run without Redis.
+    events_resync_seconds: float = float(os.getenv("EVENTS_RESYNC_SECONDS", "0"))
 
 
 @lru_cache
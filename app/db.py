@@ -1,26 +1,126 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
-from supabase import Client, create_client
+import httpx
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+from supabase import (
+    AsyncClient,
+    AsyncClientOptions,
+    Client,
+    ClientOptions,
+    acreate_client,
+    create_client,
+)
 
+from app.audit import AuditSink
+from app.cache import NAMESPACES, ListingCache, get_listing_cache
 from app.config import get_settings
+from app.events import EventBroker, get_event_broker
+from app.pagination import Page, clamp_page_size, keyset_filter, page_from_rows
 
+TABLES = ["cards", "alerts", "incidents", "audit_events", "incident_notes"]
+# Foreign-key order: every table only references tables listed before it.
+RESTORE_ORDER = ["alerts", "incidents", "cards", "incident_notes", "audit_events"]
+# Column a delta backup compares against its watermark; audit events are append-only.
+CHANGE_COLUMNS = {
+    "cards": "updated_at",
+    "alerts": "updated_at",
+    "incidents": "updated_at",
+    "incident_notes": "updated_at",
+    "audit_events": "created_at",
+}
 
-class DataAccess:
-    def __init__(self, client: Client):
+# Per-view column projections: every read fetches only what its template or endpoint uses, so
+# growing descriptions and payloads do not ride along. Keyset-paginated listings keep
+# created_at and id for the cursor. tests/test_projections.py checks templates against these.
+PROJECTIONS: dict[str, tuple[str, ...]] = {
+    "board": ("id", "title", "description", "column_name", "created_at"),
+    "alerts": ("id", "title", "severity", "status", "escalated", "created_at"),
+    "pending_alerts": ("id", "title", "severity", "created_at"),
+    "incidents": ("id", "title", "severity", "status", "created_at"),
+    "incident": ("id", "title", "severity", "status", "summary", "created_at"),
+    "incident_notes": ("id", "note_type", "content", "updated_at"),
+    "incident_cards": ("id", "title"),
+    "audit": ("id", "action", "entity_type", "entity_id", "payload", "created_at"),
+    "timeline": ("id", "action", "payload", "created_at"),
+    "latest_event": ("id", "payload", "created_at"),
+}
+
+# PostgREST "function not in schema cache" / Postgres "undefined function".
+_MISSING_FUNCTION_CODES = {"PGRST202", "42883"}
+# PostgREST "table not in schema cache" / Postgres "undefined table".
+_MISSING_TABLE_CODES = {"PGRST205", "42P01"}
+
+# Rows per round trip when streaming a DR export (Supabase caps responses at 1000 rows by default).
+EXPORT_PAGE_SIZE = 1000
+
+# Keeps multi-row inserts and in_() filters (ids travel in the URL) within request limits.
+ESCALATION_BATCH_SIZE = 200
+
+
+@dataclass(frozen=True)
+class AuditFilter:
+    """Server-side audit filters; ``action`` and ``entity_id`` hit the ``idx_audit_*_created_at`` indexes."""
+
+    action: str | None = None
+    entity_type: str | None = None
+    entity_id: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+
+    def apply(self, query: Any) -> Any:
+        for column in ("action", "entity_type", "entity_id"):
+            value = getattr(self, column)
+            if value:
+                query = query.eq(column, value)
+        if self.since:
+            query = query.gte("created_at", self.since.isoformat())
+        if self.until:
+            query = query.lt("created_at", self.until.isoformat())
+        return query
+
+
+def _chunks(items: list[Any], size: int) -> list[list[Any]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+class _DataAccessBase:
+    """Row construction shared by the sync and async backends; only the I/O differs."""
+
+    def __init__(
+        self,
+        client: Any,
+        audit_sink: AuditSink | None = None,
+        cache: ListingCache | None = None,
+        events: EventBroker | None = None,
+    ):
         self.client = client
+        # When set, create_audit_event hands rows to the background writer instead of inserting.
+        self.audit_sink = audit_sink
+        # When set, list_cards/list_alerts/list_incidents read through it and writes invalidate it.
+        # Their ``version`` (the table's change_versions() counter, read first) keys the entry.
+        self.cache = cache
+        # When set, board/alert/incident writes are pushed to /events viewers as small diffs.
+        self.events = events
+        self._counts_rpc_available = True
+        self._card_batch_rpc_available = True
+        self._versions_available = True
 
     def _now(self) -> str:
         return datetime.now(timezone.utc).isoformat()
 
-    def list_cards(self) -> list[dict[str, Any]]:
-        response = self.client.table("cards").select("*").order("created_at").execute()
-        return response.data or []
-
-    def create_card(self, title: str, description: str, column_name: str = "Todo") -> dict[str, Any]:
+    def _card_row(
+        self, title: str, description: str, column_name: str, incident_id: str | None = None
+    ) -> dict[str, Any]:
         row = {
             "id": str(uuid4()),
             "title": title,
@@ -29,77 +129,326 @@ class DataAccess:
             "created_at": self._now(),
             "updated_at": self._now(),
         }
+        if incident_id:
+            row["incident_id"] = incident_id
+        return row
+
+    def _alert_row(self, title: str, severity: str, source: str) -> dict[str, Any]:
+        return {
+            "id": str(uuid4()),
+            "title": title,
+            "severity": severity,
+            "source": source,
+            "status": "open",
+            "escalated": False,
+            "created_at": self._now(),
+            "updated_at": self._now(),
+        }
+
+    def _incident_row(self, alert: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "id": str(uuid4()),
+            "title": f"Incident from alert: {alert['title']}",
+            "status": "investigating",
+            "severity": alert["severity"],
+            "source_alert_id": alert["id"],
+            "summary": f"Auto escalated from {alert['severity']} alert",
+            "created_at": self._now(),
+            "updated_at": self._now(),
+        }
+
+    def _incident_created_audit_row(self, incident: dict[str, Any]) -> dict[str, Any]:
+        return self._audit_row(
+            "incident_created",
+            "incident",
+            incident["id"],
+            {"source_alert_id": incident["source_alert_id"], "severity": incident["severity"]},
+        )
+
+    def _note_row(self, incident_id: str, note_type: str, content: str) -> dict[str, Any]:
+        return {
+            "id": str(uuid4()),
+            "incident_id": incident_id,
+            "note_type": note_type,
+            "content": content,
+            "created_at": self._now(),
+            "updated_at": self._now(),
+        }
+
+    def _audit_row(self, action: str, entity_type: str, entity_id: str, payload: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "id": str(uuid4()),
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "payload": payload,
+            "created_at": self._now(),
+        }
+
+    def _publish(self, event_type: str, **data: Any) -> None:
+        if self.events is not None:
+            self.events.publish(event_type, data)
+
+    @staticmethod
+    def _project(row: dict[str, Any], view: str) -> dict[str, Any]:
+        return {column: row.get(column) for column in PROJECTIONS[view]}
+
+    def _publish_escalation(self, alerts: list[dict[str, Any]], incidents: list[dict[str, Any]]) -> None:
+        self._publish("alerts_escalated", ids=[alert["id"] for alert in alerts])
+        if incidents:
+            self._publish("incidents_created", incidents=[self._project(row, "incidents") for row in incidents])
+
+    def _select(self, table: str, view: str) -> Any:
+        return self.client.table(table).select(",".join(PROJECTIONS[view]))
+
+    def _keyset_page_query(
+        self, query: Any, limit: int, cursor: str | None, desc: bool, column: str = "created_at"
+    ) -> Any:
+        """Order by ``(column, id)`` and fetch one row past the page to learn if another exists."""
+        if cursor:
+            query = query.or_(keyset_filter(cursor, desc, column))
+        return query.order(column, desc=desc).order("id", desc=desc).limit(limit + 1)
+
+    def _export_query(self, table: str, limit: int, cursor: str | None, since: str | None) -> tuple[Any, str]:
+        # A delta walks the change column so the watermark filter and the keyset share one index.
+        column = CHANGE_COLUMNS[table] if since else "created_at"
+        query = self.client.table(table).select("*")
+        if since:
+            query = query.gte(column, since)
+        return self._keyset_page_query(query, limit, cursor, desc=False, column=column), column
+
+    def _staging(self, table: str) -> Any:
+        if table not in RESTORE_ORDER:
+            raise ValueError(f"Unknown table {table!r}")
+        return self.client.table(f"restore_{table}")
+
+    def _restore_counts(self, data: Any) -> dict[str, int]:
+        return {table: int((data or {}).get(table) or 0) for table in RESTORE_ORDER}
+
+    def _counts_rpc_failed(self, exc: APIError) -> None:
+        if exc.code not in _MISSING_FUNCTION_CODES:
+            raise exc
+        # migrations/004_entity_counts.sql not applied; stop probing for this client.
+        self._counts_rpc_available = False
+
+    def _card_batch_rpc_failed(self, exc: APIError) -> None:
+        if exc.code not in _MISSING_FUNCTION_CODES:
+            raise exc
+        # migrations/013_card_batch.sql not applied; run batches as separate bulk requests.
+        self._card_batch_rpc_available = False
+
+    def _card_batch_params(
+        self, creates: list[dict[str, Any]], moves: dict[str, str], deletes: list[str]
+    ) -> dict[str, Any]:
+        return {
+            "p_creates": [
+                self._card_row(card["title"], card.get("description", ""), card.get("column_name", "Todo"))
+                for card in creates
+            ],
+            "p_moves": [{"id": card_id, "column_name": column_name} for card_id, column_name in moves.items()],
+            "p_deletes": deletes,
+        }
+
+    @staticmethod
+    def _card_batch_result(params: dict[str, Any], data: dict[str, Any], atomic: bool) -> dict[str, Any]:
+        # Neither path promises RETURNING order; callers pair created cards with their creates.
+        order = {row["id"]: index for index, row in enumerate(params["p_creates"])}
+        created = sorted(data["created"], key=lambda card: order.get(card["id"], len(order)))
+        return {"created": created, "moved": data["moved"], "deleted": data["deleted"], "atomic": atomic}
+
+    @staticmethod
+    def _moves_by_column(moves: list[dict[str, str]]) -> dict[str, list[str]]:
+        by_column: dict[str, list[str]] = {}
+        for move in moves:
+            by_column.setdefault(move["column_name"], []).append(move["id"])
+        return by_column
+
+    def _card_batch_audit_rows(self, result: dict[str, Any]) -> list[dict[str, Any]]:
+        return [
+            *(
+                self._audit_row("card_created", "card", card["id"], {"column_name": card["column_name"]})
+                for card in result["created"]
+            ),
+            *(
+                self._audit_row("card_moved", "card", card["id"], {"to_column": card["column_name"]})
+                for card in result["moved"]
+            ),
+            *(self._audit_row("card_deleted", "card", card_id, {}) for card_id in result["deleted"]),
+        ]
+
+    def _publish_card_batch(self, result: dict[str, Any]) -> None:
+        self._publish(
+            "cards_changed",
+            created=[self._project(card, "board") for card in result["created"]],
+            moved=[{"id": card["id"], "column_name": card["column_name"]} for card in result["moved"]],
+            deleted=result["deleted"],
+        )
+
+    def _versions_query(self, tables: tuple[str, ...]) -> Any:
+        return self.client.table("table_versions").select("table_name,version").in_("table_name", list(tables))
+
+    def _versions_failed(self, exc: APIError) -> None:
+        if exc.code not in _MISSING_TABLE_CODES:
+            raise exc
+        # migrations/012_table_versions.sql not applied; conditional GETs stay off for this client.
+        self._versions_available = False
+
+    @staticmethod
+    def _versions(tables: tuple[str, ...], rows: list[dict[str, Any]]) -> dict[str, int]:
+        found = {row["table_name"]: int(row["version"]) for row in rows}
+        return {table: found.get(table, 0) for table in tables}
+
+
+class DataAccess(_DataAccessBase):
+    client: Client
+
+    def close(self) -> None:
+        self.client.postgrest.session.close()
+
+    def _listing(
+        self, table: str, view: str, limit: int | None, cursor: str | None, desc: bool, version: int | None
+    ) -> Page:
+        limit = clamp_page_size(limit)
+        if self.cache is not None:
+            cached = self.cache.get(table, limit, cursor, version)
+            if cached is not None:
+                return cached
+        query = self._keyset_page_query(self._select(table, view), limit, cursor, desc=desc)
+        page = page_from_rows(query.execute().data or [], limit)
+        if self.cache is not None:
+            self.cache.set(table, limit, cursor, page, version)
+        return page
+
+    def _invalidate(self, *tables: str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(*tables)
+
+    def list_cards(
+        self, limit: int | None = None, cursor: str | None = None, version: int | None = None
+    ) -> Page:
+        return self._listing("cards", "board", limit, cursor, desc=False, version=version)
+
+    def create_card(
+        self, title: str, description: str, column_name: str = "Todo", incident_id: str | None = None
+    ) -> dict[str, Any]:
+        row = self._card_row(title, description, column_name, incident_id)
         inserted = self.client.table("cards").insert(row).execute().data[0]
+        self._invalidate("cards")
+        self._publish("card_created", card=self._project(inserted, "board"))
         self.create_audit_event("card_created", "card", inserted["id"], {"column_name": column_name})
         return inserted
 
-    def move_card(self, card_id: str, column_name: str) -> dict[str, Any]:
-        updated = (
+    def move_card(self, card_id: str, column_name: str) -> dict[str, Any] | None:
+        """Returns the moved card, or None if there is no card ``card_id``."""
+        rows = (
             self.client.table("cards")
             .update({"column_name": column_name, "updated_at": self._now()})
             .eq("id", card_id)
             .execute()
-            .data[0]
+            .data
         )
+        if not rows:
+            return None
+        updated = rows[0]
+        self._invalidate("cards")
+        self._publish("card_moved", id=card_id, column_name=column_name)
         self.create_audit_event("card_moved", "card", card_id, {"to_column": column_name})
         return updated
 
-    def delete_card(self, card_id: str) -> None:
-        self.client.table("cards").delete().eq("id", card_id).execute()
+    def delete_card(self, card_id: str) -> bool:
+        """Returns False if there was no card ``card_id``."""
+        if not self.client.table("cards").delete().eq("id", card_id).execute().data:
+            return False
+        self._invalidate("cards")
+        self._publish("card_deleted", id=card_id)
         self.create_audit_event("card_deleted", "card", card_id, {})
+        return True
 
-    def list_alerts(self) -> list[dict[str, Any]]:
-        response = self.client.table("alerts").select("*").order("created_at", desc=True).execute()
-        return response.data or []
+    def apply_card_batch(
+        self, creates: list[dict[str, Any]], moves: dict[str, str], deletes: list[str]
+    ) -> dict[str, Any]:
+        """Create, move (``moves``: card id -> column) and delete cards in a few round trips.
+
+        With migration 013 the batch and its audit events are one ``apply_card_batch``
+        transaction. Without it: one multi-row insert, one ``in_()`` update per target column,
+        one ``in_()`` delete and one audit write, each atomic only on its own. Ids that do not
+        exist are left out of the result: ``{"created": [cards in the order of creates],
+        "moved": [cards], "deleted": [ids], "atomic": bool}``.
+        """
+        params = self._card_batch_params(creates, moves, deletes)
+        result: dict[str, Any] | None = None
+        if self._card_batch_rpc_available:
+            try:
+                data = self.client.rpc("apply_card_batch", params).execute().data
+            except APIError as exc:
+                self._card_batch_rpc_failed(exc)
+            else:
+                result = self._card_batch_result(params, data, atomic=True)
+        if result is None:
+            result = self._card_batch_steps(params)
+        self._invalidate("cards")
+        self._publish_card_batch(result)
+        return result
+
+    def _card_batch_steps(self, params: dict[str, Any]) -> dict[str, Any]:
+        created = []
+        if params["p_creates"]:
+            created = self.client.table("cards").insert(params["p_creates"]).execute().data or []
+        moved: list[dict[str, Any]] = []
+        for column_name, ids in self._moves_by_column(params["p_moves"]).items():
+            for chunk in _chunks(ids, ESCALATION_BATCH_SIZE):
+                update = {"column_name": column_name, "updated_at": self._now()}
+                moved.extend(self.client.table("cards").update(update).in_("id", chunk).execute().data or [])
+        deleted: list[str] = []
+        for chunk in _chunks(params["p_deletes"], ESCALATION_BATCH_SIZE):
+            rows = self.client.table("cards").delete().in_("id", chunk).execute().data or []
+            deleted.extend(row["id"] for row in rows)
+        result = self._card_batch_result(
+            params, {"created": created, "moved": moved, "deleted": deleted}, atomic=False
+        )
+        self._record_audit_rows(self._card_batch_audit_rows(result))
+        return result
+
+    def list_alerts(
+        self, limit: int | None = None, cursor: str | None = None, version: int | None = None
+    ) -> Page:
+        return self._listing("alerts", "alerts", limit, cursor, desc=True, version=version)
 
     def create_alert(self, title: str, severity: str, source: str) -> dict[str, Any]:
-        row = {
-            "id": str(uuid4()),
-            "title": title,
-            "severity": severity,
-            "source": source,
-            "status": "open",
-            "escalated": False,
-            "created_at": self._now(),
-            "updated_at": self._now(),
-        }
+        row = self._alert_row(title, severity, source)
         inserted = self.client.table("alerts").insert(row).execute().data[0]
+        self._invalidate("alerts")
+        self._publish("alert_created", alert=self._project(inserted, "alerts"))
         self.create_audit_event("alert_created", "alert", inserted["id"], {"severity": severity})
         return inserted
 
-    def list_unescalated_high_alerts(self) -> list[dict[str, Any]]:
-        response = (
-            self.client.table("alerts")
-            .select("*")
-            .in_("severity", ["high", "critical"])
-            .eq("escalated", False)
-            .execute()
+    def list_unescalated_high_alerts(self, since: str | None = None) -> list[dict[str, Any]]:
+        query = (
+            self._select("alerts", "pending_alerts").in_("severity", ["high", "critical"]).eq("escalated", False)
         )
-        return response.data or []
+        if since:
+            query = query.gte("created_at", since)
+        return query.order("created_at").execute().data or []
 
     def mark_alert_escalated(self, alert_id: str) -> None:
         self.client.table("alerts").update({"escalated": True, "updated_at": self._now()}).eq("id", alert_id).execute()
+        self._invalidate("alerts")
+        self._publish("alerts_escalated", ids=[alert_id])
 
-    def list_incidents(self) -> list[dict[str, Any]]:
-        response = self.client.table("incidents").select("*").order("created_at", desc=True).execute()
-        return response.data or []
+    def list_incidents(
+        self, limit: int | None = None, cursor: str | None = None, version: int | None = None
+    ) -> Page:
+        return self._listing("incidents", "incidents", limit, cursor, desc=True, version=version)
 
     def get_incident(self, incident_id: str) -> dict[str, Any] | None:
-        result = self.client.table("incidents").select("*").eq("id", incident_id).limit(1).execute().data
+        result = self._select("incidents", "incident").eq("id", incident_id).limit(1).execute().data
         return result[0] if result else None
 
     def create_incident_from_alert(self, alert: dict[str, Any]) -> dict[str, Any]:
-        row = {
-            "id": str(uuid4()),
-            "title": f"Incident from alert: {alert['title']}",
-            "status": "investigating",
-            "severity": alert["severity"],
-            "source_alert_id": alert["id"],
-            "summary": f"Auto escalated from {alert['severity']} alert",
-            "created_at": self._now(),
-            "updated_at": self._now(),
-        }
+        row = self._incident_row(alert)
         inserted = self.client.table("incidents").insert(row).execute().data[0]
+        self._invalidate("incidents")
+        self._publish("incidents_created", incidents=[self._project(inserted, "incidents")])
         self.create_audit_event(
             "incident_created",
             "incident",
@@ -109,14 +458,51 @@ class DataAccess:
         self.mark_alert_escalated(alert["id"])
         return inserted
 
+    def escalate_alerts(self, alerts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Escalate alerts in batches: one incident upsert, one audit insert, one alert update each.
+
+        Incidents are inserted with ``on conflict (source_alert_id) do nothing``, so re-running a
+        batch that crashed half way only marks the alerts and never creates a second incident.
+        Returns the incidents created by this call.
+        """
+        created: list[dict[str, Any]] = []
+        for chunk in _chunks(alerts, ESCALATION_BATCH_SIZE):
+            rows = [self._incident_row(alert) for alert in chunk]
+            inserted = (
+                self.client.table("incidents")
+                .upsert(rows, on_conflict="source_alert_id", ignore_duplicates=True)
+                .execute()
+                .data
+                or []
+            )
+            self._record_audit_rows([self._incident_created_audit_row(incident) for incident in inserted])
+            (
+                self.client.table("alerts")
+                .update({"escalated": True, "updated_at": self._now()})
+                .in_("id", [alert["id"] for alert in chunk])
+                .execute()
+            )
+            self._invalidate("alerts", "incidents")
+            self._publish_escalation(chunk, inserted)
+            created.extend(inserted)
+        return created
+
+    def escalate_pending_alerts(self) -> list[dict[str, Any]]:
+        """One watcher pass, shared by ``/watcher/run-once`` and ``scripts/watcher.py``."""
+        created = self.escalate_alerts(self.list_unescalated_high_alerts())
+        self.create_audit_event("watcher_run", "system", "watcher", {"created_incidents": len(created)})
+        return created
+
     def update_incident_status(self, incident_id: str, status: str) -> None:
         self.client.table("incidents").update({"status": status, "updated_at": self._now()}).eq("id", incident_id).execute()
+        self._invalidate("incidents")
+        self._publish("incident_status_changed", id=incident_id, status=status)
         self.create_audit_event("incident_status_changed", "incident", incident_id, {"status": status})
 
     def upsert_incident_note(self, incident_id: str, note_type: str, content: str) -> dict[str, Any]:
         existing = (
             self.client.table("incident_notes")
-            .select("*")
+            .select("id")
             .eq("incident_id", incident_id)
             .eq("note_type", note_type)
             .limit(1)
@@ -132,20 +518,12 @@ class DataAccess:
                 .data[0]
             )
             return updated
-        row = {
-            "id": str(uuid4()),
-            "incident_id": incident_id,
-            "note_type": note_type,
-            "content": content,
-            "created_at": self._now(),
-            "updated_at": self._now(),
-        }
+        row = self._note_row(incident_id, note_type, content)
         return self.client.table("incident_notes").insert(row).execute().data[0]
 
     def list_incident_notes(self, incident_id: str) -> list[dict[str, Any]]:
         response = (
-            self.client.table("incident_notes")
-            .select("*")
+            self._select("incident_notes", "incident_notes")
             .eq("incident_id", incident_id)
             .order("updated_at", desc=True)
             .execute()
@@ -153,57 +531,651 @@ class DataAccess:
         return response.data or []
 
     def list_agent_cards_for_incident(self, incident_id: str) -> list[dict[str, Any]]:
-        cards = self.list_cards()
-        needle = f"incident {incident_id}"
-        return [card for card in cards if needle in (card.get("description") or "")]
+        response = (
+            self._select("cards", "incident_cards").eq("incident_id", incident_id).order("created_at").execute()
+        )
+        return response.data or []
 
     def create_audit_event(self, action: str, entity_type: str, entity_id: str, payload: dict[str, Any]) -> None:
-        row = {
-            "id": str(uuid4()),
-            "action": action,
-            "entity_type": entity_type,
-            "entity_id": entity_id,
-            "payload": payload,
-            "created_at": self._now(),
-        }
+        row = self._audit_row(action, entity_type, entity_id, payload)
+        if self.audit_sink is not None:
+            self.audit_sink.submit(row)
+            return
         self.client.table("audit_events").insert(row).execute()
 
-    def list_audit_events(self, limit: int = 100) -> list[dict[str, Any]]:
-        response = self.client.table("audit_events").select("*").order("created_at", desc=True).limit(limit).execute()
-        return response.data or []
+    def insert_audit_events(self, rows: list[dict[str, Any]]) -> None:
+        if rows:
+            self.client.table("audit_events").insert(rows).execute()
+
+    def _record_audit_rows(self, rows: list[dict[str, Any]]) -> None:
+        # Same routing as create_audit_event, for rows a batch write built up front.
+        if self.audit_sink is not None:
+            for row in rows:
+                self.audit_sink.submit(row)
+            return
+        self.insert_audit_events(rows)
+
+    def list_audit_events(
+        self, limit: int | None = None, cursor: str | None = None, filters: AuditFilter | None = None
+    ) -> Page:
+        limit = clamp_page_size(limit)
+        query = (filters or AuditFilter()).apply(self._select("audit_events", "audit"))
+        query = self._keyset_page_query(query, limit, cursor, desc=True)
+        return page_from_rows(query.execute().data or [], limit)
+
+    def latest_event_by_action(self, action: str) -> dict[str, Any] | None:
+        result = (
+            self._select("audit_events", "latest_event")
+            .eq("action", action)
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+            .data
+        )
+        return result[0] if result else None
 
     def list_audit_for_entity(self, entity_id: str) -> list[dict[str, Any]]:
-        response = self.client.table("audit_events").select("*").eq("entity_id", entity_id).order("created_at").execute()
+        response = self._select("audit_events", "timeline").eq("entity_id", entity_id).order("created_at").execute()
         return response.data or []
 
-    def counts(self) -> dict[str, int]:
-        tables = ["cards", "alerts", "incidents", "audit_events", "incident_notes"]
+    def acquire_lease(self, name: str, holder: str, ttl_seconds: int) -> bool:
+        params = {"p_name": name, "p_holder": holder, "p_ttl_seconds": ttl_seconds}
+        return bool(self.client.rpc("try_acquire_lease", params).execute().data)
+
+    def release_lease(self, name: str, holder: str) -> None:
+        self.client.rpc("release_lease", {"p_name": name, "p_holder": holder}).execute()
+
+    def ping(self) -> None:
+        self.client.table("cards").select("id").limit(1).execute()
+
+    def change_versions(self, *tables: str) -> dict[str, int] | None:
+        """Per-table write counters (migration 012), or None when they are not available."""
+        if not self._versions_available:
+            return None
+        try:
+            rows = self._versions_query(tables).execute().data or []
+        except APIError as exc:
+            self._versions_failed(exc)
+            return None
+        return self._versions(tables, rows)
+
+    def counts(self, estimated: bool = False) -> dict[str, int]:
+        if self._counts_rpc_available:
+            try:
+                data = self.client.rpc("entity_counts", {"estimated": estimated}).execute().data
+            except APIError as exc:
+                self._counts_rpc_failed(exc)
+            else:
+                return {table: int((data or {}).get(table) or 0) for table in TABLES}
         out: dict[str, int] = {}
-        for table in tables:
+        for table in TABLES:
             count = self.client.table(table).select("id", count="exact").limit(0).execute().count or 0
             out[table] = count
         return out
 
-    def export_all(self) -> dict[str, Any]:
-        return {
-            "cards": self.client.table("cards").select("*").execute().data or [],
-            "alerts": self.client.table("alerts").select("*").execute().data or [],
-            "incidents": self.client.table("incidents").select("*").execute().data or [],
-            "audit_events": self.client.table("audit_events").select("*").execute().data or [],
-            "incident_notes": self.client.table("incident_notes").select("*").execute().data or [],
-        }
+    def export_page(
+        self, table: str, cursor: str | None = None, limit: int = EXPORT_PAGE_SIZE, since: str | None = None
+    ) -> Page:
+        """Full rows of ``table``, one keyset page per call (DR export).
+
+        With ``since`` only rows changed at or after it are returned (delta backup).
+        """
+        query, column = self._export_query(table, limit, cursor, since)
+        return page_from_rows(query.execute().data or [], limit, column)
+
+    def restore_reset(self) -> None:
+        """Empty the restore staging tables (migrations/010_restore_staging.sql)."""
+        self.client.rpc("restore_reset", {}).execute()
+
+    def restore_stage(self, table: str, rows: list[dict[str, Any]], upsert: bool = False) -> None:
+        """Insert rows into ``restore_<table>``; ``upsert`` (delta replay) overwrites staged rows by id."""
+        staging = self._staging(table)
+        if upsert:
+            staging.upsert(rows, on_conflict="id", returning=ReturnMethod.minimal).execute()
+        else:
+            staging.insert(rows, returning=ReturnMethod.minimal).execute()
+
+    def restore_discard(self, table: str, ids: list[str]) -> None:
+        """Drop staged rows a delta's tombstones say were deleted."""
+        for chunk in _chunks(ids, ESCALATION_BATCH_SIZE):
+            self._staging(table).delete().in_("id", chunk).execute()
+
+    def restore_commit(self) -> dict[str, int]:
+        """Swap the staged rows into the live tables in one transaction; returns rows per table."""
+        restored = self._restore_counts(self.client.rpc("restore_commit", {}).execute().data)
+        self._invalidate(*NAMESPACES)
+        self._publish("resync")
+        return restored
+
+
+class AsyncDataAccess(_DataAccessBase):
+    """Async twin of :class:`DataAccess` on the async PostgREST client, with the same methods."""
+
+    client: AsyncClient
+
+    async def close(self) -> None:
+        await self.client.postgrest.aclose()
+
+    async def _listing(
+        self, table: str, view: str, limit: int | None, cursor: str | None, desc: bool, version: int | None
+    ) -> Page:
+        limit = clamp_page_size(limit)
+        if self.cache is not None:
+            cached = await self.cache.aget(table, limit, cursor, version)
+            if cached is not None:
+                return cached
+        query = self._keyset_page_query(self._select(table, view), limit, cursor, desc=desc)
+        page = page_from_rows((await query.execute()).data or [], limit)
+        if self.cache is not None:
+            await self.cache.aset(table, limit, cursor, page, version)
+        return page
+
+    async def _invalidate(self, *tables: str) -> None:
+        if self.cache is not None:
+            await self.cache.ainvalidate(*tables)
+
+    async def list_cards(
+        self, limit: int | None = None, cursor: str | None = None, version: int | None = None
+    ) -> Page:
+        return await self._listing("cards", "board", limit, cursor, desc=False, version=version)
+
+    async def create_card(
+        self, title: str, description: str, column_name: str = "Todo", incident_id: str | None = None
+    ) -> dict[str, Any]:
+        row = self._card_row(title, description, column_name, incident_id)
+        inserted = (await self.client.table("cards").insert(row).execute()).data[0]
+        await self._invalidate("cards")
+        self._publish("card_created", card=self._project(inserted, "board"))
+        await self.create_audit_event("card_created", "card", inserted["id"], {"column_name": column_name})
+        return inserted
+
+    async def move_card(self, card_id: str, column_name: str) -> dict[str, Any] | None:
+        rows = (
+            await self.client.table("cards")
+            .update({"column_name": column_name, "updated_at": self._now()})
+            .eq("id", card_id)
+            .execute()
+        ).data
+        if not rows:
+            return None
+        updated = rows[0]
+        await self._invalidate("cards")
+        self._publish("card_moved", id=card_id, column_name=column_name)
+        await self.create_audit_event("card_moved", "card", card_id, {"to_column": column_name})
+        return updated
+
+    async def delete_card(self, card_id: str) -> bool:
+        if not (await self.client.table("cards").delete().eq("id", card_id).execute()).data:
+            return False
+        await self._invalidate("cards")
+        self._publish("card_deleted", id=card_id)
+        await self.create_audit_event("card_deleted", "card", card_id, {})
+        return True
+
+    async def apply_card_batch(
+        self, creates: list[dict[str, Any]], moves: dict[str, str], deletes: list[str]
+    ) -> dict[str, Any]:
+        params = self._card_batch_params(creates, moves, deletes)
+        result: dict[str, Any] | None = None
+        if self._card_batch_rpc_available:
+            try:
+                data = (await self.client.rpc("apply_card_batch", params).execute()).data
+            except APIError as exc:
+                self._card_batch_rpc_failed(exc)
+            else:
+                result = self._card_batch_result(params, data, atomic=True)
+        if result is None:
+            result = await self._card_batch_steps(params)
+        await self._invalidate("cards")
+        self._publish_card_batch(result)
+        return result
 
-    def import_all(self, payload: dict[str, Any]) -> None:
-        for table in ["cards", "alerts", "incidents", "audit_events", "incident_notes"]:
-            self.client.table(table).delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
-            rows = payload.get(table, [])
-            if rows:
-                self.client.table(table).insert(rows).execute()
+    async def _card_batch_steps(self, params: dict[str, Any]) -> dict[str, Any]:
+        created = []
+        if params["p_creates"]:
+            created = (await self.client.table("cards").insert(params["p_creates"]).execute()).data or []
+        moved: list[dict[str, Any]] = []
+        for column_name, ids in self._moves_by_column(params["p_moves"]).items():
+            for chunk in _chunks(ids, ESCALATION_BATCH_SIZE):
+                update = {"column_name": column_name, "updated_at": self._now()}
+                moved.extend((await self.client.table("cards").update(update).in_("id", chunk).execute()).data or [])
+        deleted: list[str] = []
+        for chunk in _chunks(params["p_deletes"], ESCALATION_BATCH_SIZE):
+            rows = (await self.client.table("cards").delete().in_("id", chunk).execute()).data or []
+            deleted.extend(row["id"] for row in rows)
+        result = self._card_batch_result(
+            params, {"created": created, "moved": moved, "deleted": deleted}, atomic=False
+        )
+        await self._record_audit_rows(self._card_batch_audit_rows(result))
+        return result
+
+    async def list_alerts(
+        self, limit: int | None = None, cursor: str | None = None, version: int | None = None
+    ) -> Page:
+        return await self._listing("alerts", "alerts", limit, cursor, desc=True, version=version)
+
+    async def create_alert(self, title: str, severity: str, source: str) -> dict[str, Any]:
+        row = self._alert_row(title, severity, source)
+        inserted = (await self.client.table("alerts").insert(row).execute()).data[0]
+        await self._invalidate("alerts")
+        self._publish("alert_created", alert=self._project(inserted, "alerts"))
+        await self.create_audit_event("alert_created", "alert", inserted["id"], {"severity": severity})
+        return inserted
+
+    async def list_unescalated_high_alerts(self, since: str | None = None) -> list[dict[str, Any]]:
+        query = (
+            self._select("alerts", "pending_alerts").in_("severity", ["high", "critical"]).eq("escalated", False)
+        )
+        if since:
+            query = query.gte("created_at", since)
+        return (await query.order("created_at").execute()).data or []
+
+    async def mark_alert_escalated(self, alert_id: str) -> None:
+        await (
+            self.client.table("alerts")
+            .update({"escalated": True, "updated_at": self._now()})
+            .eq("id", alert_id)
+            .execute()
+        )
+        await self._invalidate("alerts")
+        self._publish("alerts_escalated", ids=[alert_id])
+
+    async def list_incidents(
+        self, limit: int | None = None, cursor: str | None = None, version: int | None = None
+    ) -> Page:
+        return await self._listing("incidents", "incidents", limit, cursor, desc=True, version=version)
+
+    async def get_incident(self, incident_id: str) -> dict[str, Any] | None:
+        result = (await self._select("incidents", "incident").eq("id", incident_id).limit(1).execute()).data
+        return result[0] if result else None
+
+    async def create_incident_from_alert(self, alert: dict[str, Any]) -> dict[str, Any]:
+        row = self._incident_row(alert)
+        inserted = (await self.client.table("incidents").insert(row).execute()).data[0]
+        await self._invalidate("incidents")
+        self._publish("incidents_created", incidents=[self._project(inserted, "incidents")])
+        await self.create_audit_event(
+            "incident_created",
+            "incident",
+            inserted["id"],
+            {"source_alert_id": alert["id"], "severity": alert["severity"]},
+        )
+        await self.mark_alert_escalated(alert["id"])
+        return inserted
+
+    async def escalate_alerts(self, alerts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        created: list[dict[str, Any]] = []
+        for chunk in _chunks(alerts, ESCALATION_BATCH_SIZE):
+            rows = [self._incident_row(alert) for alert in chunk]
+            inserted = (
+                await self.client.table("incidents")
+                .upsert(rows, on_conflict="source_alert_id", ignore_duplicates=True)
+                .execute()
+            ).data or []
+            await self._record_audit_rows([self._incident_created_audit_row(incident) for incident in inserted])
+            await (
+                self.client.table("alerts")
+                .update({"escalated": True, "updated_at": self._now()})
+                .in_("id", [alert["id"] for alert in chunk])
+                .execute()
+            )
+            await self._invalidate("alerts", "incidents")
+            self._publish_escalation(chunk, inserted)
+            created.extend(inserted)
+        return created
+
+    async def escalate_pending_alerts(self) -> list[dict[str, Any]]:
+        created = await self.escalate_alerts(await self.list_unescalated_high_alerts())
+        await self.create_audit_event("watcher_run", "system", "watcher", {"created_incidents": len(created)})
+        return created
+
+    async def update_incident_status(self, incident_id: str, status: str) -> None:
+        await (
+            self.client.table("incidents")
+            .update({"status": status, "updated_at": self._now()})
+            .eq("id", incident_id)
+            .execute()
+        )
+        await self._invalidate("incidents")
+        self._publish("incident_status_changed", id=incident_id, status=status)
+        await self.create_audit_event("incident_status_changed", "incident", incident_id, {"status": status})
+
+    async def upsert_incident_note(self, incident_id: str, note_type: str, content: str) -> dict[str, Any]:
+        existing = (
+            await self.client.table("incident_notes")
+            .select("id")
+            .eq("incident_id", incident_id)
+            .eq("note_type", note_type)
+            .limit(1)
+            .execute()
+        ).data
+        if existing:
+            return (
+                await self.client.table("incident_notes")
+                .update({"content": content, "updated_at": self._now()})
+                .eq("id", existing[0]["id"])
+                .execute()
+            ).data[0]
+        row = self._note_row(incident_id, note_type, content)
+        return (await self.client.table("incident_notes").insert(row).execute()).data[0]
+
+    async def list_incident_notes(self, incident_id: str) -> list[dict[str, Any]]:
+        response = await (
+            self._select("incident_notes", "incident_notes")
+            .eq("incident_id", incident_id)
+            .order("updated_at", desc=True)
+            .execute()
+        )
+        return response.data or []
+
+    async def list_agent_cards_for_incident(self, incident_id: str) -> list[dict[str, Any]]:
+        response = await (
+            self._select("cards", "incident_cards").eq("incident_id", incident_id).order("created_at").execute()
+        )
+        return response.data or []
+
+    async def create_audit_event(
+        self, action: str, entity_type: str, entity_id: str, payload: dict[str, Any]
+    ) -> None:
+        row = self._audit_row(action, entity_type, entity_id, payload)
+        if self.audit_sink is not None:
+            await self.audit_sink.asubmit(row)
+            return
+        await self.client.table("audit_events").insert(row).execute()
+
+    async def insert_audit_events(self, rows: list[dict[str, Any]]) -> None:
+        if rows:
+            await self.client.table("audit_events").insert(rows).execute()
+
+    async def _record_audit_rows(self, rows: list[dict[str, Any]]) -> None:
+        if self.audit_sink is not None:
+            for row in rows:
+                await self.audit_sink.asubmit(row)
+            return
+        await self.insert_audit_events(rows)
+
+    async def list_audit_events(
+        self, limit: int | None = None, cursor: str | None = None, filters: AuditFilter | None = None
+    ) -> Page:
+        limit = clamp_page_size(limit)
+        query = (filters or AuditFilter()).apply(self._select("audit_events", "audit"))
+        query = self._keyset_page_query(query, limit, cursor, desc=True)
+        return page_from_rows((await query.execute()).data or [], limit)
+
+    async def latest_event_by_action(self, action: str) -> dict[str, Any] | None:
+        result = (
+            await self._select("audit_events", "latest_event")
+            .eq("action", action)
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        ).data
+        return result[0] if result else None
+
+    async def list_audit_for_entity(self, entity_id: str) -> list[dict[str, Any]]:
+        response = await (
+            self._select("audit_events", "timeline").eq("entity_id", entity_id).order("created_at").execute()
+        )
+        return response.data or []
+
+    async def acquire_lease(self, name: str, holder: str, ttl_seconds: int) -> bool:
+        params = {"p_name": name, "p_holder": holder, "p_ttl_seconds": ttl_seconds}
+        return bool((await self.client.rpc("try_acquire_lease", params).execute()).data)
+
+    async def release_lease(self, name: str, holder: str) -> None:
+        await self.client.rpc("release_lease", {"p_name": name, "p_holder": holder}).execute()
+
+    async def ping(self) -> None:
+        await self.client.table("cards").select("id").limit(1).execute()
+
+    async def change_versions(self, *tables: str) -> dict[str, int] | None:
+        """Per-table write counters (migration 012), or None when they are not available."""
+        if not self._versions_available:
+            return None
+        try:
+            rows = (await self._versions_query(tables).execute()).data or []
+        except APIError as exc:
+            self._versions_failed(exc)
+            return None
+        return self._versions(tables, rows)
+
+    async def counts(self, estimated: bool = False) -> dict[str, int]:
+        if self._counts_rpc_available:
+            try:
+                data = (await self.client.rpc("entity_counts", {"estimated": estimated}).execute()).data
+            except APIError as exc:
+                self._counts_rpc_failed(exc)
+            else:
+                return {table: int((data or {}).get(table) or 0) for table in TABLES}
+        responses = await asyncio.gather(
+            *(self.client.table(table).select("id", count="exact").limit(0).execute() for table in TABLES)
+        )
+        return {table: response.count or 0 for table, response in zip(TABLES, responses)}
+
+    async def export_page(
+        self, table: str, cursor: str | None = None, limit: int = EXPORT_PAGE_SIZE, since: str | None = None
+    ) -> Page:
+        query, column = self._export_query(table, limit, cursor, since)
+        return page_from_rows((await query.execute()).data or [], limit, column)
+
+    async def restore_reset(self) -> None:
+        await self.client.rpc("restore_reset", {}).execute()
+
+    async def restore_stage(self, table: str, rows: list[dict[str, Any]], upsert: bool = False) -> None:
+        staging = self._staging(table)
+        if upsert:
+            await staging.upsert(rows, on_conflict="id", returning=ReturnMethod.minimal).execute()
+        else:
+            await staging.insert(rows, returning=ReturnMethod.minimal).execute()
+
+    async def restore_discard(self, table: str, ids: list[str]) -> None:
+        for chunk in _chunks(ids, ESCALATION_BATCH_SIZE):
+            await self._staging(table).delete().in_("id", chunk).execute()
+
+    async def restore_commit(self) -> dict[str, int]:
+        restored = self._restore_counts((await self.client.rpc("restore_commit", {}).execute()).data)
+        await self._invalidate(*NAMESPACES)
+        self._publish("resync")
+        return restored
+
+
+def is_configured() -> bool:
+    settings = get_settings()
+    return bool(settings.supabase_url and settings.supabase_anon_key)
+
+
+def _http_limits() -> httpx.Limits:
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.supabase_pool_size,
+        max_keepalive_connections=settings.supabase_pool_size,
+        keepalive_expiry=settings.supabase_keepalive_seconds,
+    )
+
+
+def _build_http_client() -> httpx.Client:
+    # retries only cover connection establishment, so a reused socket the server already
+    # dropped is re-dialed instead of failing the request.
+    transport = httpx.HTTPTransport(http2=True, limits=_http_limits(), retries=2)
+    return httpx.Client(
+        transport=transport,
+        timeout=get_settings().supabase_timeout_seconds,
+        follow_redirects=True,
+    )
+
+
+def _build_async_http_client() -> httpx.AsyncClient:
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=_http_limits(), retries=2)
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=get_settings().supabase_timeout_seconds,
+        follow_redirects=True,
+    )
 
 
 def build_data_access() -> DataAccess:
     settings = get_settings()
-    if not settings.supabase_url or not settings.supabase_anon_key:
+    if not is_configured():
+        raise RuntimeError("SUPABASE_URL and SUPABASE_ANON_KEY are required.")
+    options = ClientOptions(httpx_client=_build_http_client())
+    client = create_client(settings.supabase_url, settings.supabase_anon_key, options)
+    # supabase-py builds the PostgREST client lazily; do it now so threads never race on it.
+    _ = client.postgrest
+    return DataAccess(client, cache=get_listing_cache(), events=get_event_broker())
+
+
+async def build_async_data_access() -> AsyncDataAccess:
+    settings = get_settings()
+    if not is_configured():
         raise RuntimeError("SUPABASE_URL and SUPABASE_ANON_KEY are required.")
-    client = create_client(settings.supabase_url, settings.supabase_anon_key)
-    return DataAccess(client)
+    options = AsyncClientOptions(httpx_client=_build_async_http_client())
+    client = await acreate_client(settings.supabase_url, settings.supabase_anon_key, options)
+    _ = client.postgrest
+    return AsyncDataAccess(client, cache=get_listing_cache(), events=get_event_broker())
+
+
+class DataAccessPool:
+    """Process-wide DataAccess backed by one long-lived Supabase client.
+
+    The underlying httpx client is thread-safe and keeps TLS connections alive, so every
+    request and worker thread shares the same instance instead of dialing Supabase anew.
+
+    Lifecycle:
+    - ``open()`` on application startup warms the client (no-op when Supabase is not configured).
+    - ``get()`` per request returns the shared instance, building it lazily if needed.
+    - ``invalidate()`` after a transport error drops the client; the next ``get()`` reconnects.
+    - ``close()`` on application shutdown releases the connections.
+
+    The client is also recycled after ``max_age_seconds`` so long-running workers pick up
+    fresh DNS/TLS state. A replaced client (recycled or invalidated) may still be serving
+    requests on other threads, so it is only closed ``retire_after_seconds`` later.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], DataAccess] = build_data_access,
+        max_age_seconds: float | None = None,
+        retire_after_seconds: float | None = None,
+    ):
+        self._factory = factory
+        self._max_age_seconds = max_age_seconds
+        self._retire_after_seconds = retire_after_seconds
+        self._lock = threading.Lock()
+        self._db: DataAccess | None = None
+        self._created_at = 0.0
+        # (replaced_at, client) pairs waiting out their grace period before close().
+        self._retired: list[tuple[float, Any]] = []
+        self.audit_sink: AuditSink | None = None
+
+    @property
+    def max_age_seconds(self) -> float:
+        if self._max_age_seconds is not None:
+            return self._max_age_seconds
+        return get_settings().supabase_client_max_age_seconds
+
+    @property
+    def retire_after_seconds(self) -> float:
+        if self._retire_after_seconds is not None:
+            return self._retire_after_seconds
+        return get_settings().supabase_client_retire_seconds
+
+    def _expired(self) -> bool:
+        return time.monotonic() - self._created_at > self.max_age_seconds
+
+    def _retire(self, db: Any) -> None:
+        # Caller holds the lock.
+        if db is not None:
+            self._retired.append((time.monotonic(), db))
+
+    def _reap(self) -> list[Any]:
+        # Caller holds the lock; returns the retired clients whose grace period is over.
+        cutoff = time.monotonic() - self.retire_after_seconds
+        due = [db for replaced_at, db in self._retired if replaced_at <= cutoff]
+        self._retired = [entry for entry in self._retired if entry[0] > cutoff]
+        return due
+
+    def open(self) -> None:
+        if is_configured():
+            self.get()
+
+    def get(self) -> DataAccess:
+        db = self._db
+        if db is not None and not self._expired() and not self._retired:
+            return db
+        with self._lock:
+            if self._db is None or self._expired():
+                self._retire(self._db)
+                self._db = self._factory()
+                self._db.audit_sink = self.audit_sink
+                self._created_at = time.monotonic()
+            db = self._db
+            due = self._reap()
+        for previous in due:
+            previous.close()
+        return db
+
+    def invalidate(self) -> None:
+        # Other threads may still be mid-request on the old client, so it is only retired here
+        # and closed once its grace period is over.
+        with self._lock:
+            self._retire(self._db)
+            self._db = None
+
+    def close(self) -> None:
+        with self._lock:
+            previous, self._db = self._db, None
+            clients = [db for _, db in self._retired] + ([previous] if previous is not None else [])
+            self._retired = []
+        for db in clients:
+            db.close()
+
+
+class AsyncDataAccessPool(DataAccessPool):
+    """Event-loop flavour of :class:`DataAccessPool` handing out one shared AsyncDataAccess.
+
+    Same lifecycle, awaited: ``await open()`` on startup, ``await get()`` per request,
+    ``invalidate()`` after a transport error, ``await close()`` on shutdown. The httpx
+    client is bound to the loop that created it, i.e. the server loop.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Awaitable[AsyncDataAccess]] = build_async_data_access,
+        max_age_seconds: float | None = None,
+        retire_after_seconds: float | None = None,
+    ):
+        super().__init__(factory, max_age_seconds, retire_after_seconds)  # type: ignore[arg-type]
+        self._async_lock: asyncio.Lock | None = None
+
+    async def open(self) -> None:
+        if is_configured():
+            await self.get()
+
+    async def get(self) -> AsyncDataAccess:
+        db = self._db
+        if db is not None and not self._expired() and not self._retired:
+            return db
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if self._db is None or self._expired():
+                self._retire(self._db)
+                self._db = await self._factory()
+                self._db.audit_sink = self.audit_sink
+                self._created_at = time.monotonic()
+            db = self._db
+            due = self._reap()
+        for previous in due:
+            await previous.close()
+        return db
+
+    async def close(self) -> None:
+        previous, self._db = self._db, None
+        clients = [db for _, db in self._retired] + ([previous] if previous is not None else [])
+        self._retired = []
+        for db in clients:
+            await db.close()
+
+
+pool = DataAccessPool()
+async_pool = AsyncDataAccessPool()
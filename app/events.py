@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from functools import lru_cache
+from typing import Any
+from uuid import uuid4
+
+from app.cache import REDIS_ERRORS
+from app.config import get_settings
+from app.obs import encode_json, log_event
+
+Event = tuple[int, str]
+
+# Sent instead of events a viewer can no longer get (it fell behind, or its resume point is
+# gone): the page reloads once rather than showing a board with holes in it.
+RESYNC = encode_json({"type": "resync"})
+# Browser reconnect delay after a stream ends (EventSource ``retry:``).
+RETRY_MS = 2000
+EVENTS_BACKENDS = {"memory", "redis"}
+EVENTS_CHANNEL = "opsboard:events"
+
+
+class Subscription:
+    """One viewer's bounded queue of pending events, owned by the event loop serving it.
+
+    When the queue is full the backlog is dropped and replaced by a single resync, so a stalled
+    connection holds at most ``maxsize`` references to already-encoded messages.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self._loop = loop
+        self._queue: asyncio.Queue[Event] = asyncio.Queue(maxsize)
+        self.dropped = 0
+        # Sequence number of the last event published before this subscription started.
+        self.start = 0
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def deliver(self, event: Event) -> None:
+        """Queue ``event``; callable from any thread (sync DataAccess runs on the threadpool)."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(event)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # The loop is closed; the stream is gone with it.
+
+    def _put(self, event: Event) -> None:
+        if self._queue.full():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self.dropped += 1
+            event = (event[0], RESYNC)
+        self._queue.put_nowait(event)
+
+    async def get(self) -> Event:
+        return await self._queue.get()
+
+
+class EventBroker:
+    """In-process fan-out of change events from DataAccess to ``/events`` streams.
+
+    Each event is JSON-encoded once and numbered; the last ``history_size`` are kept so a
+    reconnecting browser (``Last-Event-ID``) or a page that was rendered just before its stream
+    opened (``?since=``) gets what it missed. Event ids carry a per-process epoch: ids from
+    another worker or an earlier process are ignored instead of being misread.
+
+    A reconnect whose resume point fell out of the history gets a resync. A page cursor that
+    did gets nothing: it comes from a page the ETag check just confirmed as current (a 304
+    serves the cached HTML with its old cursor), and reloading it would only loop.
+
+    With a ``relay`` (``EVENTS_BACKEND=redis``) every event is also sent to the brokers of the
+    other workers and of the resident watcher, and theirs are delivered here, so a viewer sees
+    every write whichever process made it. Without one only this process's writes are
+    published; an opt-in ``resync_seconds`` (off by default, since it reloads every open page)
+    then ends each stream with a resync after that long, so the page picks up what other
+    processes wrote.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 64,
+        history_size: int = 256,
+        relay: RedisEventRelay | None = None,
+        resync_seconds: float = 0,
+    ):
+        self.queue_size = queue_size
+        self.epoch = uuid4().hex[:8]
+        self.relay = relay
+        self.resync_seconds = resync_seconds
+        self._seq = 0
+        self._history: deque[Event] = deque(maxlen=history_size)
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def cursor(self) -> str:
+        """Resume point for a page rendered now (pass back as ``/events?since=``)."""
+        return f"{self.epoch}:{self._seq}"
+
+    def publish(self, event_type: str, data: dict[str, Any]) -> None:
+        message = encode_json({"type": event_type, **data})
+        self.receive(message)
+        if self.relay is not None:
+            self.relay.send(message)
+
+    def receive(self, message: str) -> None:
+        """Number an encoded event and hand it to this process's viewers (the relay calls this)."""
+        with self._lock:
+            self._seq += 1
+            event = (self._seq, message)
+            self._history.append(event)
+            subscribers = tuple(self._subscribers)
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def _missed(self, since: str | None, resync_on_gap: bool) -> list[Event]:
+        epoch, _, seq = (since or "").partition(":")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) >= self._seq:
+            return []
+        after = int(seq)
+        if not self._history or self._history[0][0] > after + 1:
+            return [(self._seq, RESYNC)] if resync_on_gap else []
+        return [event for event in self._history if event[0] > after]
+
+    def subscribe(self, last_event_id: str | None = None, since: str | None = None) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            if last_event_id:
+                missed = self._missed(last_event_id, resync_on_gap=True)
+            else:
+                missed = self._missed(since, resync_on_gap=False)
+            subscription.start = self._seq
+            self._subscribers.add(subscription)
+        for event in missed:
+            subscription.deliver(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    async def stream(
+        self, last_event_id: str | None, since: str | None, heartbeat: float, max_seconds: float
+    ) -> AsyncIterator[str]:
+        """``text/event-stream`` body for one viewer, ending after ``max_seconds``."""
+        subscription = self.subscribe(last_event_id, since)
+        started = time.monotonic()
+        deadline = started + max_seconds
+        resync_at = started + self.resync_seconds if self.resync_seconds > 0 else float("inf")
+        try:
+            # The id gives the browser a Last-Event-ID to resume from even if nothing is sent.
+            yield f"id: {self.epoch}:{subscription.start}\nretry: {RETRY_MS}\n\n"
+            while (remaining := deadline - time.monotonic()) > 0:
+                if time.monotonic() >= resync_at:
+                    # No relay: writes of other processes only show up on a reload.
+                    yield f"data: {RESYNC}\n\n"
+                    return
+                wait = min(heartbeat, remaining, max(resync_at - time.monotonic(), 0))
+                try:
+                    seq, message = await asyncio.wait_for(subscription.get(), wait)
+                except TimeoutError:
+                    # Comment line: keeps proxies from timing out an idle connection.
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {self.epoch}:{seq}\ndata: {message}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+
+class RedisEventRelay:
+    """Carries events between the brokers of several processes over Redis pub/sub.
+
+    Sending only queues the message (``outbox_size`` at most, the rest is dropped and logged);
+    a background thread publishes it, so a write never waits on Redis. Another thread
+    subscribes to the channel and hands other processes' events to the local broker. Pub/sub
+    keeps nothing for a disconnected subscriber, so after reconnecting it delivers a resync.
+    Needs the ``cache`` extra (redis-py).
+    """
+
+    def __init__(self, url: str, channel: str = EVENTS_CHANNEL, client: Any = None, outbox_size: int = 1024):
+        if client is None:
+            try:
+                import redis
+            except ImportError as exc:  # pragma: no cover
+                raise RuntimeError("EVENTS_BACKEND=redis needs redis-py: pip install -e .[cache]") from exc
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self.channel = channel
+        self.dropped = 0
+        self._outbox: queue.Queue[str] = queue.Queue(outbox_size)
+        self._origin = ""
+        self._receive: Callable[[str], None] | None = None
+
+    def start(self, broker: EventBroker) -> None:
+        self._origin = broker.epoch
+        self._receive = broker.receive
+        threading.Thread(target=self._send_loop, name="events-relay-send", daemon=True).start()
+        threading.Thread(target=self._listen_loop, name="events-relay-listen", daemon=True).start()
+
+    def send(self, message: str) -> None:
+        try:
+            self._outbox.put_nowait(f"{self._origin} {message}")
+        except queue.Full:
+            self.dropped += 1
+            log_event("events_relay_dropped", dropped=self.dropped)
+
+    def _send_loop(self) -> None:
+        while True:
+            payload = self._outbox.get()
+            try:
+                self._client.publish(self.channel, payload)
+            except REDIS_ERRORS as exc:
+                log_event("events_relay_failed", operation="publish", error=type(exc).__name__)
+
+    def _deliver(self, payload: bytes | str) -> None:
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        origin, _, message = payload.partition(" ")
+        if origin != self._origin and message and self._receive is not None:
+            self._receive(message)
+
+    def _listen_loop(self) -> None:
+        backoff = 0.5
+        connected_before = False
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                if connected_before and self._receive is not None:
+                    self._receive(RESYNC)
+                connected_before = True
+                backoff = 0.5
+                for item in pubsub.listen():
+                    if item.get("type") == "message":
+                        self._deliver(item["data"])
+            except REDIS_ERRORS as exc:
+                log_event("events_relay_failed", operation="listen", error=type(exc).__name__)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+
+@lru_cache
+def get_event_broker() -> EventBroker | None:
+    """The process-wide broker, shared by the sync and async DataAccess pools."""
+    settings = get_settings()
+    if not settings.events_enabled:
+        return None
+    if settings.events_backend not in EVENTS_BACKENDS:
+        raise ValueError(f"EVENTS_BACKEND must be one of {sorted(EVENTS_BACKENDS)}")
+    if settings.events_backend == "redis":
+        relay = RedisEventRelay(settings.events_redis_url)
+        broker = EventBroker(settings.events_queue_size, settings.events_history_size, relay=relay)
+        relay.start(broker)
+        return broker
+    return EventBroker(
+        settings.events_queue_size,
+        settings.events_history_size,
+        resync_seconds=settings.events_resync_seconds,
+    )
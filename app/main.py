@@ -1,31 +1,247 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-import io
-import json
+from functools import partial
 import os
-from typing import Any
-
-from fastapi import Depends, FastAPI, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, RedirectResponse, StreamingResponse
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Annotated, Any, Literal
+from uuid import UUID
+
+import httpx
+from fastapi import Depends, FastAPI, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    PlainTextResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+
+from app.audit import AuditSink
+from app.backup import (
+    MEDIA_TYPES,
+    RestoreInProgress,
+    gzip_chunks,
+    iter_upload,
+    order_delta_chain,
+    read_upload_meta,
+    restore_backup,
+    stream_backup,
+)
+from app.conditional import ETagMiddleware, NotModified, etag_matches, make_etag, not_modified_response
 from app.config import get_settings
-from app.db import DataAccess, build_data_access
-from app.obs import RequestContextMiddleware, configure_logging, log_event, metrics
+from app.db import PROJECTIONS, AsyncDataAccess, AuditFilter, DataAccess, async_pool, is_configured, pool
+from app.events import get_event_broker
+from app.obs import RequestContextMiddleware, configure_logging, log_event, metrics, readiness, started_at
+from app.pagination import MAX_PAGE_SIZE, InvalidCursor, Page
 from app.services.agent import run_agent_flow
+from app.services.incidents import load_incident_detail
 
 
 configure_logging()
-app = FastAPI(title="OpsBoard")
+
+
+def _write_audit_rows(rows: list[dict[str, Any]]) -> None:
+    try:
+        pool.get().insert_audit_events(rows)
+    except httpx.TransportError:
+        pool.invalidate()
+        raise
+
+
+def build_audit_sink() -> AuditSink | None:
+    settings = get_settings()
+    if not settings.audit_async or not is_configured():
+        return None
+    return AuditSink(
+        _write_audit_rows,
+        max_queue=settings.audit_queue_size,
+        batch_size=settings.audit_batch_size,
+        flush_interval_ms=settings.audit_flush_ms,
+        overflow=settings.audit_overflow,
+        spill_path=settings.audit_spill_path,
+    )
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    audit_sink = build_audit_sink()
+    if audit_sink is not None:
+        audit_sink.start()
+        pool.audit_sink = async_pool.audit_sink = audit_sink
+    await async_pool.open()
+    yield
+    await async_pool.close()
+    if audit_sink is not None:
+        # Drain queued audit rows while the sync client they are written with is still open.
+        await asyncio.to_thread(audit_sink.close)
+        pool.audit_sink = async_pool.audit_sink = None
+    pool.close()
+
+
+app = FastAPI(title="OpsBoard", lifespan=lifespan)
+app.add_middleware(ETagMiddleware)
 app.add_middleware(RequestContextMiddleware)
+app.add_exception_handler(NotModified, not_modified_response)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 templates = Jinja2Templates(directory="app/templates")
 
 
-def get_data_access() -> DataAccess:
-    return build_data_access()
+async def get_data_access() -> AsyncIterator[AsyncDataAccess]:
+    try:
+        yield await async_pool.get()
+    except httpx.TransportError:
+        async_pool.invalidate()
+        raise
+
+
+def get_blocking_data_access() -> Iterator[DataAccess]:
+    """Sync DataAccess for work that has to run on the threadpool anyway (LLM agent calls)."""
+    try:
+        yield pool.get()
+    except httpx.TransportError:
+        pool.invalidate()
+        raise
+
+
+async def load_page(listing: Callable[..., Awaitable[Page]], limit: int | None, cursor: str | None) -> Page:
+    try:
+        return await listing(limit=limit, cursor=cursor)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+PageLimit = Query(None, ge=1, le=MAX_PAGE_SIZE)
+
+
+def conditional_get(*tables: str, vary: Callable[[AsyncDataAccess], Awaitable[str]] | None = None):
+    """Route dependency answering ``If-None-Match`` from the version counters of ``tables``.
+
+    A matching tag short-circuits into an empty 304 before the route runs, so neither the listing
+    query nor the template render happens; otherwise the tag is attached to the 200 response by
+    ETagMiddleware. ``vary`` covers response inputs that are not table rows. Without migration
+    012 no tag is computed and the route always renders. Returns the versions the tag was made
+    from (None when untagged).
+    """
+
+    async def dependency(
+        request: Request, db: AsyncDataAccess = Depends(get_data_access)
+    ) -> dict[str, int] | None:
+        try:
+            versions = await db.change_versions(*tables)
+        except Exception:
+            # Untagged is always correct; the route itself reports the outage (/api/status: db_ok).
+            return None
+        if versions is None:
+            return None
+        etag = make_etag(request, versions, await vary(db) if vary is not None else "")
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise NotModified(etag)
+        request.state.etag = etag
+        return versions
+
+    return dependency
+
+
+def listing_version(table: str):
+    """``conditional_get(table)`` for a cached listing route; yields the version to list under.
+
+    The listing is cached under the same version the ETag was made from, so the body can never
+    be older than its tag (see ListingCache).
+    """
+    check = conditional_get(table)
+
+    async def dependency(versions: dict[str, int] | None = Depends(check)) -> int | None:
+        return versions[table] if versions else None
+
+    return dependency
+
+
+async def _status_vary(db: AsyncDataAccess) -> str:
+    return f"{await readiness.check(db.ping)}:{bool(os.getenv('GEMINI_API_KEY'))}"
+
+
+def live_since() -> str | None:
+    """Resume point for the page's ``/events`` stream; None when live updates are off."""
+    broker = get_event_broker()
+    return broker.cursor() if broker is not None else None
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    # datetime-local inputs carry no offset; the board shows UTC everywhere.
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def get_audit_filter(
+    action: str | None = None,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+) -> AuditFilter:
+    # Empty strings come from blank fields of the filter form and mean "any".
+    try:
+        return AuditFilter(
+            action=action or None,
+            entity_type=entity_type or None,
+            entity_id=entity_id or None,
+            since=_parse_time(since),
+            until=_parse_time(until),
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="since/until must be ISO 8601 timestamps") from exc
+
+
+CardColumn = Literal["Todo", "In Progress", "Done", "Remediation"]
+
+
+class CardCreate(BaseModel):
+    title: str = Field(..., min_length=2, max_length=120)
+    description: str = Field("", max_length=500)
+    column_name: CardColumn = "Todo"
+
+
+class CardMove(BaseModel):
+    column_name: CardColumn
+
+
+# Operations per POST /api/cards/batch.
+CARD_BATCH_MAX = 500
+
+
+class CardCreateOp(CardCreate):
+    op: Literal["create"]
+
+
+class CardMoveOp(CardMove):
+    op: Literal["move"]
+    id: UUID
+
+
+class CardDeleteOp(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+class CardBatch(BaseModel):
+    operations: list[Annotated[CardCreateOp | CardMoveOp | CardDeleteOp, Field(discriminator="op")]] = Field(
+        ..., min_length=1, max_length=CARD_BATCH_MAX
+    )
+
+
+def card_view(card: dict[str, Any]) -> dict[str, Any]:
+    """A card as the JSON API returns it: the same fields as a ``/api/cards`` item."""
+    return {column: card.get(column) for column in PROJECTIONS["board"]}
 
 
 def split_cards(cards: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
@@ -46,70 +262,85 @@ def summarize_audit_payload(event: dict[str, Any]) -> str:
     if event.get("action") == "watcher_run":
         return f"created_incidents={payload.get('created_incidents', 0)}"
     if event.get("action") == "restore_applied":
-        return f"tables={len(payload.get('tables', []))}"
+        return f"tables={len(payload.get('tables', []))} | rows={sum((payload.get('rows') or {}).values())}"
     return "-"
 
 
 @app.get("/", response_class=HTMLResponse)
-def root() -> RedirectResponse:
+async def root() -> RedirectResponse:
     return RedirectResponse("/board", status_code=302)
 
 
 @app.get("/board", response_class=HTMLResponse)
-def board_page(request: Request, db: DataAccess = Depends(get_data_access)):
-    cards = db.list_cards()
+async def board_page(
+    request: Request,
+    cursor: str | None = None,
+    limit: int | None = PageLimit,
+    version: int | None = Depends(listing_version("cards")),
+    db: AsyncDataAccess = Depends(get_data_access),
+):
+    page = await load_page(partial(db.list_cards, version=version), limit, cursor)
     return templates.TemplateResponse(
         request,
         "board.html",
         {
             "app_name": get_settings().app_name,
             "request": request,
-            "columns": split_cards(cards),
+            "columns": split_cards(page.items),
+            "next_cursor": page.next_cursor,
+            "live_since": live_since(),
         },
     )
 
 
 @app.post("/cards")
-def create_card(
-    request: Request,
+async def create_card(
     title: str = Form(..., min_length=2, max_length=120),
     description: str = Form("", max_length=500),
     column_name: str = Form("Todo"),
-    db: DataAccess = Depends(get_data_access),
+    db: AsyncDataAccess = Depends(get_data_access),
 ):
-    db.create_card(title=title, description=description, column_name=column_name)
-    log_event("domain_event", request_id=request.state.request_id, action="card_created")
+    await db.create_card(title=title, description=description, column_name=column_name)
+    log_event("domain_event", action="card_created")
     return RedirectResponse("/board", status_code=303)
 
 
 @app.post("/cards/{card_id}/move")
-def move_card(
+async def move_card(
     card_id: str,
-    request: Request,
     column_name: str = Form(...),
-    db: DataAccess = Depends(get_data_access),
+    db: AsyncDataAccess = Depends(get_data_access),
 ):
-    db.move_card(card_id, column_name)
-    log_event("domain_event", request_id=request.state.request_id, action="card_moved", card_id=card_id)
+    await db.move_card(card_id, column_name)
+    log_event("domain_event", action="card_moved", card_id=card_id)
     return RedirectResponse("/board", status_code=303)
 
 
 @app.post("/cards/{card_id}/delete")
-def delete_card(card_id: str, db: DataAccess = Depends(get_data_access)):
-    db.delete_card(card_id)
+async def delete_card(card_id: str, db: AsyncDataAccess = Depends(get_data_access)):
+    await db.delete_card(card_id)
     return RedirectResponse("/board", status_code=303)
 
 
 @app.get("/alerts", response_class=HTMLResponse)
-def alerts_page(request: Request, db: DataAccess = Depends(get_data_access)):
+async def alerts_page(
+    request: Request,
+    cursor: str | None = None,
+    limit: int | None = PageLimit,
+    version: int | None = Depends(listing_version("alerts")),
+    db: AsyncDataAccess = Depends(get_data_access),
+):
     created = request.query_params.get("created_incidents")
     incident_id = request.query_params.get("incident_id")
+    page = await load_page(partial(db.list_alerts, version=version), limit, cursor)
     return templates.TemplateResponse(
         request,
         "alerts.html",
         {
             "request": request,
-            "alerts": db.list_alerts(),
+            "alerts": page.items,
+            "next_cursor": page.next_cursor,
+            "live_since": live_since(),
             "created_incidents": created,
             "incident_id": incident_id,
             "app_name": get_settings().app_name,
@@ -118,35 +349,29 @@ def alerts_page(request: Request, db: DataAccess = Depends(get_data_access)):
 
 
 @app.post("/alerts")
-def create_alert(
-    request: Request,
+async def create_alert(
     title: str = Form(..., min_length=3, max_length=120),
     severity: str = Form(..., pattern="^(low|medium|high|critical)$"),
     source: str = Form("manual"),
-    db: DataAccess = Depends(get_data_access),
+    db: AsyncDataAccess = Depends(get_data_access),
 ):
-    alert = db.create_alert(title=title, severity=severity, source=source)
-    log_event("domain_event", request_id=request.state.request_id, action="alert_created", alert_id=alert["id"])
+    alert = await db.create_alert(title=title, severity=severity, source=source)
+    log_event("domain_event", action="alert_created", alert_id=alert["id"])
     return RedirectResponse("/alerts", status_code=303)
 
 
 @app.post("/alerts/demo-high")
-def create_demo_high_alert(db: DataAccess = Depends(get_data_access)):
-    db.create_alert(title="Demo HIGH: API latency spike", severity="high", source="demo")
+async def create_demo_high_alert(db: AsyncDataAccess = Depends(get_data_access)):
+    await db.create_alert(title="Demo HIGH: API latency spike", severity="high", source="demo")
     return RedirectResponse("/alerts", status_code=303)
 
 
 @app.post("/watcher/run-once")
-def run_watcher_once(request: Request, db: DataAccess = Depends(get_data_access)):
-    created = 0
-    incident_ids: list[str] = []
-    for alert in db.list_unescalated_high_alerts():
-        incident = db.create_incident_from_alert(alert)
-        incident_ids.append(incident["id"])
-        created += 1
-    db.create_audit_event("watcher_run", "system", "watcher", {"created_incidents": created})
-    log_event("domain_event", request_id=request.state.request_id, action="watcher_run", created=created)
-    first_incident = incident_ids[0] if incident_ids else ""
+async def run_watcher_once(db: AsyncDataAccess = Depends(get_data_access)):
+    incidents = await db.escalate_pending_alerts()
+    created = len(incidents)
+    log_event("domain_event", action="watcher_run", created=created)
+    first_incident = incidents[0]["id"] if incidents else ""
     return RedirectResponse(
         f"/alerts?created_incidents={created}&incident_id={first_incident}",
         status_code=303,
@@ -154,60 +379,77 @@ def run_watcher_once(request: Request, db: DataAccess = Depends(get_data_access)
 
 
 @app.get("/incidents", response_class=HTMLResponse)
-def incidents_page(request: Request, db: DataAccess = Depends(get_data_access)):
+async def incidents_page(
+    request: Request,
+    cursor: str | None = None,
+    limit: int | None = PageLimit,
+    version: int | None = Depends(listing_version("incidents")),
+    db: AsyncDataAccess = Depends(get_data_access),
+):
+    page = await load_page(partial(db.list_incidents, version=version), limit, cursor)
     return templates.TemplateResponse(
         request,
         "incidents.html",
-        {"request": request, "incidents": db.list_incidents(), "app_name": get_settings().app_name},
+        {
+            "request": request,
+            "incidents": page.items,
+            "next_cursor": page.next_cursor,
+            "live_since": live_since(),
+            "app_name": get_settings().app_name,
+        },
     )
 
 
 @app.get("/incidents/{incident_id}", response_class=HTMLResponse)
-def incident_detail(request: Request, incident_id: str, db: DataAccess = Depends(get_data_access)):
-    incident = db.get_incident(incident_id)
-    if not incident:
+async def incident_detail(request: Request, incident_id: str, db: AsyncDataAccess = Depends(get_data_access)):
+    view = await load_incident_detail(db, incident_id)
+    if view is None:
         raise HTTPException(status_code=404, detail="Incident not found")
-    timeline = db.list_audit_for_entity(incident_id)
-    notes = db.list_incident_notes(incident_id)
-    triage_note = next((n for n in notes if n["note_type"] == "triage"), None)
-    remediation_cards = db.list_agent_cards_for_incident(incident_id)
     return templates.TemplateResponse(
         request,
         "incident_detail.html",
         {
             "request": request,
-            "incident": incident,
-            "timeline": timeline,
-            "triage_note": triage_note,
-            "remediation_cards": remediation_cards,
+            "incident": view.incident,
+            "timeline": view.timeline,
+            "triage_note": view.triage_note,
+            "remediation_cards": view.remediation_cards,
             "app_name": get_settings().app_name,
         },
     )
 
 
 @app.post("/incidents/{incident_id}/status")
-def incident_update_status(incident_id: str, status: str = Form(...), db: DataAccess = Depends(get_data_access)):
-    db.update_incident_status(incident_id, status)
+async def incident_update_status(incident_id: str, status: str = Form(...), db: AsyncDataAccess = Depends(get_data_access)):
+    await db.update_incident_status(incident_id, status)
     return RedirectResponse(f"/incidents/{incident_id}", status_code=303)
 
 
 @app.get("/audit", response_class=HTMLResponse)
-def audit_page(request: Request, db: DataAccess = Depends(get_data_access)):
-    events = db.list_audit_events()
-    action_filter = request.query_params.get("action")
-    if action_filter:
-        events = [event for event in events if event.get("action") == action_filter]
+async def audit_page(
+    request: Request,
+    cursor: str | None = None,
+    limit: int | None = PageLimit,
+    filters: AuditFilter = Depends(get_audit_filter),
+    db: AsyncDataAccess = Depends(get_data_access),
+):
+    page = await load_page(partial(db.list_audit_events, filters=filters), limit, cursor)
+    events = page.items
     for event in events:
         event["payload_summary"] = summarize_audit_payload(event)
     return templates.TemplateResponse(
-        request, "audit.html", {"request": request, "events": events, "app_name": get_settings().app_name}
+        request,
+        "audit.html",
+        {"request": request, "events": events, "next_cursor": page.next_cursor, "app_name": get_settings().app_name},
     )
 
 
 @app.get("/monitoring", response_class=HTMLResponse)
-def monitoring_page(request: Request, db: DataAccess = Depends(get_data_access)):
-    counts = db.counts()
-    watcher = db.latest_event_by_action("watcher_run")
+async def monitoring_page(request: Request, db: AsyncDataAccess = Depends(get_data_access)):
+    counts, watcher = await asyncio.gather(
+        db.counts(estimated=get_settings().counts_estimated),
+        db.latest_event_by_action("watcher_run"),
+    )
     status = {
         "api_ok": True,
         "db_ok": True,
@@ -222,20 +464,52 @@ def monitoring_page(request: Request, db: DataAccess = Depends(get_data_access))
     )
 
 
+@app.get("/events")
+async def events_stream(request: Request, since: str | None = None):
+    """Server-Sent Events feed of board, alert and incident changes (see app/static/live.js)."""
+    broker = get_event_broker()
+    if broker is None:
+        # EventSource gives up on 204 instead of reconnecting.
+        return Response(status_code=204)
+    settings = get_settings()
+    body = broker.stream(
+        request.headers.get("last-event-id"),
+        since,
+        heartbeat=settings.events_heartbeat_seconds,
+        max_seconds=settings.events_max_stream_seconds,
+    )
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/livez")
+async def livez():
+    return {"status": "ok", "started_at": started_at}
+
+
+@app.get("/readyz")
+async def readyz(db: AsyncDataAccess = Depends(get_data_access)):
+    ready = await readiness.check(db.ping)
+    body = {"status": "ok" if ready else "unavailable", "db_ok": ready, "checked_at": readiness.checked_at}
+    if not ready:
+        body["error"] = readiness.error
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
 @app.get("/health")
-def health(db: DataAccess = Depends(get_data_access)):
-    db.counts()
+async def health(db: AsyncDataAccess = Depends(get_data_access)):
+    if not await readiness.check(db.ping):
+        raise HTTPException(status_code=503, detail="Database unavailable")
     return {"status": "ok", "time": datetime.now(timezone.utc).isoformat()}
 
 
-@app.get("/api/status")
-def api_status(db: DataAccess = Depends(get_data_access)):
-    db_ok = True
-    try:
-        db.counts()
-    except Exception:
-        db_ok = False
-    watcher = db.latest_event_by_action("watcher_run") if db_ok else None
+@app.get("/api/status", dependencies=[Depends(conditional_get("audit_events", vary=_status_vary))])
+async def api_status(db: AsyncDataAccess = Depends(get_data_access)):
+    db_ok = await readiness.check(db.ping)
+    watcher = await db.latest_event_by_action("watcher_run") if db_ok else None
     return {
         "api_ok": True,
         "db_ok": db_ok,
@@ -245,11 +519,112 @@ def api_status(db: DataAccess = Depends(get_data_access)):
     }
 
 
+@app.get("/api/cards")
+async def api_cards(
+    cursor: str | None = None,
+    limit: int | None = PageLimit,
+    version: int | None = Depends(listing_version("cards")),
+    db: AsyncDataAccess = Depends(get_data_access),
+):
+    return (await load_page(partial(db.list_cards, version=version), limit, cursor)).to_dict()
+
+
+@app.post("/api/cards", status_code=201)
+async def api_create_card(body: CardCreate, db: AsyncDataAccess = Depends(get_data_access)):
+    card = await db.create_card(title=body.title, description=body.description, column_name=body.column_name)
+    log_event("domain_event", action="card_created")
+    return card_view(card)
+
+
+@app.post("/api/cards/batch")
+async def api_card_batch(body: CardBatch, db: AsyncDataAccess = Depends(get_data_access)):
+    """Apply create/move/delete operations in bulk; one result per operation, in order.
+
+    ``atomic`` says whether the batch ran as one transaction (migration 013) or as separate
+    bulk requests. Each card id may appear once, so the order of operations within a batch
+    never matters.
+    """
+    ids = [str(op.id) for op in body.operations if not isinstance(op, CardCreateOp)]
+    if len(ids) != len(set(ids)):
+        raise HTTPException(status_code=422, detail="Each card id may appear only once per batch")
+    result = await db.apply_card_batch(
+        creates=[op.model_dump(exclude={"op"}) for op in body.operations if isinstance(op, CardCreateOp)],
+        moves={str(op.id): op.column_name for op in body.operations if isinstance(op, CardMoveOp)},
+        deletes=[str(op.id) for op in body.operations if isinstance(op, CardDeleteOp)],
+    )
+    created = iter(result["created"])
+    moved = {card["id"]: card for card in result["moved"]}
+    deleted = set(result["deleted"])
+    results: list[dict[str, Any]] = []
+    for op in body.operations:
+        if isinstance(op, CardCreateOp):
+            results.append({"op": "create", "status": "created", "card": card_view(next(created))})
+        elif isinstance(op, CardMoveOp):
+            card = moved.get(str(op.id))
+            if card is None:
+                results.append({"op": "move", "id": str(op.id), "status": "not_found"})
+            else:
+                results.append({"op": "move", "id": str(op.id), "status": "moved", "card": card_view(card)})
+        else:
+            status = "deleted" if str(op.id) in deleted else "not_found"
+            results.append({"op": "delete", "id": str(op.id), "status": status})
+    log_event("domain_event", action="cards_batch", operations=len(results), atomic=result["atomic"])
+    return {"atomic": result["atomic"], "results": results}
+
+
+@app.patch("/api/cards/{card_id}")
+async def api_move_card(card_id: UUID, body: CardMove, db: AsyncDataAccess = Depends(get_data_access)):
+    card = await db.move_card(str(card_id), body.column_name)
+    if card is None:
+        raise HTTPException(status_code=404, detail="Card not found")
+    log_event("domain_event", action="card_moved", card_id=str(card_id))
+    return card_view(card)
+
+
+@app.delete("/api/cards/{card_id}", status_code=204)
+async def api_delete_card(card_id: UUID, db: AsyncDataAccess = Depends(get_data_access)):
+    if not await db.delete_card(str(card_id)):
+        raise HTTPException(status_code=404, detail="Card not found")
+    return Response(status_code=204)
+
+
+@app.get("/api/alerts")
+async def api_alerts(
+    cursor: str | None = None,
+    limit: int | None = PageLimit,
+    version: int | None = Depends(listing_version("alerts")),
+    db: AsyncDataAccess = Depends(get_data_access),
+):
+    return (await load_page(partial(db.list_alerts, version=version), limit, cursor)).to_dict()
+
+
+@app.get("/api/incidents")
+async def api_incidents(
+    cursor: str | None = None,
+    limit: int | None = PageLimit,
+    version: int | None = Depends(listing_version("incidents")),
+    db: AsyncDataAccess = Depends(get_data_access),
+):
+    return (await load_page(partial(db.list_incidents, version=version), limit, cursor)).to_dict()
+
+
+@app.get("/api/audit")
+async def api_audit(
+    cursor: str | None = None,
+    limit: int | None = PageLimit,
+    filters: AuditFilter = Depends(get_audit_filter),
+    db: AsyncDataAccess = Depends(get_data_access),
+):
+    return (await load_page(partial(db.list_audit_events, filters=filters), limit, cursor)).to_dict()
+
+
 @app.get("/metrics")
-def metrics_endpoint(db: DataAccess = Depends(get_data_access)):
-    counts = db.counts()
+async def metrics_endpoint(db: AsyncDataAccess = Depends(get_data_access)):
+    counts = await db.counts(estimated=get_settings().counts_estimated)
     body = "\n".join(
         [
+            *metrics.render_prometheus(),
+            *metrics.render_counters(),
             "# HELP opsboard_requests_total Total HTTP requests",
             "# TYPE opsboard_requests_total counter",
             f"opsboard_requests_total {metrics.requests_total}",
@@ -269,21 +644,20 @@ def metrics_endpoint(db: DataAccess = Depends(get_data_access)):
 
 
 @app.post("/api/agent/run")
-def agent_run_api(
-    request: Request,
+async def agent_run_api(
     incident_id: str,
     mode: str = "both",
-    db: DataAccess = Depends(get_data_access),
+    db: DataAccess = Depends(get_blocking_data_access),
 ):
     if mode not in {"triage", "plan", "both"}:
         raise HTTPException(status_code=400, detail="mode must be triage, plan, or both")
     try:
-        result = run_agent_flow(db, incident_id=incident_id, mode=mode)
+        # Gemini SDK calls block, so the whole agent flow runs off the event loop.
+        result = await run_in_threadpool(run_agent_flow, db, incident_id=incident_id, mode=mode)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     log_event(
         "domain_event",
-        request_id=request.state.request_id,
         action="agent_ran",
         incident_id=incident_id,
         mode=mode,
@@ -294,37 +668,81 @@ def agent_run_api(
 
 
 @app.get("/dr", response_class=HTMLResponse)
-def dr_page(request: Request):
+async def dr_page(request: Request):
     restored = request.query_params.get("restored") == "1"
     return templates.TemplateResponse(
         request,
         "dr.html",
-        {"request": request, "restored": restored, "app_name": get_settings().app_name},
+        {
+            "request": request,
+            "restored": restored,
+            "restored_rows": request.query_params.get("rows"),
+            "app_name": get_settings().app_name,
+        },
     )
 
 
 @app.get("/dr/export")
-def dr_export(db: DataAccess = Depends(get_data_access)):
-    payload = db.export_all()
-    blob = io.BytesIO(json.dumps(payload, ensure_ascii=True, indent=2).encode("utf-8"))
+async def dr_export(
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    gzip: bool = False,
+    since: str | None = None,
+    db: AsyncDataAccess = Depends(get_data_access),
+):
+    try:
+        watermark = _parse_time(since)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="since must be an ISO 8601 timestamp") from exc
+    # Taken before the first page is read: the next delta starts here.
+    exported_at = datetime.now(timezone.utc)
+    chunks = stream_backup(db, format, since=watermark, exported_at=exported_at)
+    if watermark:
+        filename = f"opsboard-delta-{exported_at:%Y%m%dT%H%M%SZ}.{format}"
+    else:
+        filename = f"opsboard-backup.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        chunks, filename, media_type = gzip_chunks(chunks), f"{filename}.gz", "application/gzip"
     return StreamingResponse(
-        blob,
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=opsboard-backup.json"},
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            # "Z" rather than "+00:00" so the value survives being pasted into a query string.
+            "X-Backup-Watermark": exported_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        },
     )
 
 
 @app.post("/dr/import")
-async def dr_import(file: UploadFile = File(...), db: DataAccess = Depends(get_data_access)):
-    raw = await file.read()
-    payload = json.loads(raw.decode("utf-8"))
-    db.import_all(payload)
-    db.create_audit_event("restore_applied", "system", "backup", {"tables": list(payload.keys())})
-    return RedirectResponse("/dr?restored=1", status_code=303)
+async def dr_import(
+    file: UploadFile = File(...),
+    deltas: list[UploadFile] = File(default=[]),
+    db: AsyncDataAccess = Depends(get_data_access),
+):
+    deltas = [d for d in deltas if d.filename]
+    try:
+        # Replay order comes from the watermarks recorded in the files, never from their names.
+        order = order_delta_chain(
+            await read_upload_meta(file), [await read_upload_meta(delta) for delta in deltas]
+        )
+        chain = [file, *(deltas[index] for index in order)]
+        restored = await restore_backup(db, [iter_upload(upload) for upload in chain])
+    except RestoreInProgress as exc:
+        raise HTTPException(status_code=409, detail="Another restore is in progress") from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid backup: {exc}") from exc
+    await db.create_audit_event(
+        "restore_applied",
+        "system",
+        "backup",
+        {"tables": [t for t, n in restored.items() if n], "rows": restored, "deltas": len(chain) - 1},
+    )
+    return RedirectResponse(f"/dr?restored=1&rows={sum(restored.values())}", status_code=303)
 
 
 @app.get("/tools")
-def tools_descriptor():
+async def tools_descriptor():
     return JSONResponse(
         {
             "name": "opsboard-tools",
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import fcntl
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+from collections.abc import Iterator
+
+from app.obs import LATENCY_BUCKETS_SECONDS, CounterKey, SeriesSnapshot, _MetricsView, _RouteSeries
+
+# File layout (as in prometheus_client's multiprocess mode): an 8-byte header holding the number
+# of used bytes, then append-only entries of [uint32 key length][utf-8 key, padded][float64].
+# The padding keeps every value 8-byte aligned, so a reader never sees a torn double.
+_HEADER = struct.Struct("<I4x")
+_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_BYTES = 64 * 1024
+
+# Keys of plain counters (``inc``); request series keys start with their JSON labels.
+COUNTER_PREFIX = "counter|"
+WORKER_PREFIX = "worker_"
+ARCHIVE_FILE = "archive.db"
+LOCK_FILE = "compact.lock"
+
+
+def _entries(data, used: int) -> Iterator[tuple[str, float, int]]:
+    """``(key, value, value_offset)`` for every entry in the first ``used`` bytes."""
+    pos = _HEADER.size
+    while pos < used:
+        (length,) = _LENGTH.unpack_from(data, pos)
+        pos += _LENGTH.size
+        key = bytes(data[pos : pos + length]).decode("utf-8")
+        pos += length + (-(_LENGTH.size + length) % 8)
+        (value,) = _VALUE.unpack_from(data, pos)
+        yield key, value, pos
+        pos += _VALUE.size
+
+
+class MmapValues:
+    """Float values by string key in one mmap'd file.
+
+    Exactly one process writes a file (callers serialise their own threads); any number of
+    processes read it with :func:`read_values`. The header is updated after an entry is
+    complete, so readers only ever see whole entries.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a+b")  # noqa: SIM115 - kept open for the mmap's lifetime
+        self._capacity = os.fstat(self._file.fileno()).st_size
+        if self._capacity == 0:
+            self._capacity = _INITIAL_BYTES
+            self._file.truncate(self._capacity)
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._used = _HEADER.unpack_from(self._map, 0)[0] or _HEADER.size
+        self._offsets = {key: offset for key, _, offset in _entries(self._map, self._used)}
+
+    def add(self, key: str, amount: float) -> None:
+        offset = self._offsets.get(key)
+        if offset is None:
+            offset = self._append(key)
+        (value,) = _VALUE.unpack_from(self._map, offset)
+        _VALUE.pack_into(self._map, offset, value + amount)
+
+    def _append(self, key: str) -> int:
+        encoded = key.encode("utf-8")
+        padding = -(_LENGTH.size + len(encoded)) % 8
+        entry = _LENGTH.pack(len(encoded)) + encoded + b" " * padding + _VALUE.pack(0.0)
+        while self._used + len(entry) > self._capacity:
+            self._capacity *= 2
+            self._file.truncate(self._capacity)
+            self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._map[self._used : self._used + len(entry)] = entry
+        self._used += len(entry)
+        _HEADER.pack_into(self._map, 0, self._used)
+        offset = self._offsets[key] = self._used - _VALUE.size
+        return offset
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+def read_values(path: str) -> Iterator[tuple[str, float]]:
+    with open(path, "rb") as handle:
+        data = handle.read()
+    if len(data) < _HEADER.size:
+        return
+    used = min(_HEADER.unpack_from(data, 0)[0], len(data))
+    for key, value, _ in _entries(data, used):
+        yield key, value
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _worker_pid(path: str) -> int | None:
+    name = os.path.basename(path)
+    try:
+        return int(name[len(WORKER_PREFIX) : -len(".db")])
+    except ValueError:
+        return None
+
+
+def compact_dead_workers(directory: str) -> int:
+    """Fold the files of exited workers into the archive file and delete them.
+
+    Keeps whole-server counters monotonic across worker restarts (gunicorn ``max_requests``,
+    crashes) while the directory only holds one file per live worker. Returns the number of
+    files folded.
+    """
+    dead = [
+        path
+        for path in glob.glob(os.path.join(directory, f"{WORKER_PREFIX}*.db"))
+        if (pid := _worker_pid(path)) is not None and pid != os.getpid() and not _pid_alive(pid)
+    ]
+    if not dead:
+        return 0
+    folded = 0
+    with open(os.path.join(directory, LOCK_FILE), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive = MmapValues(os.path.join(directory, ARCHIVE_FILE))
+        try:
+            for path in dead:
+                if not os.path.exists(path):  # another worker got here first
+                    continue
+                for key, value in read_values(path):
+                    archive.add(key, value)
+                os.remove(path)
+                folded += 1
+        finally:
+            archive.close()
+    return folded
+
+
+class MultiProcessMetrics(_MetricsView):
+    """Request metrics shared by all worker processes through files in ``directory``.
+
+    Each process appends to its own ``worker_<pid>.db`` (opened lazily, and reopened after a
+    fork), so ``observe`` never takes a cross-process lock. A scrape sums every file in the
+    directory, whichever worker serves it. Point ``directory`` at a fresh (ideally tmpfs)
+    directory on every deploy; files of workers that have exited are folded into the archive.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._values: MmapValues | None = None
+        self._keys: dict[tuple[str, str, int], tuple[str, str, str]] = {}
+        self._counter_keys: dict[CounterKey, str] = {}
+
+    def _worker_file(self) -> MmapValues:
+        pid = os.getpid()
+        if self._pid != pid:
+            # A forked child must not keep writing through the parent's mapping.
+            self._values = MmapValues(os.path.join(self.directory, f"{WORKER_PREFIX}{pid}.db"))
+            self._pid = pid
+        return self._values
+
+    def observe(self, method: str, route: str, status: int, elapsed_ms: float) -> None:
+        seconds = elapsed_ms / 1000
+        bucket = bisect_left(LATENCY_BUCKETS_SECONDS, seconds)
+        series = (method, route, status)
+        keys = self._keys.get(series)
+        if keys is None:
+            labels = json.dumps(series)
+            keys = self._keys[series] = (f"{labels}|count", f"{labels}|sum", f"{labels}|")
+        with self._lock:
+            values = self._worker_file()
+            values.add(keys[0], 1)
+            values.add(keys[1], seconds)
+            if bucket < len(LATENCY_BUCKETS_SECONDS):
+                values.add(f"{keys[2]}{bucket}", 1)
+
+    def inc(self, name: str, labels: dict[str, str], amount: float = 1) -> None:
+        counter = (name, tuple(sorted(labels.items())))
+        key = self._counter_keys.get(counter)
+        if key is None:
+            key = self._counter_keys[counter] = COUNTER_PREFIX + json.dumps([name, counter[1]])
+        with self._lock:
+            self._worker_file().add(key, amount)
+
+    def _read_all(self) -> list[tuple[str, float]]:
+        # Shared lock: a concurrent compaction cannot move a file into the archive mid-read
+        # and have it counted twice.
+        with open(os.path.join(self.directory, LOCK_FILE), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            return [
+                entry
+                for path in sorted(glob.glob(os.path.join(self.directory, "*.db")))
+                for entry in read_values(path)
+            ]
+
+    def _snapshot(self) -> SeriesSnapshot:
+        compact_dead_workers(self.directory)
+        series: dict[tuple[str, str, int], _RouteSeries] = {}
+        for key, value in self._read_all():
+            if key.startswith(COUNTER_PREFIX):
+                continue
+            labels, _, field = key.rpartition("|")
+            method, route, status = json.loads(labels)
+            entry = series.setdefault((method, route, status), _RouteSeries())
+            if field == "count":
+                entry.count += int(value)
+            elif field == "sum":
+                entry.seconds_total += value
+            else:
+                entry.buckets[int(field)] += int(value)
+        return [(key, s.count, s.seconds_total, s.buckets) for key, s in sorted(series.items())]
+
+    def _counter_snapshot(self) -> list[tuple[CounterKey, float]]:
+        counters: dict[CounterKey, float] = {}
+        for key, value in self._read_all():
+            if key.startswith(COUNTER_PREFIX):
+                name, labels = json.loads(key[len(COUNTER_PREFIX) :])
+                counter = (name, tuple((label, label_value) for label, label_value in labels))
+                counters[counter] = counters.get(counter, 0) + value
+        return sorted(counters.items())
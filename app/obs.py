@@ -1,66 +1,417 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import json
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import random
+import threading
 import time
 from typing import Any
 from uuid import uuid4
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional "fast-json" extra
+    orjson = None
+
+LOGGER_NAME = "opsboard"
+ACCESS_LOGGER_NAME = "opsboard.access"
+_logger = logging.getLogger(LOGGER_NAME)
+_access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
+
+
+def _json_default(value: Any) -> str:
+    # Same output as orjson for the values log payloads carry.
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+_json_encoder = json.JSONEncoder(ensure_ascii=True, separators=(",", ":"), default=_json_default)
+_listener: QueueListener | None = None
+
+
+def encode_json(body: dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(body, default=str).decode("utf-8")
+    return _json_encoder.encode(body)
+
+
+class _JsonMessage:
+    """Log message encoded on first ``str()``: on the listener thread when logging is queued."""
+
+    __slots__ = ("_text", "body")
+
+    def __init__(self, body: dict[str, Any]):
+        self.body = body
+        self._text: str | None = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = encode_json(self.body)
+        return self._text
+
+
+class LogQueueHandler(QueueHandler):
+    """Hands records to the listener thread as they are; encoding and the write happen there.
+
+    Once about ``maxsize`` records are waiting, new access-log lines (already sampled, so
+    expendable) are dropped and counted in ``dropped`` rather than stalling the request.
+    Domain and audit events are never dropped: they are written synchronously through
+    ``overflow`` (the listener's own handler) instead, or queued regardless without one.
+    ``SimpleQueue`` has no locking condition variables, so the bound is checked approximately.
+    """
+
+    def __init__(self, maxsize: int, overflow: logging.Handler | None = None):
+        super().__init__(queue.SimpleQueue())
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.queue.qsize() >= self.maxsize:
+            if record.name == ACCESS_LOGGER_NAME:
+                self.dropped += 1
+                return
+            if self.overflow is not None:
+                self.overflow.handle(record)
+                return
+        self.queue.put_nowait(record)
 
 
 def configure_logging() -> None:
+    """Route ``opsboard`` log lines to stderr, through a background thread unless LOG_ASYNC=0.
+
+    Safe to call more than once; only the first call installs handlers.
+    """
+    global _listener
+    settings = get_settings()
     logging.basicConfig(level=logging.INFO, format="%(message)s")
+    _logger.setLevel(settings.log_level.upper())
+    _access_logger.setLevel(settings.log_access_level.upper())
+    if _logger.handlers:
+        return
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(message)s"))
+    if settings.log_async:
+        handler = LogQueueHandler(settings.log_queue_size, overflow=stream)
+        _listener = QueueListener(handler.queue, stream)
+        _listener.start()
+        # Flushes whatever is still queued on interpreter exit.
+        atexit.register(_listener.stop)
+        _logger.addHandler(handler)
+    else:
+        _logger.addHandler(stream)
+    # The root handler would write every line a second time, synchronously.
+    _logger.propagate = False
 
 
-def log_event(event: str, **payload: Any) -> None:
-    body = {
+# Set by RequestContextMiddleware for the duration of a request; tasks and threadpool calls
+# started inside the request inherit it.
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def _log(logger: logging.Logger, level: int, event: str, payload: dict[str, Any]) -> None:
+    if not logger.isEnabledFor(level):
+        return
+    body: dict[str, Any] = {
         "ts": datetime.now(timezone.utc).isoformat(),
         "event": event,
-        **payload,
     }
-    logging.getLogger("opsboard").info(json.dumps(body, ensure_ascii=True))
+    request_id = request_id_var.get()
+    if request_id is not None:
+        body["request_id"] = request_id
+    body.update(payload)
+    # makeRecord + handle skips Logger.log's caller lookup, a stack walk per line.
+    logger.handle(logger.makeRecord(logger.name, level, "", 0, _JsonMessage(body), (), None))
+
+
+def log_event(event: str, **payload: Any) -> None:
+    """Emit one JSON log line; inside a request it carries that request's ``request_id``.
+
+    Never sampled. ``payload`` is encoded later, off the request path, so do not mutate it after
+    the call.
+    """
+    _log(_logger, logging.INFO, event, payload)
+
+
+@dataclass
+class AccessLogSampler:
+    """Decides which ``http_request`` lines are logged.
+
+    Server errors and requests slower than ``slow_ms`` always are. Otherwise requests to
+    ``skip_routes`` (probes, scrapes) are not, and the rest are kept with probability ``rate``.
+    """
+
+    rate: float = 1.0
+    skip_routes: frozenset[str] = frozenset()
+    slow_ms: float = 1000.0
+    _random: Callable[[], float] = field(default=random.random, repr=False)
+
+    @classmethod
+    def from_settings(cls) -> AccessLogSampler:
+        settings = get_settings()
+        return cls(
+            rate=settings.log_http_sample_rate,
+            skip_routes=frozenset(r.strip() for r in settings.log_http_skip_routes.split(",") if r.strip()),
+            slow_ms=settings.log_http_slow_ms,
+        )
+
+    def keep(self, route: str, status: int, elapsed_ms: float) -> bool:
+        if status >= 500 or elapsed_ms >= self.slow_ms:
+            return True
+        if route in self.skip_routes:
+            return False
+        return self.rate >= 1 or self._random() < self.rate
+
+
+access_log = AccessLogSampler.from_settings()
+
+
+# Prometheus-style upper bounds in seconds; the implicit +Inf bucket is the series count.
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
 
 
 @dataclass
-class InMemoryMetrics:
-    requests_total: int = 0
-    request_latency_ms_total: float = 0
-    routes: dict[str, int] = field(default_factory=dict)
+class _RouteSeries:
+    count: int = 0
+    seconds_total: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS_SECONDS))
+
+
+def route_template(scope: dict[str, Any]) -> str:
+    """Route template (``/incidents/{incident_id}``) of a handled request, for bounded labels."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Mounted apps (/static) record their prefix in root_path; anything else did not match.
+    return scope.get("root_path") or "unmatched"
+
+
+SeriesSnapshot = list[tuple[tuple[str, str, int], int, float, list[int]]]
+CounterKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class _MetricsView:
+    """Aggregates and Prometheus rendering shared by the in-process and multi-process stores."""
+
+    def _snapshot(self) -> SeriesSnapshot:
+        raise NotImplementedError
+
+    def _counter_snapshot(self) -> list[tuple[CounterKey, float]]:
+        raise NotImplementedError
+
+    def render_counters(self) -> list[str]:
+        """Counters recorded with ``inc`` (e.g. cache hits), in Prometheus text format."""
+        lines: list[str] = []
+        current = None
+        for (name, labels), value in self._counter_snapshot():
+            if name != current:
+                lines.append(f"# TYPE {name} counter")
+                current = name
+            rendered = ",".join(f'{label}="{label_value}"' for label, label_value in labels)
+            lines.append(f"{name}{{{rendered}}} {value:g}")
+        return lines
 
-    def observe(self, path: str, elapsed_ms: float) -> None:
-        self.requests_total += 1
-        self.request_latency_ms_total += elapsed_ms
-        self.routes[path] = self.routes.get(path, 0) + 1
+    @property
+    def requests_total(self) -> int:
+        return sum(count for _, count, _, _ in self._snapshot())
 
     @property
     def request_latency_ms_avg(self) -> float:
-        if self.requests_total == 0:
+        snapshot = self._snapshot()
+        count = sum(c for _, c, _, _ in snapshot)
+        if count == 0:
             return 0
-        return self.request_latency_ms_total / self.requests_total
+        return sum(total for _, _, total, _ in snapshot) * 1000 / count
+
+    def render_prometheus(self) -> list[str]:
+        snapshot = self._snapshot()
+        lines = [
+            "# HELP opsboard_http_requests_total HTTP requests by method, route template and status",
+            "# TYPE opsboard_http_requests_total counter",
+        ]
+        for (method, route, status), count, _, _ in snapshot:
+            lines.append(f'opsboard_http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+        lines += [
+            "# HELP opsboard_http_request_duration_seconds HTTP request latency",
+            "# TYPE opsboard_http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), count, total, buckets in snapshot:
+            labels = f'method="{method}",route="{route}",status="{status}"'
+            cumulative = 0
+            for bound, hits in zip(LATENCY_BUCKETS_SECONDS, buckets):
+                cumulative += hits
+                lines.append(f'opsboard_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'opsboard_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"opsboard_http_request_duration_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"opsboard_http_request_duration_seconds_count{{{labels}}} {count}")
+        return lines
+
+
+@dataclass
+class InMemoryMetrics(_MetricsView):
+    """Per ``(method, route, status)`` request counters and latency histograms.
+
+    ``observe`` runs on the event loop and on threadpool workers alike; the bucket is found
+    before taking the lock, so the critical section is a handful of integer increments.
+    """
+
+    series: dict[tuple[str, str, int], _RouteSeries] = field(default_factory=dict)
+    counters: dict[CounterKey, float] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def observe(self, method: str, route: str, status: int, elapsed_ms: float) -> None:
+        seconds = elapsed_ms / 1000
+        bucket = bisect_left(LATENCY_BUCKETS_SECONDS, seconds)
+        key = (method, route, status)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = _RouteSeries()
+            series.count += 1
+            series.seconds_total += seconds
+            if bucket < len(series.buckets):
+                series.buckets[bucket] += 1
+
+    def inc(self, name: str, labels: dict[str, str], amount: float = 1) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def _snapshot(self) -> SeriesSnapshot:
+        with self._lock:
+            return [(key, s.count, s.seconds_total, list(s.buckets)) for key, s in sorted(self.series.items())]
 
+    def _counter_snapshot(self) -> list[tuple[CounterKey, float]]:
+        with self._lock:
+            return sorted(self.counters.items())
 
-metrics = InMemoryMetrics()
 
+def build_metrics() -> _MetricsView:
+    """One store per process, or files shared by all workers when METRICS_MULTIPROC_DIR is set."""
+    directory = get_settings().metrics_multiproc_dir
+    if not directory:
+        return InMemoryMetrics()
+    from app.multiproc_metrics import MultiProcessMetrics
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = request.headers.get("x-request-id", str(uuid4()))
-        request.state.request_id = request_id
+    return MultiProcessMetrics(directory)
+
+
+metrics = build_metrics()
+
+
+@dataclass
+class ReadinessProbe:
+    """Caches the result of a backend ping for ``ttl_seconds``.
+
+    Concurrent callers during a refresh get the previous result instead of queueing up
+    behind the ping, so any number of probes cost at most one backend call per TTL window.
+    Only the very first check waits for the in-flight ping.
+    """
+
+    ttl_seconds: float | None = None
+    ok: bool = False
+    error: str | None = None
+    checked_at: str | None = None
+    _checked_monotonic: float | None = None
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def _fresh(self) -> bool:
+        if self._checked_monotonic is None:
+            return False
+        ttl = self.ttl_seconds
+        if ttl is None:
+            ttl = get_settings().readiness_ttl_seconds
+        return time.monotonic() - self._checked_monotonic < ttl
+
+    async def check(self, ping: Callable[[], Awaitable[Any]]) -> bool:
+        if self._fresh():
+            return self.ok
+        if self._lock.locked() and self._checked_monotonic is not None:
+            return self.ok
+        async with self._lock:
+            if not self._fresh():
+                try:
+                    await ping()
+                    self.ok, self.error = True, None
+                # Catch-all on purpose: any failing ping means "not ready", never a 500.
+                except Exception as exc:  # noqa: BLE001
+                    self.ok, self.error = False, type(exc).__name__
+                self.checked_at = datetime.now(timezone.utc).isoformat()
+                self._checked_monotonic = time.monotonic()
+            return self.ok
+
+    def reset(self) -> None:
+        self._lock = asyncio.Lock()
+        self.ok, self.error, self.checked_at, self._checked_monotonic = False, None, None, None
+
+
+readiness = ReadinessProbe()
+started_at = datetime.now(timezone.utc).isoformat()
+
+
+class RequestContextMiddleware:
+    """Request id, access log and metrics as plain ASGI middleware.
+
+    Unlike ``BaseHTTPMiddleware`` there is no extra task or memory stream per request and
+    streamed bodies (DR export) pass straight through. The id is taken from ``x-request-id`` (or
+    generated), exposed as ``request.state.request_id`` and ``request_id_var`` and echoed in the
+    response headers. Latency is measured until the last body chunk has been sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = Headers(scope=scope).get("x-request-id") or str(uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_var.set(request_id)
         started = time.perf_counter()
-        response = await call_next(request)
-        elapsed_ms = (time.perf_counter() - started) * 1000
-        metrics.observe(request.url.path, elapsed_ms)
-        response.headers["x-request-id"] = request_id
-        log_event(
-            "http_request",
-            request_id=request_id,
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
-            elapsed_ms=round(elapsed_ms, 2),
-        )
-        return response
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["x-request-id"] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            route = route_template(scope)
+            metrics.observe(scope["method"], route, status_code, elapsed_ms)
+            if access_log.keep(route, status_code, elapsed_ms):
+                _log(
+                    _access_logger,
+                    logging.ERROR if status_code >= 500 else logging.INFO,
+                    "http_request",
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status_code": status_code,
+                        "elapsed_ms": round(elapsed_ms, 2),
+                        "sample_rate": access_log.rate,
+                    },
+                )
+            request_id_var.reset(token)
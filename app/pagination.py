@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class Page:
+    items: list[dict[str, Any]]
+    next_cursor: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"items": self.items, "next_cursor": self.next_cursor}
+
+
+def clamp_page_size(limit: int | None) -> int:
+    return max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def encode_cursor(row: dict[str, Any], column: str = "created_at") -> str:
+    """Opaque keyset cursor for the ``(column, id)`` position of ``row``."""
+    raw = json.dumps([row[column], row["id"]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        # Both parts end up inside a PostgREST filter, so only well-formed values get through.
+        return datetime.fromisoformat(created_at).isoformat(), str(UUID(row_id))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, AttributeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def keyset_filter(cursor: str, desc: bool, column: str = "created_at") -> str:
+    """PostgREST ``or`` filter selecting rows strictly after the cursor in the listing order."""
+    position, row_id = decode_cursor(cursor)
+    op = "lt" if desc else "gt"
+    # Quoted because timestamps contain PostgREST reserved characters (":" and ".").
+    return f'{column}.{op}."{position}",and({column}.eq."{position}",id.{op}.{row_id})'
+
+
+def page_from_rows(rows: list[dict[str, Any]], limit: int, column: str = "created_at") -> Page:
+    """Rows were fetched with ``limit + 1``; the extra row only signals that another page exists."""
+    items = rows[:limit]
+    return Page(items=items, next_cursor=encode_cursor(items[-1], column) if len(rows) > limit else None)
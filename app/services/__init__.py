@@ -1,4 +1,5 @@
 from app.services.agent import run_agent_flow
+from app.services.incidents import IncidentDetailView, load_incident_detail
 from app.services.llm_gemini import LLMUnavailable, generate_text
 
-__all__ = ["LLMUnavailable", "generate_text", "run_agent_flow"]
+__all__ = ["IncidentDetailView", "LLMUnavailable", "generate_text", "load_incident_detail", "run_agent_flow"]
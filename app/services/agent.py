@@ -86,6 +86,7 @@ def run_agent_flow(db, incident_id: str, mode: str) -> dict[str, Any]:
                 title=task,
                 description=f"Auto-generated remediation for incident {incident_id}",
                 column_name="Todo",
+                incident_id=incident_id,
             )
             task_ids.append(card["id"])
 
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from app.obs import log_event
+
+T = TypeVar("T")
+
+
+@dataclass
+class IncidentDetailView:
+    incident: dict[str, Any]
+    timeline: list[dict[str, Any]]
+    triage_note: dict[str, Any] | None
+    remediation_cards: list[dict[str, Any]]
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+
+async def _timed(name: str, timings: dict[str, float], awaitable: Awaitable[T]) -> T:
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+async def load_incident_detail(db, incident_id: str) -> IncidentDetailView | None:
+    """Fetch everything the incident page shows in one concurrent fan-out.
+
+    Page latency is the slowest lookup rather than the sum; each lookup's time is logged.
+    """
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    incident, timeline, notes, remediation_cards = await asyncio.gather(
+        _timed("get_incident", timings, db.get_incident(incident_id)),
+        _timed("list_audit_for_entity", timings, db.list_audit_for_entity(incident_id)),
+        _timed("list_incident_notes", timings, db.list_incident_notes(incident_id)),
+        _timed("list_agent_cards_for_incident", timings, db.list_agent_cards_for_incident(incident_id)),
+    )
+    log_event(
+        "incident_detail_loaded",
+        incident_id=incident_id,
+        found=incident is not None,
+        timings_ms=timings,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
+    if not incident:
+        return None
+    return IncidentDetailView(
+        incident=incident,
+        timeline=timeline,
+        triage_note=next((n for n in notes if n["note_type"] == "triage"), None),
+        remediation_cards=remediation_cards,
+        timings_ms=timings,
+    )
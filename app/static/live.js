@@ -0,0 +1,273 @@
+// In-place updates for the board, alerts and incidents pages. Changes arrive as small JSON
+// diffs, either from the /events stream or from the /api/cards response to the viewer's own
+// edit, and are applied to the rendered page. New rows are cloned from the
+// <template data-live-template> the page renders, so markup stays in the Jinja templates.
+(() => {
+  const COLUMNS = ["Todo", "In Progress", "Done", "Remediation"];
+  const STATUS_BY_COLUMN = { Todo: "ongoing", "In Progress": "acknowledged", Done: "resolved", Remediation: "acknowledged" };
+  const CARD_STATUSES = ["ongoing", "acknowledged", "resolved"];
+
+  const byId = (attr, id) => document.querySelectorAll(`[${attr}="${CSS.escape(id)}"]`);
+  const setText = (root, field, value) => {
+    root.querySelectorAll(`[data-field="${field}"]`).forEach((el) => {
+      el.textContent = value;
+    });
+  };
+  const replaceClass = (el, prefix, values, value) => {
+    values.forEach((v) => el.classList.remove(`${prefix}${v}`));
+    el.classList.add(`${prefix}${value}`);
+  };
+  const cloneTemplate = (name) => {
+    const template = document.querySelector(`template[data-live-template="${name}"]`);
+    return template ? template.content.firstElementChild.cloneNode(true) : null;
+  };
+  const fillId = (el, attr, id) => {
+    el.setAttribute(attr, id);
+    el.querySelectorAll("form[action]").forEach((form) => {
+      form.setAttribute("action", form.getAttribute("action").replace("//", `/${encodeURIComponent(id)}/`));
+    });
+    el.querySelectorAll("a[href]").forEach((a) => {
+      a.setAttribute("href", a.getAttribute("href") + encodeURIComponent(id));
+    });
+    setText(el, "short-id", `#${id.slice(0, 6)}`);
+  };
+
+  // Board -----------------------------------------------------------------------------------
+  const cardSeverity = (card) => {
+    const text = `${card.title} ${card.description || ""}`.toLowerCase();
+    return ["critical", "high", "medium"].find((level) => text.includes(level)) || "low";
+  };
+
+  const setCardColumn = (el, column) => {
+    const status = STATUS_BY_COLUMN[column] || "ongoing";
+    el.dataset.column = column;
+    el.querySelectorAll("[data-status-class]").forEach((node) => replaceClass(node, "status-", CARD_STATUSES, status));
+    if (el.classList.contains("task-card")) {
+      replaceClass(el, "status-card-", CARD_STATUSES, status);
+    }
+    setText(el, "status", status);
+    setText(el, "column", column);
+  };
+
+  const cardKey = (el) => [COLUMNS.indexOf(el.dataset.column), el.dataset.createdAt];
+
+  const placeCard = (el) => {
+    const board = document.querySelector("[data-live-cards]");
+    const container =
+      board.querySelector(`[data-card-stack="${CSS.escape(el.dataset.column)}"]`) || board;
+    const [column, createdAt] = cardKey(el);
+    const next = [...container.querySelectorAll("[data-card-id]")].find((other) => {
+      const [otherColumn, otherCreatedAt] = cardKey(other);
+      return other !== el && (otherColumn > column || (otherColumn === column && otherCreatedAt > createdAt));
+    });
+    const empty = container.querySelector("[data-live-empty]");
+    container.insertBefore(el, next || (empty && empty.parentNode === container ? empty : null));
+  };
+
+  const refreshBoardCounts = () => {
+    document.querySelectorAll("[data-card-stack]").forEach((stack) => {
+      const count = stack.querySelectorAll("[data-card-id]").length;
+      const head = stack.closest("article");
+      const counter = head && head.querySelector(".column-count");
+      if (counter) {
+        counter.textContent = count;
+      }
+      const empty = stack.querySelector("[data-live-empty]");
+      if (empty) {
+        empty.hidden = count > 0;
+      }
+    });
+  };
+
+  const board = {
+    card_created({ card }) {
+      const root = document.querySelector("[data-live-cards]");
+      if (!root || byId("data-card-id", card.id).length || root.dataset.liveInsert !== "true") {
+        return;
+      }
+      const el = cloneTemplate("card");
+      if (!el) {
+        return;
+      }
+      fillId(el, "data-card-id", card.id);
+      el.dataset.createdAt = card.created_at;
+      setText(el, "title", card.title);
+      setText(el, "description", card.description || "");
+      el.querySelectorAll('[data-field="description"]').forEach((node) => {
+        node.hidden = !card.description;
+      });
+      setText(el, "created-at", card.created_at);
+      el.querySelectorAll("[data-time]").forEach((node) => node.setAttribute("data-time", card.created_at));
+      const severity = cardSeverity(card);
+      setText(el, "severity", severity);
+      el.querySelectorAll(".severity-dot").forEach((node) => replaceClass(node, "severity-", ["low", "medium", "high", "critical"], severity));
+      const aiGenerated = (card.description || "").toLowerCase().includes("auto-generated remediation");
+      setText(el, "source", aiGenerated ? "AI" : "manual");
+      el.querySelectorAll(".ai-mark").forEach((node) => {
+        node.hidden = !aiGenerated;
+      });
+      setCardColumn(el, card.column_name);
+      placeCard(el);
+      if (window.lucide) {
+        window.lucide.createIcons();
+      }
+    },
+    card_moved({ id, column_name }) {
+      byId("data-card-id", id).forEach((el) => {
+        setCardColumn(el, column_name);
+        placeCard(el);
+      });
+    },
+    card_deleted({ id }) {
+      byId("data-card-id", id).forEach((el) => el.remove());
+    },
+    cards_changed({ created, moved, deleted }) {
+      created.forEach((card) => board.card_created({ card }));
+      moved.forEach((move) => board.card_moved(move));
+      deleted.forEach((id) => board.card_deleted({ id }));
+    },
+  };
+
+  // Alerts and incidents --------------------------------------------------------------------
+  const setBadge = (el, field, prefix, value) => {
+    el.querySelectorAll(`[data-field="${field}"]`).forEach((node) => {
+      node.className = `badge ${prefix}${String(value).toLowerCase()}`;
+      node.textContent = value;
+    });
+  };
+
+  const setEscalated = (el, escalated) => {
+    el.querySelectorAll('[data-field="escalated"]').forEach((node) => {
+      node.className = escalated ? "badge severity-low" : "badge status-neutral";
+      node.textContent = escalated ? "yes" : "no";
+    });
+  };
+
+  const prependRow = (listName, el) => {
+    const tbody = document.querySelector(`[data-live-${listName}]`);
+    tbody.insertBefore(el, tbody.firstElementChild);
+    const empty = tbody.querySelector("[data-live-empty]");
+    if (empty) {
+      empty.remove();
+    }
+  };
+
+  const canInsert = (listName) => {
+    const tbody = document.querySelector(`[data-live-${listName}]`);
+    return tbody && tbody.dataset.liveInsert === "true";
+  };
+
+  const lists = {
+    alert_created({ alert }) {
+      if (!canInsert("alerts") || byId("data-alert-id", alert.id).length) {
+        return;
+      }
+      const el = cloneTemplate("alert");
+      fillId(el, "data-alert-id", alert.id);
+      setText(el, "title", alert.title);
+      setBadge(el, "severity", "severity-", alert.severity);
+      setBadge(el, "alert-status", "status-", alert.status);
+      setEscalated(el, alert.escalated);
+      prependRow("alerts", el);
+    },
+    alerts_escalated({ ids }) {
+      ids.forEach((id) => byId("data-alert-id", id).forEach((el) => setEscalated(el, true)));
+    },
+    incidents_created({ incidents }) {
+      if (!canInsert("incidents")) {
+        return;
+      }
+      incidents.forEach((incident) => {
+        if (byId("data-incident-id", incident.id).length) {
+          return;
+        }
+        const el = cloneTemplate("incident");
+        fillId(el, "data-incident-id", incident.id);
+        setText(el, "title", incident.title);
+        setText(el, "created-at", incident.created_at);
+        setBadge(el, "severity", "severity-", incident.severity);
+        setBadge(el, "incident-status", "status-", incident.status);
+        prependRow("incidents", el);
+      });
+    },
+    incident_status_changed({ id, status }) {
+      byId("data-incident-id", id).forEach((el) => setBadge(el, "incident-status", "status-", status));
+    },
+  };
+
+  const handlers = { ...board, ...lists, resync: () => window.location.reload() };
+  const apply = (event) => {
+    const handler = handlers[event.type];
+    if (handler) {
+      handler(event);
+      refreshBoardCounts();
+    }
+  };
+
+  // Card forms ([data-api]) go to the JSON API: one small request, no redirect and re-render.
+  // Any failure falls back to submitting the form to its redirecting HTML route.
+  const cardRequest = async (form) => {
+    const cardEl = form.closest("[data-card-id]");
+    const id = cardEl ? cardEl.dataset.cardId : "";
+    const url = `/api/cards/${encodeURIComponent(id)}`;
+    if (form.dataset.api === "create") {
+      const body = Object.fromEntries(new FormData(form));
+      const response = await fetch("/api/cards", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(body),
+      });
+      if (!response.ok) {
+        throw new Error(`create failed: ${response.status}`);
+      }
+      form.reset();
+      const dialog = form.closest("dialog");
+      if (dialog) {
+        dialog.close();
+      }
+      return { type: "card_created", card: await response.json() };
+    }
+    if (form.dataset.api === "move") {
+      const column_name = new FormData(form).get("column_name");
+      const response = await fetch(url, {
+        method: "PATCH",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ column_name }),
+      });
+      const popover = form.closest("details");
+      if (popover) {
+        popover.open = false;
+      }
+      if (response.status === 404) {
+        return { type: "card_deleted", id };
+      }
+      if (!response.ok) {
+        throw new Error(`move failed: ${response.status}`);
+      }
+      const card = await response.json();
+      return { type: "card_moved", id: card.id, column_name: card.column_name };
+    }
+    const response = await fetch(url, { method: "DELETE" });
+    if (!response.ok && response.status !== 404) {
+      throw new Error(`delete failed: ${response.status}`);
+    }
+    return { type: "card_deleted", id };
+  };
+
+  document.addEventListener("submit", (submit) => {
+    const form = submit.target.closest("form[data-api]");
+    if (!form || !window.fetch) {
+      return;
+    }
+    submit.preventDefault();
+    cardRequest(form)
+      .then(apply)
+      .catch(() => form.submit());
+  });
+
+  const since = document.body.dataset.liveSince;
+  if (since && window.EventSource) {
+    const source = new EventSource(`/events?since=${encodeURIComponent(since)}`);
+    source.onmessage = (message) => apply(JSON.parse(message.data));
+  }
+})();
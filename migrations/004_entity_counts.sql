@@ -0,0 +1,28 @@
+-- All table counts in one round trip (used by /health, /api/status, /metrics, /monitoring).
+-- estimated => pg_class.reltuples (planner estimate, O(1)); falls back to count(*) for
+-- tables that were never analyzed (reltuples = -1).
+create or replace function public.entity_counts(estimated boolean default false)
+returns jsonb
+language plpgsql
+stable
+as $$
+declare
+  tbl text;
+  n bigint;
+  result jsonb := '{}'::jsonb;
+begin
+  foreach tbl in array array['cards', 'alerts', 'incidents', 'audit_events', 'incident_notes'] loop
+    n := null;
+    if estimated then
+      select c.reltuples::bigint into n from pg_class c where c.oid = format('public.%I', tbl)::regclass;
+    end if;
+    if n is null or n < 0 then
+      execute format('select count(*) from public.%I', tbl) into n;
+    end if;
+    result := result || jsonb_build_object(tbl, n);
+  end loop;
+  return result;
+end;
+$$;
+
+grant execute on function public.entity_counts(boolean) to anon, authenticated;
@@ -0,0 +1,8 @@
+-- Remediation cards point at their incident instead of embedding the id in the description.
+-- Existing cards are linked by scripts/backfill_card_incidents.py.
+alter table public.cards
+  add column if not exists incident_id uuid null references public.incidents(id) on delete set null;
+
+create index if not exists idx_cards_incident_id
+  on public.cards(incident_id, created_at)
+  where incident_id is not null;
@@ -0,0 +1,48 @@
+-- One incident per source alert: lets batch escalation insert with
+-- "on conflict (source_alert_id) do nothing", so a retried batch never double-escalates.
+-- NULL source_alert_id (manual incidents) stays unconstrained.
+-- Safe to re-run, and safe on databases where the old per-alert escalation already created
+-- duplicates: those are folded into the earliest incident of their alert first.
+begin;
+
+create temporary table incident_duplicates on commit drop as
+select id, keep_id
+from (
+  select
+    id,
+    first_value(id) over (partition by source_alert_id order by created_at, id) as keep_id
+  from public.incidents
+  where source_alert_id is not null
+) ranked
+where id <> keep_id;
+
+-- Remediation cards follow their incident to the one that is kept.
+update public.cards c
+set incident_id = d.keep_id
+from incident_duplicates d
+where c.incident_id = d.id;
+
+-- Notes move over unless the kept incident already has one of that type; the rest go with
+-- their incident (on delete cascade).
+update public.incident_notes n
+set incident_id = d.keep_id
+from incident_duplicates d
+where n.incident_id = d.id
+  and not exists (
+    select 1 from public.incident_notes k where k.incident_id = d.keep_id and k.note_type = n.note_type
+  )
+  and n.id = (
+    select min(m.id::text)::uuid from public.incident_notes m
+    where m.incident_id in (select id from incident_duplicates where keep_id = d.keep_id)
+      and m.note_type = n.note_type
+  );
+
+delete from public.incidents i
+using incident_duplicates d
+where i.id = d.id;
+
+-- Also matches the incidents_source_alert_id_key constraint earlier versions of this file added.
+create unique index if not exists incidents_source_alert_id_key
+  on public.incidents (source_alert_id);
+
+commit;
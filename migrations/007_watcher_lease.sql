@@ -0,0 +1,42 @@
+-- Leader lease for the resident watcher (scripts/watcher.py): only the holder escalates.
+create table if not exists public.watcher_leases (
+  name text primary key,
+  holder text not null,
+  expires_at timestamptz not null
+);
+
+alter table public.watcher_leases disable row level security;
+grant select, insert, update, delete on public.watcher_leases to anon, authenticated;
+
+-- Atomically take or renew the lease; true when p_holder owns it afterwards.
+create or replace function public.try_acquire_lease(p_name text, p_holder text, p_ttl_seconds integer)
+returns boolean
+language sql
+volatile
+as $$
+  with taken as (
+    insert into public.watcher_leases as l (name, holder, expires_at)
+    values (p_name, p_holder, now() + make_interval(secs => p_ttl_seconds))
+    on conflict (name) do update
+      set holder = excluded.holder, expires_at = excluded.expires_at
+      where l.holder = excluded.holder or l.expires_at < now()
+    returning 1
+  )
+  select exists (select 1 from taken);
+$$;
+
+create or replace function public.release_lease(p_name text, p_holder text)
+returns void
+language sql
+volatile
+as $$
+  delete from public.watcher_leases where name = p_name and holder = p_holder;
+$$;
+
+grant execute on function public.try_acquire_lease(text, text, integer) to anon, authenticated;
+grant execute on function public.release_lease(text, text) to anon, authenticated;
+
+-- Watermark scans of pending high alerts.
+create index if not exists idx_alerts_pending_high_created_at
+  on public.alerts(created_at)
+  where escalated = false and severity in ('high', 'critical');
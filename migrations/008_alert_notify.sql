@@ -0,0 +1,26 @@
+-- Push escalation: every new high/critical alert is announced on the
+-- opsboard_high_alerts channel; `scripts/watcher.py --listen` escalates it on receipt.
+create or replace function public.notify_high_alert()
+returns trigger
+language plpgsql
+as $$
+begin
+  perform pg_notify(
+    'opsboard_high_alerts',
+    json_build_object(
+      'id', new.id,
+      'title', new.title,
+      'severity', new.severity,
+      'created_at', new.created_at
+    )::text
+  );
+  return new;
+end;
+$$;
+
+drop trigger if exists trg_alerts_notify_high on public.alerts;
+create trigger trg_alerts_notify_high
+  after insert on public.alerts
+  for each row
+  when (new.severity in ('high', 'critical') and not new.escalated)
+  execute function public.notify_high_alert();
@@ -0,0 +1,6 @@
+-- Keyset pagination orders every listing by (created_at, id); these indexes let each page be
+-- served as a bounded index range scan instead of a sort over the whole table.
+create index if not exists idx_cards_created_at_id on public.cards(created_at, id);
+create index if not exists idx_alerts_created_at_id on public.alerts(created_at desc, id desc);
+create index if not exists idx_incidents_created_at_id on public.incidents(created_at desc, id desc);
+create index if not exists idx_audit_created_at_id on public.audit_events(created_at desc, id desc);
@@ -0,0 +1,75 @@
+-- Transactional DR restore (app/backup.py restore_backup):
+-- 1. restore_reset() empties the staging tables,
+-- 2. the app streams backup rows into restore_* in bounded chunks,
+-- 3. restore_commit() swaps staging into the live tables in one transaction, parents first.
+-- A failure anywhere before or inside restore_commit leaves the live tables untouched.
+-- The staging tables are shared: the app holds the 'dr-restore' lease (007) for the whole
+-- reset -> stage -> commit cycle, so two imports never interleave their staged rows.
+-- Staging tables copy column order and defaults but no constraints; keep them in sync when a
+-- live table gains a column (drop and re-run this file).
+create table if not exists public.restore_alerts (like public.alerts including defaults);
+create table if not exists public.restore_incidents (like public.incidents including defaults);
+create table if not exists public.restore_cards (like public.cards including defaults);
+create table if not exists public.restore_incident_notes (like public.incident_notes including defaults);
+create table if not exists public.restore_audit_events (like public.audit_events including defaults);
+
+alter table public.restore_alerts disable row level security;
+alter table public.restore_incidents disable row level security;
+alter table public.restore_cards disable row level security;
+alter table public.restore_incident_notes disable row level security;
+alter table public.restore_audit_events disable row level security;
+
+grant select, insert, delete on public.restore_alerts to anon, authenticated;
+grant select, insert, delete on public.restore_incidents to anon, authenticated;
+grant select, insert, delete on public.restore_cards to anon, authenticated;
+grant select, insert, delete on public.restore_incident_notes to anon, authenticated;
+grant select, insert, delete on public.restore_audit_events to anon, authenticated;
+
+create or replace function public.restore_reset()
+returns void
+language sql
+volatile
+as $$
+  truncate public.restore_alerts, public.restore_incidents, public.restore_cards,
+    public.restore_incident_notes, public.restore_audit_events;
+$$;
+
+create or replace function public.restore_commit()
+returns jsonb
+language plpgsql
+volatile
+as $$
+declare
+  restored jsonb;
+begin
+  -- Serialize concurrent restores; released at commit/rollback.
+  perform pg_advisory_xact_lock(hashtext('opsboard_restore'));
+
+  -- Children before parents.
+  delete from public.audit_events;
+  delete from public.incident_notes;
+  delete from public.cards;
+  delete from public.incidents;
+  delete from public.alerts;
+
+  -- Parents before children (alerts -> incidents -> cards/notes).
+  insert into public.alerts select * from public.restore_alerts;
+  insert into public.incidents select * from public.restore_incidents;
+  insert into public.cards select * from public.restore_cards;
+  insert into public.incident_notes select * from public.restore_incident_notes;
+  insert into public.audit_events select * from public.restore_audit_events;
+
+  restored := jsonb_build_object(
+    'alerts', (select count(*) from public.restore_alerts),
+    'incidents', (select count(*) from public.restore_incidents),
+    'cards', (select count(*) from public.restore_cards),
+    'incident_notes', (select count(*) from public.restore_incident_notes),
+    'audit_events', (select count(*) from public.restore_audit_events)
+  );
+  perform public.restore_reset();
+  return restored;
+end;
+$$;
+
+grant execute on function public.restore_reset() to anon, authenticated;
+grant execute on function public.restore_commit() to anon, authenticated;
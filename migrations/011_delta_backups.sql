@@ -0,0 +1,40 @@
+-- Delta backups (/dr/export?since=...) select rows by updated_at, so every update has to bump
+-- it, including ones made outside the app (backfill scripts, SQL console).
+create or replace function public.touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.updated_at := now();
+  return new;
+end;
+$$;
+
+drop trigger if exists cards_touch_updated_at on public.cards;
+create trigger cards_touch_updated_at before update on public.cards
+  for each row execute function public.touch_updated_at();
+drop trigger if exists alerts_touch_updated_at on public.alerts;
+create trigger alerts_touch_updated_at before update on public.alerts
+  for each row execute function public.touch_updated_at();
+drop trigger if exists incidents_touch_updated_at on public.incidents;
+create trigger incidents_touch_updated_at before update on public.incidents
+  for each row execute function public.touch_updated_at();
+drop trigger if exists incident_notes_touch_updated_at on public.incident_notes;
+create trigger incident_notes_touch_updated_at before update on public.incident_notes
+  for each row execute function public.touch_updated_at();
+
+-- Keyset walk of a delta: updated_at >= watermark ordered by (updated_at, id).
+-- audit_events is append-only and uses idx_audit_created_at_id from 009.
+create index if not exists idx_cards_updated_at_id on public.cards(updated_at, id);
+create index if not exists idx_alerts_updated_at_id on public.alerts(updated_at, id);
+create index if not exists idx_incidents_updated_at_id on public.incidents(updated_at, id);
+create index if not exists idx_incident_notes_updated_at_id on public.incident_notes(updated_at, id);
+
+-- Delta replay upserts over the staged base snapshot by id.
+alter table public.restore_alerts add primary key (id);
+alter table public.restore_incidents add primary key (id);
+alter table public.restore_cards add primary key (id);
+alter table public.restore_incident_notes add primary key (id);
+alter table public.restore_audit_events add primary key (id);
+grant update on public.restore_alerts, public.restore_incidents, public.restore_cards,
+  public.restore_incident_notes, public.restore_audit_events to anon, authenticated;
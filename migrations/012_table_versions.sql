@@ -0,0 +1,42 @@
+-- Change tokens for conditional GETs (ETag / If-None-Match on /board, /alerts, /incidents,
+-- /api/status). Every statement that writes a table bumps its version, including writes made
+-- outside the app (watcher process, backfill scripts, SQL console), so one indexed lookup
+-- tells whether a listing can have changed.
+create table if not exists public.table_versions (
+  table_name text primary key,
+  version bigint not null default 0
+);
+
+insert into public.table_versions (table_name)
+values ('cards'), ('alerts'), ('incidents'), ('audit_events'), ('incident_notes')
+on conflict (table_name) do nothing;
+
+create or replace function public.bump_table_version()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  update public.table_versions set version = version + 1 where table_name = tg_table_name;
+  return null;
+end;
+$$;
+
+drop trigger if exists cards_bump_version on public.cards;
+create trigger cards_bump_version after insert or update or delete or truncate on public.cards
+  for each statement execute function public.bump_table_version();
+drop trigger if exists alerts_bump_version on public.alerts;
+create trigger alerts_bump_version after insert or update or delete or truncate on public.alerts
+  for each statement execute function public.bump_table_version();
+drop trigger if exists incidents_bump_version on public.incidents;
+create trigger incidents_bump_version after insert or update or delete or truncate on public.incidents
+  for each statement execute function public.bump_table_version();
+drop trigger if exists audit_events_bump_version on public.audit_events;
+create trigger audit_events_bump_version after insert or update or delete or truncate on public.audit_events
+  for each statement execute function public.bump_table_version();
+drop trigger if exists incident_notes_bump_version on public.incident_notes;
+create trigger incident_notes_bump_version after insert or update or delete or truncate on public.incident_notes
+  for each statement execute function public.bump_table_version();
+
+grant select on public.table_versions to anon, authenticated;
@@ -0,0 +1,53 @@
+-- Bulk card operations (POST /api/cards/batch): creates, moves and deletes plus their audit
+-- events in one transaction. Rows for creates are built by the app (ids, timestamps), moves
+-- are [{"id", "column_name"}], deletes a list of ids. Ids that no longer exist are skipped
+-- and left out of the result; any other error rolls the whole batch back.
+create or replace function public.apply_card_batch(p_creates jsonb, p_moves jsonb, p_deletes jsonb)
+returns jsonb
+language plpgsql
+volatile
+as $$
+declare
+  created jsonb;
+  moved jsonb;
+  deleted jsonb;
+begin
+  with inserted as (
+    insert into public.cards (id, title, description, column_name, created_at, updated_at)
+    select r.id, r.title, r.description, r.column_name, r.created_at, r.updated_at
+    from jsonb_populate_recordset(null::public.cards, p_creates) as r
+    returning *
+  )
+  select coalesce(jsonb_agg(to_jsonb(inserted)), '[]'::jsonb) into created from inserted;
+
+  with updated as (
+    update public.cards as c
+    set column_name = m.column_name, updated_at = now()
+    from jsonb_to_recordset(p_moves) as m(id uuid, column_name text)
+    where c.id = m.id
+    returning c.*
+  )
+  select coalesce(jsonb_agg(to_jsonb(updated)), '[]'::jsonb) into moved from updated;
+
+  with removed as (
+    delete from public.cards as c
+    where c.id in (select value::uuid from jsonb_array_elements_text(p_deletes))
+    returning c.id
+  )
+  select coalesce(jsonb_agg(removed.id), '[]'::jsonb) into deleted from removed;
+
+  insert into public.audit_events (action, entity_type, entity_id, payload)
+  select 'card_created', 'card', c ->> 'id', jsonb_build_object('column_name', c ->> 'column_name')
+  from jsonb_array_elements(created) as c
+  union all
+  select 'card_moved', 'card', c ->> 'id', jsonb_build_object('to_column', c ->> 'column_name')
+  from jsonb_array_elements(moved) as c
+  union all
+  select 'card_deleted', 'card', d, '{}'::jsonb
+  from jsonb_array_elements_text(deleted) as d;
+
+  return jsonb_build_object('created', created, 'moved', moved, 'deleted', deleted);
+end;
+$$;
+
+grant execute on function public.apply_card_batch(jsonb, jsonb, jsonb) to anon, authenticated;
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import argparse
+import re
+from typing import Any
+
+from app.db import build_data_access
+
+INCIDENT_REF = re.compile(r"incident ([0-9a-fA-F-]{36})")
+
+
+def parse_incident_id(description: str | None) -> str | None:
+    match = INCIDENT_REF.search(description or "")
+    return match.group(1).lower() if match else None
+
+
+def backfill(batch_size: int = 500, dry_run: bool = False) -> int:
+    """Set cards.incident_id from the "... for incident <uuid>" description of agent cards."""
+    db = build_data_access()
+    linked = 0
+    last_id = ""
+    batch = 0
+    while True:
+        query = (
+            db.client.table("cards")
+            .select("id, description")
+            .is_("incident_id", "null")
+            .ilike("description", "%incident %")
+            .order("id")
+            .limit(batch_size)
+        )
+        if last_id:
+            query = query.gt("id", last_id)
+        cards: list[dict[str, Any]] = query.execute().data or []
+        if not cards:
+            return linked
+        last_id = cards[-1]["id"]
+        batch += 1
+
+        by_incident: dict[str, list[str]] = {}
+        for card in cards:
+            incident_id = parse_incident_id(card.get("description"))
+            if incident_id:
+                by_incident.setdefault(incident_id, []).append(card["id"])
+        if not by_incident:
+            continue
+        # Cards pointing at deleted incidents stay unlinked; the FK would reject them.
+        existing = (
+            db.client.table("incidents").select("id").in_("id", list(by_incident)).execute().data or []
+        )
+        for incident in existing:
+            card_ids = by_incident[incident["id"]]
+            if dry_run:
+                # What a real run would write, so the plan can be audited before applying it.
+                print(f"batch={batch} incident_id={incident['id']} card_ids={','.join(card_ids)}")
+            else:
+                (
+                    db.client.table("cards")
+                    .update({"incident_id": incident["id"]})
+                    .in_("id", card_ids)
+                    .execute()
+                )
+            linked += len(card_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    linked = backfill(batch_size=args.batch_size, dry_run=args.dry_run)
+    print(f"Backfill finished. cards_linked={linked} dry_run={args.dry_run}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+from app.multiproc_metrics import MultiProcessMetrics
+from app.obs import InMemoryMetrics
+
+ROUTES = ["/board", "/alerts", "/incidents", "/incidents/{incident_id}", "/api/cards", "/metrics"]
+
+
+def bench_observe(store, n: int) -> float:
+    """Microseconds per ``observe`` call, cycling through a realistic label set."""
+    started = time.perf_counter()
+    for i in range(n):
+        store.observe("GET", ROUTES[i % len(ROUTES)], 200, (i % 200) * 1.5)
+    return (time.perf_counter() - started) / n * 1_000_000
+
+
+def bench_scrape(store, n: int) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        store.render_prometheus()
+    return (time.perf_counter() - started) / n * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--scrapes", type=int, default=200)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        stores = {"in-memory": InMemoryMetrics(), "multiprocess": MultiProcessMetrics(directory)}
+        for name, store in stores.items():
+            store.observe("GET", "/warmup", 200, 1.0)
+            per_observe = bench_observe(store, args.requests)
+            per_scrape = bench_scrape(store, args.scrapes)
+            print(f"{name:>12}: observe {per_observe:.2f} us/request, scrape {per_scrape:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
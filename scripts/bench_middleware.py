@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.obs import InMemoryMetrics, RequestContextMiddleware, log_event, route_template
+
+
+class BaseHTTPRequestContextMiddleware(BaseHTTPMiddleware):
+    """The previous ``RequestContextMiddleware``, kept here as the baseline."""
+
+    def __init__(self, app, metrics: InMemoryMetrics):
+        super().__init__(app)
+        self.metrics = metrics
+
+    async def dispatch(self, request, call_next):
+        request_id = request.headers.get("x-request-id", str(uuid4()))
+        request.state.request_id = request_id
+        started = time.perf_counter()
+        response = await call_next(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.metrics.observe(request.method, route_template(request.scope), response.status_code, elapsed_ms)
+        response.headers["x-request-id"] = request_id
+        log_event("http_request", request_id=request_id, path=request.url.path, status_code=response.status_code)
+        return response
+
+
+async def plain(request):
+    return PlainTextResponse("ok")
+
+
+async def stream(request):
+    async def body():
+        for _ in range(16):
+            yield b"x" * 1024
+
+    return StreamingResponse(body(), media_type="text/plain")
+
+
+def build_app(middleware: list[Middleware]) -> Starlette:
+    return Starlette(routes=[Route("/plain", plain), Route("/stream", stream)], middleware=middleware)
+
+
+async def drive(app, path: str, n: int) -> float:
+    """Requests per second, calling the ASGI app directly (no sockets, no HTTP parsing)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+
+    async def send(message):
+        pass
+
+    async def request_once():
+        requested = False
+        disconnected = asyncio.Event()
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Like a live client: the disconnect only comes after the response was sent.
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        try:
+            await app(dict(scope), receive, send)
+        finally:
+            disconnected.set()
+
+    started = time.perf_counter()
+    for _ in range(n):
+        await request_once()
+    return n / (time.perf_counter() - started)
+
+
+async def main_async(n: int) -> None:
+    apps = {
+        "none": build_app([]),
+        "BaseHTTPMiddleware": build_app([Middleware(BaseHTTPRequestContextMiddleware, metrics=InMemoryMetrics())]),
+        "pure ASGI": build_app([Middleware(RequestContextMiddleware)]),
+    }
+    for path in ["/plain", "/stream"]:
+        for name, app in apps.items():
+            await drive(app, path, n // 10)  # warm-up
+            print(f"{path:>8} {name:>18}: {await drive(app, path, n):>9.0f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,264 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
+import signal
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import uuid4
 
+from app.config import get_settings
 from app.db import build_data_access
+from app.obs import configure_logging, log_event
+
+LEASE_NAME = "alert-watcher"
+NOTIFY_CHANNEL = "opsboard_high_alerts"
+# Alerts get created_at from the writer's clock, so rescan a little behind the watermark.
+WATERMARK_OVERLAP = timedelta(seconds=60)
 
 
 def run_once() -> int:
     db = build_data_access()
-    created = 0
-    for alert in db.list_unescalated_high_alerts():
-        db.create_incident_from_alert(alert)
-        created += 1
-    db.create_audit_event("watcher_run", "system", "watcher", {"created_incidents": created})
-    return created
+    return len(db.escalate_pending_alerts())
+
+
+class PgAlertListener:
+    """LISTENs for alerts announced by the migrations/008 trigger over a direct Postgres connection.
+
+    Needs the ``listen`` extra (psycopg). Reconnects lazily after a connection error; anything
+    announced while disconnected is picked up by the watcher's reconciliation sweep.
+    """
+
+    def __init__(self, dsn: str, channel: str = NOTIFY_CHANNEL, drain_timeout: float = 0.05, batch: int = 500):
+        try:
+            import psycopg
+        except ImportError as exc:  # pragma: no cover
+            raise RuntimeError("watcher --listen needs psycopg: pip install -e .[listen]") from exc
+        self._psycopg = psycopg
+        self.dsn = dsn
+        self.channel = channel
+        self.drain_timeout = drain_timeout
+        self.batch = batch
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None or self._conn.closed:
+            self._conn = self._psycopg.connect(self.dsn, autocommit=True)
+            self._conn.execute(f'LISTEN "{self.channel}"')
+        return self._conn
+
+    def wait(self, timeout: float) -> list[dict[str, Any]]:
+        """Block up to ``timeout`` for the first notification, then drain the rest of the burst."""
+        try:
+            conn = self._connect()
+            alerts = [json.loads(n.payload) for n in conn.notifies(timeout=timeout, stop_after=1)]
+            if alerts:
+                drained = conn.notifies(timeout=self.drain_timeout, stop_after=self.batch - 1)
+                alerts.extend(json.loads(n.payload) for n in drained)
+            return alerts
+        except self._psycopg.Error:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+@dataclass
+class TickResult:
+    leader: bool
+    alerts_scanned: int = 0
+    incidents_created: int = 0
+    tick_ms: float = 0.0
+
+
+@dataclass
+class Watcher:
+    """Resident escalation loop.
+
+    - Adaptive polling: back to ``min_interval`` as soon as alerts flow, doubling up to
+      ``max_interval`` while idle.
+    - Scans only alerts newer than a ``created_at`` high-water mark (minus an overlap), with a
+      full sweep every ``full_scan_every`` ticks to catch stragglers.
+    - Escalates only while holding the DB lease, so several replicas never double-escalate.
+    - With a ``listener`` (``--listen``) alerts are escalated as soon as they are announced and
+      the periodic tick becomes a reconciliation sweep for anything the push path missed.
+    - ``stop()`` (wired to SIGTERM/SIGINT) ends the loop after the current tick and releases the lease.
+    """
+
+    db: Any
+    min_interval: float = 1.0
+    max_interval: float = 30.0
+    lease_ttl: int = 60
+    heartbeat_seconds: float = 60.0
+    full_scan_every: int = 100
+    holder: str = field(default_factory=lambda: f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}")
+    watermark: datetime | None = None
+    interval: float = 0.0
+    ticks: int = 0
+    listener: PgAlertListener | None = None
+    _last_heartbeat: float = 0.0
+    _lease_valid_until: float = 0.0
+    _stop: threading.Event = field(default_factory=threading.Event)
+
+    def __post_init__(self) -> None:
+        self.interval = self.interval or self.min_interval
+
+    def _since(self) -> str | None:
+        if self.watermark is None or self.ticks % self.full_scan_every == 0:
+            return None
+        return (self.watermark - WATERMARK_OVERLAP).isoformat()
+
+    def _hold_lease(self) -> bool:
+        if time.monotonic() < self._lease_valid_until:
+            return True
+        if not self.db.acquire_lease(LEASE_NAME, self.holder, self.lease_ttl):
+            self._lease_valid_until = 0.0
+            return False
+        # Renew well before expiry so a push never runs on a lease another replica took over.
+        self._lease_valid_until = time.monotonic() + self.lease_ttl / 2
+        return True
+
+    def tick(self) -> TickResult:
+        started = time.perf_counter()
+        self.ticks += 1
+        self._lease_valid_until = 0.0
+        if not self._hold_lease():
+            self.interval = self.max_interval
+            return TickResult(leader=False, tick_ms=round((time.perf_counter() - started) * 1000, 2))
+
+        alerts = self.db.list_unescalated_high_alerts(since=self._since())
+        created = self.db.escalate_alerts(alerts) if alerts else []
+        if alerts:
+            newest = max(datetime.fromisoformat(alert["created_at"]) for alert in alerts)
+            self.watermark = max(self.watermark or newest, newest)
+        now = time.monotonic()
+        if created or now - self._last_heartbeat >= self.heartbeat_seconds:
+            self.db.create_audit_event(
+                "watcher_run", "system", "watcher", {"created_incidents": len(created), "mode": "daemon"}
+            )
+            self._last_heartbeat = now
+        self.interval = self.min_interval if alerts else min(self.interval * 2, self.max_interval)
+        return TickResult(
+            leader=True,
+            alerts_scanned=len(alerts),
+            incidents_created=len(created),
+            tick_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+
+    def escalate_pushed(self, alerts: list[dict[str, Any]]) -> TickResult:
+        started = time.perf_counter()
+        if not self._hold_lease():
+            return TickResult(leader=False, alerts_scanned=len(alerts))
+        created = self.db.escalate_alerts(alerts)
+        if created:
+            self.db.create_audit_event(
+                "watcher_run", "system", "watcher", {"created_incidents": len(created), "mode": "push"}
+            )
+        return TickResult(
+            leader=True,
+            alerts_scanned=len(alerts),
+            incidents_created=len(created),
+            tick_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+
+    def _wait(self) -> None:
+        if self.listener is None:
+            self._stop.wait(self.interval)
+            return
+        deadline = time.monotonic() + self.interval
+        while not self._stop.is_set() and (remaining := deadline - time.monotonic()) > 0:
+            try:
+                # Short slices keep SIGTERM responsive while blocked in LISTEN.
+                alerts = self.listener.wait(min(remaining, 1.0))
+                if alerts:
+                    result = self.escalate_pushed(alerts)
+                    log_event(
+                        "watcher_push",
+                        holder=self.holder,
+                        leader=result.leader,
+                        alerts_scanned=result.alerts_scanned,
+                        incidents_created=result.incidents_created,
+                        tick_ms=result.tick_ms,
+                    )
+            # Catch-all on purpose: a broken LISTEN connection or push escalation only degrades
+            # to polling; the next sweep covers whatever was missed.
+            except Exception as exc:  # noqa: BLE001
+                log_event("watcher_listen_failed", holder=self.holder, error=type(exc).__name__)
+                self._stop.wait(self.min_interval)
+                return
+
+    def run(self) -> None:
+        log_event("watcher_started", holder=self.holder, listening=self.listener is not None)
+        try:
+            while not self._stop.is_set():
+                try:
+                    result = self.tick()
+                # Catch-all on purpose: the resident daemon backs off and retries rather than exit.
+                except Exception as exc:  # noqa: BLE001
+                    self.interval = min(max(self.interval, self.min_interval) * 2, self.max_interval)
+                    log_event("watcher_tick_failed", holder=self.holder, error=type(exc).__name__)
+                else:
+                    log_event(
+                        "watcher_tick",
+                        holder=self.holder,
+                        leader=result.leader,
+                        alerts_scanned=result.alerts_scanned,
+                        incidents_created=result.incidents_created,
+                        tick_ms=result.tick_ms,
+                        next_interval_s=self.interval,
+                    )
+                self._wait()
+        finally:
+            try:
+                self.db.release_lease(LEASE_NAME, self.holder)
+                if self.listener is not None:
+                    self.listener.close()
+            finally:
+                log_event("watcher_stopped", holder=self.holder, ticks=self.ticks)
+
+    def stop(self, *_: Any) -> None:
+        self._stop.set()
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--once", action="store_true")
+    parser.add_argument("--min-interval", type=float, default=1.0)
+    parser.add_argument("--max-interval", type=float, default=30.0)
+    parser.add_argument("--lease-ttl", type=int, default=60)
+    parser.add_argument("--listen", action="store_true", help="escalate on pg_notify, poll only to reconcile")
+    parser.add_argument("--reconcile-interval", type=float, default=60.0)
     args = parser.parse_args()
     if args.once:
         created = run_once()
         print(f"Watcher finished. incidents_created={created}")
         return
-    print("Only --once mode is implemented for MVP.")
+    configure_logging()
+    listener = None
+    if args.listen:
+        dsn = get_settings().database_url
+        if not dsn:
+            raise SystemExit("--listen needs DATABASE_URL (direct or session-pooler connection).")
+        listener = PgAlertListener(dsn)
+        args.min_interval = args.max_interval = args.reconcile_interval
+    watcher = Watcher(
+        build_data_access(),
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        lease_ttl=max(args.lease_ttl, int(args.max_interval * 2)),
+        listener=listener,
+    )
+    signal.signal(signal.SIGTERM, watcher.stop)
+    signal.signal(signal.SIGINT, watcher.stop)
+    watcher.run()
 
 
 if __name__ == "__main__":
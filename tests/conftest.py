@@ -1,11 +1,31 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from fastapi.testclient import TestClient
+import time
 import uuid
+from datetime import UTC, datetime
+
 import pytest
+from fastapi.testclient import TestClient
+
+from app.db import CHANGE_COLUMNS
+from app.main import app, get_blocking_data_access, get_data_access
+from app.obs import readiness
+from app.pagination import clamp_page_size, decode_cursor, page_from_rows
+
+
+def _keyset_page(rows, limit, cursor, desc, clamp=True, column="created_at"):
+    """In-memory stand-in for DataAccess._keyset_page_query + page_from_rows."""
+    limit = clamp_page_size(limit) if clamp else limit
 
-from app.main import app, get_data_access
+    def position(row):
+        return datetime.fromisoformat(row[column]), row["id"]
+
+    rows = sorted(rows, key=position, reverse=desc)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        after = position({column: created_at, "id": row_id})
+        rows = [r for r in rows if (position(r) < after if desc else position(r) > after)]
+    return page_from_rows(rows[: limit + 1], limit, column)
 
 
 class FakeDataAccess:
@@ -15,15 +35,29 @@ class FakeDataAccess:
         self.incidents = []
         self.audit_events = []
         self.incident_notes = []
+        self.cards_by_incident = {}
+        self.leases = {}
+        self.staging = {}
+        self.pings = 0
 
     def _now(self):
-        return datetime.now(timezone.utc).isoformat()
+        return datetime.now(UTC).isoformat()
 
-    def list_cards(self):
-        return self.cards
+    def list_cards(self, limit=None, cursor=None, version=None):
+        return _keyset_page(self.cards, limit, cursor, desc=False)
 
-    def create_card(self, title, description, column_name="Todo"):
-        row = {"id": str(uuid.uuid4()), "title": title, "description": description, "column_name": column_name}
+    def create_card(self, title, description, column_name="Todo", incident_id=None):
+        row = {
+            "id": str(uuid.uuid4()),
+            "title": title,
+            "description": description,
+            "column_name": column_name,
+            "created_at": self._now(),
+            "updated_at": self._now(),
+        }
+        if incident_id:
+            row["incident_id"] = incident_id
+            self.cards_by_incident.setdefault(incident_id, []).append(row)
         self.cards.append(row)
         self.create_audit_event("card_created", "card", row["id"], {"column_name": column_name})
         return row
@@ -32,16 +66,28 @@ class FakeDataAccess:
         for card in self.cards:
             if card["id"] == card_id:
                 card["column_name"] = column_name
+                card["updated_at"] = self._now()
                 self.create_audit_event("card_moved", "card", card_id, {"to_column": column_name})
                 return card
-        raise KeyError(card_id)
+        return None
 
     def delete_card(self, card_id):
+        if not any(c["id"] == card_id for c in self.cards):
+            return False
         self.cards = [c for c in self.cards if c["id"] != card_id]
+        for linked in self.cards_by_incident.values():
+            linked[:] = [c for c in linked if c["id"] != card_id]
         self.create_audit_event("card_deleted", "card", card_id, {})
+        return True
 
-    def list_alerts(self):
-        return list(reversed(self.alerts))
+    def apply_card_batch(self, creates, moves, deletes):
+        created = [self.create_card(**card) for card in creates]
+        moved = [card for card in (self.move_card(card_id, column) for card_id, column in moves.items()) if card]
+        deleted = [card_id for card_id in deletes if self.delete_card(card_id)]
+        return {"created": created, "moved": moved, "deleted": deleted, "atomic": True}
+
+    def list_alerts(self, limit=None, cursor=None, version=None):
+        return _keyset_page(self.alerts, limit, cursor, desc=True)
 
     def create_alert(self, title, severity, source):
         row = {
@@ -51,21 +97,28 @@ class FakeDataAccess:
             "source": source,
             "status": "open",
             "escalated": False,
+            "created_at": self._now(),
+            "updated_at": self._now(),
         }
         self.alerts.append(row)
         self.create_audit_event("alert_created", "alert", row["id"], {"severity": severity})
         return row
 
-    def list_unescalated_high_alerts(self):
-        return [a for a in self.alerts if (a["severity"] in ["high", "critical"] and not a["escalated"])]
+    def list_unescalated_high_alerts(self, since=None):
+        return [
+            a
+            for a in self.alerts
+            if a["severity"] in ["high", "critical"] and not a["escalated"] and (not since or a["created_at"] >= since)
+        ]
 
     def mark_alert_escalated(self, alert_id):
         for a in self.alerts:
             if a["id"] == alert_id:
                 a["escalated"] = True
+                a["updated_at"] = self._now()
 
-    def list_incidents(self):
-        return list(reversed(self.incidents))
+    def list_incidents(self, limit=None, cursor=None, version=None):
+        return _keyset_page(self.incidents, limit, cursor, desc=True)
 
     def get_incident(self, incident_id):
         for i in self.incidents:
@@ -82,12 +135,42 @@ class FakeDataAccess:
             "source_alert_id": alert["id"],
             "summary": "Auto escalated",
             "created_at": self._now(),
+            "updated_at": self._now(),
         }
         self.incidents.append(row)
         self.create_audit_event("incident_created", "incident", row["id"], {"source_alert_id": alert["id"]})
         self.mark_alert_escalated(alert["id"])
         return row
 
+    def escalate_alerts(self, alerts):
+        escalated = {i["source_alert_id"] for i in self.incidents}
+        created = []
+        for alert in alerts:
+            if alert["id"] not in escalated:
+                row = {
+                    "id": str(uuid.uuid4()),
+                    "title": f"Incident from alert: {alert['title']}",
+                    "status": "investigating",
+                    "severity": alert["severity"],
+                    "source_alert_id": alert["id"],
+                    "summary": "Auto escalated",
+                    "created_at": self._now(),
+                    "updated_at": self._now(),
+                }
+                self.incidents.append(row)
+                escalated.add(alert["id"])
+                created.append(row)
+        for row in created:
+            self.create_audit_event("incident_created", "incident", row["id"], {"source_alert_id": row["source_alert_id"]})
+        for alert in alerts:
+            self.mark_alert_escalated(alert["id"])
+        return created
+
+    def escalate_pending_alerts(self):
+        created = self.escalate_alerts(self.list_unescalated_high_alerts())
+        self.create_audit_event("watcher_run", "system", "watcher", {"created_incidents": len(created)})
+        return created
+
     def upsert_incident_note(self, incident_id, note_type, content):
         for note in self.incident_notes:
             if note["incident_id"] == incident_id and note["note_type"] == note_type:
@@ -110,13 +193,13 @@ class FakeDataAccess:
         return sorted(notes, key=lambda x: x["updated_at"], reverse=True)
 
     def list_agent_cards_for_incident(self, incident_id):
-        needle = f"incident {incident_id}"
-        return [c for c in self.cards if needle in (c.get("description") or "")]
+        return list(self.cards_by_incident.get(incident_id, []))
 
     def update_incident_status(self, incident_id, status):
         for i in self.incidents:
             if i["id"] == incident_id:
                 i["status"] = status
+                i["updated_at"] = self._now()
         self.create_audit_event("incident_status_changed", "incident", incident_id, {"status": status})
 
     def create_audit_event(self, action, entity_type, entity_id, payload):
@@ -131,13 +214,43 @@ class FakeDataAccess:
             }
         )
 
-    def list_audit_events(self, limit=100):
-        return list(reversed(self.audit_events))[:limit]
+    def insert_audit_events(self, rows):
+        self.audit_events.extend(rows)
+
+    def list_audit_events(self, limit=None, cursor=None, filters=None):
+        events = self.audit_events
+        if filters is not None:
+            events = [
+                e
+                for e in events
+                if all(not getattr(filters, k) or e[k] == getattr(filters, k) for k in ("action", "entity_type", "entity_id"))
+                and (not filters.since or datetime.fromisoformat(e["created_at"]) >= filters.since)
+                and (not filters.until or datetime.fromisoformat(e["created_at"]) < filters.until)
+            ]
+        return _keyset_page(events, limit, cursor, desc=True)
+
+    def latest_event_by_action(self, action):
+        events = [e for e in self.audit_events if e["action"] == action]
+        return events[-1] if events else None
 
     def list_audit_for_entity(self, entity_id):
         return [e for e in self.audit_events if e["entity_id"] == entity_id]
 
-    def counts(self):
+    def acquire_lease(self, name, holder, ttl_seconds):
+        current = self.leases.get(name)
+        if current and current["holder"] != holder and current["expires_at"] > time.monotonic():
+            return False
+        self.leases[name] = {"holder": holder, "expires_at": time.monotonic() + ttl_seconds}
+        return True
+
+    def release_lease(self, name, holder):
+        if self.leases.get(name, {}).get("holder") == holder:
+            del self.leases[name]
+
+    def ping(self):
+        self.pings += 1
+
+    def counts(self, estimated=False):
         return {
             "cards": len(self.cards),
             "alerts": len(self.alerts),
@@ -146,21 +259,59 @@ class FakeDataAccess:
             "incident_notes": len(self.incident_notes),
         }
 
-    def export_all(self):
-        return {
-            "cards": self.cards,
-            "alerts": self.alerts,
-            "incidents": self.incidents,
-            "audit_events": self.audit_events,
-            "incident_notes": self.incident_notes,
-        }
+    def change_versions(self, *tables):
+        # Stand-in for the write counters of migration 012: any change to a table's rows moves it.
+        return {table: hash(repr(getattr(self, table))) for table in tables}
+
+    def export_page(self, table, cursor=None, limit=1000, since=None):
+        rows, column = getattr(self, table), "created_at"
+        if since:
+            column = CHANGE_COLUMNS[table]
+            rows = [r for r in rows if datetime.fromisoformat(r[column]) >= datetime.fromisoformat(since)]
+        return _keyset_page(rows, limit, cursor, desc=False, clamp=False, column=column)
+
+    def restore_reset(self):
+        self.staging = {}
+
+    def restore_stage(self, table, rows, upsert=False):
+        staged = self.staging.setdefault(table, [])
+        if upsert:
+            ids = {row["id"] for row in rows}
+            staged[:] = [row for row in staged if row["id"] not in ids]
+        staged.extend(rows)
+
+    def restore_discard(self, table, ids):
+        self.staging[table] = [row for row in self.staging.get(table, []) if row["id"] not in set(ids)]
 
-    def import_all(self, payload):
-        self.cards = payload.get("cards", [])
-        self.alerts = payload.get("alerts", [])
-        self.incidents = payload.get("incidents", [])
-        self.audit_events = payload.get("audit_events", [])
-        self.incident_notes = payload.get("incident_notes", [])
+    def restore_commit(self):
+        staged, self.staging = self.staging, {}
+        self.cards = staged.get("cards", [])
+        self.alerts = staged.get("alerts", [])
+        self.incidents = staged.get("incidents", [])
+        self.audit_events = staged.get("audit_events", [])
+        self.incident_notes = staged.get("incident_notes", [])
+        self.cards_by_incident = {}
+        for card in self.cards:
+            if card.get("incident_id"):
+                self.cards_by_incident.setdefault(card["incident_id"], []).append(card)
+        return {table: len(rows) for table, rows in staged.items()}
+
+
+class AsyncFakeDataAccess:
+    """Awaitable view over FakeDataAccess, standing in for AsyncDataAccess."""
+
+    def __init__(self, fake):
+        self._fake = fake
+
+    def __getattr__(self, name):
+        attr = getattr(self._fake, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            return attr(*args, **kwargs)
+
+        return call
 
 
 @pytest.fixture()
@@ -168,9 +319,16 @@ def fake_db():
     return FakeDataAccess()
 
 
+@pytest.fixture()
+def async_db(fake_db):
+    return AsyncFakeDataAccess(fake_db)
+
+
 @pytest.fixture()
 def client(fake_db):
-    app.dependency_overrides[get_data_access] = lambda: fake_db
+    app.dependency_overrides[get_data_access] = lambda: AsyncFakeDataAccess(fake_db)
+    app.dependency_overrides[get_blocking_data_access] = lambda: fake_db
+    readiness.reset()
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
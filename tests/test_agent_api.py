@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+from types import SimpleNamespace
+
+from app.db import DataAccess
 from app.services.llm_gemini import LLMUnavailable
+from scripts import backfill_card_incidents
+from scripts.backfill_card_incidents import parse_incident_id
+from tests.test_db import StubClient
 
 
 def _create_incident(fake_db):
@@ -29,6 +35,11 @@ def test_agent_run_uses_llm(monkeypatch, client, fake_db):
     assert agent_events[0]["payload"]["llm_used"] is True
     assert agent_events[0]["payload"]["llm_model"] == "gemini-3-flash-preview"
 
+    linked = fake_db.list_agent_cards_for_incident(incident["id"])
+    assert [card["id"] for card in linked] == body["task_ids"]
+    page = client.get(f"/incidents/{incident['id']}")
+    assert all(card_id in page.text for card_id in body["task_ids"])
+
 
 def test_agent_run_fallback_when_llm_unavailable(monkeypatch, client, fake_db):
     incident = _create_incident(fake_db)
@@ -46,3 +57,31 @@ def test_agent_run_fallback_when_llm_unavailable(monkeypatch, client, fake_db):
     agent_events = [e for e in fake_db.audit_events if e["action"] == "agent_ran"]
     assert len(agent_events) == 1
     assert agent_events[0]["payload"]["llm_used"] is False
+
+
+def test_backfill_parses_incident_id_from_description():
+    incident_id = "0f8fad5b-d9cb-469f-a165-70867728950e"
+    assert parse_incident_id(f"Auto-generated remediation for incident {incident_id.upper()}") == incident_id
+    assert parse_incident_id("Manual card") is None
+    assert parse_incident_id(None) is None
+
+
+def test_backfill_dry_run_reports_planned_links_without_writing(monkeypatch, capsys):
+    incident_id = "0f8fad5b-d9cb-469f-a165-70867728950e"
+    cards = [
+        {"id": "c1", "description": f"Remediation for incident {incident_id}"},
+        {"id": "c2", "description": f"Follow-up for incident {incident_id}"},
+    ]
+
+    def handler(query):
+        if query.target == "incidents":
+            return SimpleNamespace(data=[{"id": incident_id}])
+        first_page = not any(name == "gt" for name, _, _ in query.calls)
+        return SimpleNamespace(data=cards if first_page else [])
+
+    client = StubClient(handler)
+    monkeypatch.setattr(backfill_card_incidents, "build_data_access", lambda: DataAccess(client))
+
+    assert backfill_card_incidents.backfill(dry_run=True) == 2
+    assert capsys.readouterr().out == f"batch=1 incident_id={incident_id} card_ids=c1,c2\n"
+    assert not any(name == "update" for query in client.executed for name, _, _ in query.calls)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.audit import AuditSink
+from app.db import DataAccess
+
+
+class RecordingWriter:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, rows):
+        self.gate.wait()
+        if self.fail:
+            raise ConnectionError("db down")
+        self.batches.append(list(rows))
+
+
+def _row(i):
+    return {"id": str(i), "action": "card_moved"}
+
+
+def test_rows_are_written_in_multi_row_batches():
+    writer = RecordingWriter()
+    sink = AuditSink(writer, batch_size=10, flush_interval_ms=50)
+    sink.start()
+    for i in range(25):
+        sink.submit(_row(i))
+    sink.flush()
+    sink.close()
+    assert [len(batch) for batch in writer.batches] == [10, 10, 5]
+    assert sink.stats.written == 25
+
+
+def test_close_drains_queue():
+    writer = RecordingWriter()
+    writer.gate.clear()
+    sink = AuditSink(writer, batch_size=3, flush_interval_ms=10_000)
+    sink.start()
+    for i in range(7):
+        sink.submit(_row(i))
+    writer.gate.set()
+    sink.close()
+    assert sum(len(batch) for batch in writer.batches) == 7
+
+
+def test_drop_policy_discards_when_full():
+    writer = RecordingWriter()
+    sink = AuditSink(writer, max_queue=2, overflow="drop")
+    assert sink.submit(_row(1)) and sink.submit(_row(2))
+    assert sink.submit(_row(3)) is False
+    assert sink.stats.dropped == 1
+
+
+def test_spill_policy_and_replay_on_start(tmp_path):
+    spill = tmp_path / "audit.ndjson"
+    writer = RecordingWriter()
+    sink = AuditSink(writer, max_queue=1, overflow="spill", spill_path=str(spill))
+    sink.submit(_row(1))
+    sink.submit(_row(2))
+    assert [json.loads(line)["id"] for line in spill.read_text().splitlines()] == ["2"]
+
+    sink.start()
+    sink.flush()
+    sink.close()
+    assert not spill.exists()
+    assert sorted(row["id"] for batch in writer.batches for row in batch) == ["1", "2"]
+
+
+def test_failed_batch_is_spilled(tmp_path):
+    spill = tmp_path / "audit.ndjson"
+    sink = AuditSink(RecordingWriter(fail=True), spill_path=str(spill), flush_interval_ms=10)
+    sink.start()
+    sink.submit(_row(1))
+    sink.flush()
+    sink.close()
+    assert sink.stats.failed_batches == 1
+    assert json.loads(spill.read_text())["id"] == "1"
+
+
+def test_block_policy_waits_off_the_event_loop():
+    writer = RecordingWriter()
+    sink = AuditSink(writer, max_queue=1, batch_size=1, flush_interval_ms=1)
+
+    async def produce():
+        await sink.asubmit(_row(1))
+        sink.start()
+        await sink.asubmit(_row(2))
+
+    asyncio.run(produce())
+    sink.close()
+    assert sum(len(batch) for batch in writer.batches) == 2
+
+
+def test_data_access_routes_audit_rows_through_sink():
+    class NoClient:
+        def table(self, name):
+            raise AssertionError("audit row must not be inserted inline")
+
+    writer = RecordingWriter()
+    sink = AuditSink(writer, flush_interval_ms=10)
+    sink.start()
+    DataAccess(NoClient(), audit_sink=sink).create_audit_event("card_deleted", "card", "c1", {})
+    sink.close()
+    assert writer.batches[0][0]["action"] == "card_deleted"
+
+
+def test_spill_requires_path():
+    with pytest.raises(ValueError):
+        AuditSink(RecordingWriter(), overflow="spill")
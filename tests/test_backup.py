@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.backup import (
+    RESTORE_LEASE,
+    BackupParser,
+    load_backup,
+    order_delta_chain,
+    restore_backup,
+    stream_backup,
+)
+from app.db import TABLES
+
+
+def _seed(fake_db):
+    for i in range(5):
+        fake_db.create_card(f"Card {i}", "desc", "Todo")
+    alert = fake_db.create_alert("Disk full", "critical", "test")
+    incident = fake_db.create_incident_from_alert(alert)
+    fake_db.upsert_incident_note(incident["id"], "triage", "note")
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+def test_stream_backup_pages_through_each_table(fake_db, async_db, fmt):
+    _seed(fake_db)
+    calls = []
+    export_page = fake_db.export_page
+
+    def spy(table, cursor=None, limit=1000, since=None):
+        calls.append((table, limit))
+        return export_page(table, cursor=cursor, limit=limit, since=since)
+
+    fake_db.export_page = spy
+    chunks = asyncio.run(_collect(stream_backup(async_db, fmt, page_size=2)))
+
+    assert {limit for _, limit in calls} == {2}
+    assert calls.count(("cards", 2)) == 3
+    restored = load_backup(b"".join(chunks))
+    assert sorted(c["id"] for c in restored["cards"]) == sorted(c["id"] for c in fake_db.cards)
+    assert len(restored["audit_events"]) == len(fake_db.audit_events)
+
+
+def test_json_export_keeps_table_keys_when_empty(client):
+    response = client.get("/dr/export")
+    payload = response.json()
+    meta = payload.pop("meta")
+    assert payload == {table: [] for table in TABLES}
+    assert meta["since"] is None
+    assert datetime.fromisoformat(meta["exported_at"]) == datetime.fromisoformat(
+        response.headers["x-backup-watermark"]
+    )
+
+
+def test_gzip_export_round_trips_through_import(client, fake_db):
+    _seed(fake_db)
+    cards = [dict(card) for card in fake_db.cards]
+    response = client.get("/dr/export", params={"format": "ndjson", "gzip": "true"})
+    assert response.headers["content-type"] == "application/gzip"
+    assert "opsboard-backup.ndjson.gz" in response.headers["content-disposition"]
+    head = gzip.decompress(response.content).splitlines()
+    assert set(json.loads(head[0])) == {"meta"}
+    assert json.loads(head[1])["table"] == "cards"
+
+    fake_db.cards = []
+    upload = {"file": ("backup.ndjson.gz", response.content, "application/gzip")}
+    assert client.post("/dr/import", files=upload, follow_redirects=False).status_code == 303
+    assert fake_db.cards == cards
+
+
+def test_unknown_export_format_is_rejected(client):
+    assert client.get("/dr/export", params={"format": "xml"}).status_code == 422
+
+
+def _feed_bytewise(raw):
+    parser = BackupParser()
+    rows = []
+    for i in range(len(raw)):
+        rows.extend(parser.feed(raw[i : i + 1]))
+    return rows + parser.close()
+
+
+LEGACY = {
+    "cards": [{"id": "c1", "title": "Card"}],
+    "alerts": [{"id": "a1", "title": "Alert [x], {y}"}],
+    "incidents": [],
+    "audit_events": [{"id": "e1", "payload": {"nested": [1, 2]}}],
+    "incident_notes": [],
+}
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        json.dumps(LEGACY, indent=2).encode(),
+        json.dumps(LEGACY).encode(),
+        "".join(json.dumps({"table": t, "row": r}) + "\n" for t, rows in LEGACY.items() for r in rows).encode(),
+        gzip.compress(json.dumps(LEGACY, indent=2).encode()),
+    ],
+    ids=["json-indented", "json-compact", "ndjson", "gzip"],
+)
+def test_parser_handles_arbitrary_chunk_boundaries(raw):
+    rows = _feed_bytewise(raw)
+    assert rows == [(t, r) for t, table_rows in LEGACY.items() for r in table_rows]
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [b"", b'{"cards": [{"id": "c1"}', b'{"users": [{"id": 1}]}', b'{"table": "cards", "row": 5}\n', b"\x1f\x8bnot gzip"],
+)
+def test_parser_rejects_bad_backups(raw):
+    with pytest.raises(ValueError):
+        _feed_bytewise(raw)
+
+
+async def _chunks(raw, size):
+    for i in range(0, len(raw), size):
+        yield raw[i : i + size]
+
+
+def test_restore_stages_in_bounded_chunks_then_commits(fake_db, async_db):
+    raw = "".join(json.dumps({"table": "cards", "row": {"id": str(i)}}) + "\n" for i in range(7)).encode()
+    staged = []
+    stage = fake_db.restore_stage
+    fake_db.restore_stage = lambda table, rows, upsert=False: (staged.append(len(rows)), stage(table, rows, upsert))
+
+    restored = asyncio.run(restore_backup(async_db, [_chunks(raw, 10)], chunk_rows=3))
+
+    assert staged == [3, 3, 1]
+    assert restored == {"cards": 7}
+    assert len(fake_db.cards) == 7
+
+
+def test_failed_restore_leaves_live_tables_untouched(fake_db, async_db):
+    _seed(fake_db)
+    cards = list(fake_db.cards)
+    truncated = json.dumps({"cards": [{"id": "x"}] * 5})[:-10].encode()
+
+    with pytest.raises(ValueError):
+        asyncio.run(restore_backup(async_db, [_chunks(truncated, 7)], chunk_rows=2))
+
+    assert fake_db.cards == cards
+    assert fake_db.staging == {}
+
+
+def test_import_route_reports_rows_and_rejects_garbage(client, fake_db):
+    _seed(fake_db)
+    backup = client.get("/dr/export").content
+    response = client.post("/dr/import", files={"file": ("b.json", backup)}, follow_redirects=False)
+    assert response.headers["location"] == f"/dr?restored=1&rows={len(json.loads(backup)['audit_events']) + 8}"
+    event = fake_db.latest_event_by_action("restore_applied")
+    assert event["payload"]["rows"]["cards"] == 5
+
+    assert client.post("/dr/import", files={"file": ("b.json", b"not a backup")}).status_code == 400
+
+
+def _age(fake_db, hours=1):
+    for table in TABLES:
+        for row in getattr(fake_db, table):
+            for column in ("created_at", "updated_at"):
+                if column in row:
+                    row[column] = (datetime.fromisoformat(row[column]) - timedelta(hours=hours)).isoformat()
+
+
+def test_delta_chain_restores_changes_and_deletes(client, fake_db):
+    _seed(fake_db)
+    _age(fake_db)
+    base = client.get("/dr/export", params={"format": "ndjson"})
+    watermark = base.headers["x-backup-watermark"]
+
+    moved, deleted = fake_db.cards[0], fake_db.cards[1]
+    client.post(f"/cards/{moved['id']}/move", data={"column_name": "Done"})
+    client.post(f"/cards/{deleted['id']}/delete")
+    client.post("/cards", data={"title": "Added later", "description": "", "column_name": "Todo"})
+    expected = {card["id"]: card["column_name"] for card in fake_db.cards}
+
+    delta = client.get("/dr/export", params={"format": "ndjson", "since": watermark, "gzip": "true"})
+    assert "opsboard-delta-" in delta.headers["content-disposition"]
+    delta_rows = load_backup(delta.content)
+    assert {card["id"] for card in delta_rows["cards"]} == {moved["id"], fake_db.cards[-1]["id"]}
+    assert "alerts" not in delta_rows
+
+    fake_db.cards = []
+    response = client.post(
+        "/dr/import",
+        files=[("file", ("base.ndjson", base.content)), ("deltas", ("d1.ndjson.gz", delta.content))],
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+    assert {card["id"]: card["column_name"] for card in fake_db.cards} == expected
+    assert fake_db.latest_event_by_action("restore_applied")["payload"]["deltas"] == 1
+
+
+def test_concurrent_import_is_refused_without_touching_staging(client, fake_db):
+    _seed(fake_db)
+    backup = client.get("/dr/export").content
+    fake_db.acquire_lease(RESTORE_LEASE, "other-import", 60)
+    fake_db.staging = {"cards": [{"id": "theirs"}]}
+
+    response = client.post("/dr/import", files={"file": ("b.json", backup)}, follow_redirects=False)
+    assert response.status_code == 409
+    assert fake_db.staging == {"cards": [{"id": "theirs"}]}
+
+    fake_db.release_lease(RESTORE_LEASE, "other-import")
+    assert client.post("/dr/import", files={"file": ("b.json", backup)}, follow_redirects=False).status_code == 303
+    assert fake_db.leases == {}
+
+
+def test_failed_restore_releases_the_lease(fake_db, async_db):
+    with pytest.raises(ValueError):
+        asyncio.run(restore_backup(async_db, [_chunks(b"not a backup", 4)]))
+    assert fake_db.leases == {}
+
+
+def test_meta_entry_is_read_from_both_formats():
+    meta = {"since": "2026-10-18T10:00:00+00:00", "exported_at": "2026-10-18T11:00:00+00:00"}
+    compact = json.dumps({"meta": meta, **LEGACY}).encode()
+    lines = (json.dumps({"meta": meta}) + "\n" + json.dumps({"table": "cards", "row": {"id": "c1"}}) + "\n").encode()
+    for raw in (compact, lines, gzip.compress(compact)):
+        parser = BackupParser()
+        rows = []
+        for i in range(len(raw)):
+            rows.extend(parser.feed(raw[i : i + 1]))
+        rows += parser.close()
+        assert parser.meta == meta
+        assert ("cards", {"id": "c1", "title": "Card"} if raw is not lines else {"id": "c1"}) in rows
+
+
+def _meta(since, exported_at):
+    return {"since": since, "exported_at": exported_at}
+
+
+def test_delta_chain_is_ordered_by_watermark_and_must_be_contiguous():
+    base = _meta(None, "2026-10-01T00:00:00+00:00")
+    d9 = _meta("2026-10-01T00:00:00+00:00", "2026-10-09T00:00:00+00:00")
+    d10 = _meta("2026-10-09T00:00:00+00:00", "2026-10-10T00:00:00+00:00")
+    # Uploaded as d10, d9: replay still starts with the older one.
+    assert order_delta_chain(base, [d10, d9]) == [1, 0]
+
+    with pytest.raises(ValueError, match="gap"):
+        order_delta_chain(base, [d10])
+    with pytest.raises(ValueError, match="overlap"):
+        order_delta_chain(base, [d9, _meta("2026-10-05T00:00:00+00:00", "2026-10-11T00:00:00+00:00")])
+    with pytest.raises(ValueError, match="no since"):
+        order_delta_chain(base, [None])
+    # A base exported before meta existed: only the deltas are checked against each other.
+    assert order_delta_chain(None, [d10, d9]) == [1, 0]
+
+
+def test_import_replays_deltas_in_watermark_order_whatever_their_names(client, fake_db):
+    _seed(fake_db)
+    _age(fake_db, hours=2)
+    base = client.get("/dr/export", params={"format": "ndjson"})
+    card = fake_db.cards[0]
+    client.post(f"/cards/{card['id']}/move", data={"column_name": "In Progress"})
+    first = client.get("/dr/export", params={"format": "ndjson", "since": base.headers["x-backup-watermark"]})
+    client.post(f"/cards/{card['id']}/move", data={"column_name": "Done"})
+    second = client.get("/dr/export", params={"format": "ndjson", "since": first.headers["x-backup-watermark"]})
+
+    files = [
+        ("file", ("base.ndjson", base.content)),
+        ("deltas", ("d10.ndjson", second.content)),
+        ("deltas", ("d9.ndjson", first.content)),
+    ]
+    assert client.post("/dr/import", files=files, follow_redirects=False).status_code == 303
+    assert next(c for c in fake_db.cards if c["id"] == card["id"])["column_name"] == "Done"
+
+    gap = [("file", ("base.ndjson", base.content)), ("deltas", ("d10.ndjson", second.content))]
+    response = client.post("/dr/import", files=gap, follow_redirects=False)
+    assert response.status_code == 400
+    assert "gap" in response.json()["detail"]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.cache import InMemoryCacheBackend, ListingCache, RedisCacheBackend
+from app.obs import InMemoryMetrics
+from app.pagination import Page
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = InMemoryCacheBackend(max_entries=2)
+    backend.set("cards", "a", {"v": 1}, ttl=60)
+    backend.set("cards", "b", {"v": 2}, ttl=60)
+    assert backend.get("cards", "a") == {"v": 1}
+    backend.set("cards", "c", {"v": 3}, ttl=60)
+    assert backend.get("cards", "b") is None
+    assert backend.get("cards", "a") == {"v": 1}
+
+
+def test_memory_backend_expires_and_invalidates_per_namespace():
+    backend = InMemoryCacheBackend()
+    backend.set("cards", "k", {"v": 1}, ttl=0)
+    assert backend.get("cards", "k") is None
+
+    backend.set("cards", "k", {"v": 1}, ttl=60)
+    backend.set("alerts", "k", {"v": 2}, ttl=60)
+    backend.invalidate(("cards",))
+    assert backend.get("cards", "k") is None
+    assert backend.get("alerts", "k") == {"v": 2}
+
+
+def test_hits_and_misses_are_counted(monkeypatch):
+    counters = InMemoryMetrics()
+    monkeypatch.setattr("app.cache.metrics", counters)
+    cache = ListingCache(InMemoryCacheBackend(), ttl=60)
+
+    async def scenario():
+        assert await cache.aget("alerts", 50, None) is None
+        await cache.aset("alerts", 50, None, Page(items=[{"id": "a1"}], next_cursor="n"))
+        assert await cache.aget("alerts", 50, None) == Page(items=[{"id": "a1"}], next_cursor="n")
+        await cache.ainvalidate("alerts")
+        assert await cache.aget("alerts", 50, None) is None
+
+    asyncio.run(scenario())
+    assert 'opsboard_cache_requests_total{namespace="alerts",result="hit"} 1' in counters.render_counters()
+    assert 'opsboard_cache_requests_total{namespace="alerts",result="miss"} 2' in counters.render_counters()
+
+
+def test_backend_errors_degrade_to_misses(monkeypatch):
+    class Down(InMemoryCacheBackend):
+        def get(self, namespace, key):
+            raise ConnectionError("cache down")
+
+        def invalidate(self, namespaces):
+            raise ConnectionError("cache down")
+
+    counters = InMemoryMetrics()
+    monkeypatch.setattr("app.cache.metrics", counters)
+    cache = ListingCache(Down(), ttl=60)
+    assert cache.get("cards", 50, None) is None
+    cache.invalidate("cards")
+    assert 'opsboard_cache_requests_total{namespace="cards",result="error"} 2' in counters.render_counters()
+
+
+def test_serializer_bugs_are_not_swallowed_as_misses():
+    class Broken(InMemoryCacheBackend):
+        def set(self, namespace, key, value, ttl):
+            raise TypeError("Object of type set is not JSON serializable")
+
+    with pytest.raises(TypeError):
+        ListingCache(Broken(), ttl=60).set("cards", 50, None, Page(items=[{"id": "c1"}], next_cursor=None))
+
+
+class FakeRedis:
+    """Just the hash commands RedisCacheBackend uses."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.expiry = {}
+
+    def hget(self, name, key):
+        return self.hashes.get(name, {}).get(key)
+
+    def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key] = value
+
+    def expire(self, name, seconds):
+        self.expiry[name] = seconds
+
+    def delete(self, *names):
+        for name in names:
+            self.hashes.pop(name, None)
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+
+def test_redis_backend_uses_one_hash_per_namespace():
+    redis = FakeRedis()
+    backend = RedisCacheBackend("redis://unused", client=redis, async_client=object())
+    backend.set("incidents", "50:", {"items": [], "next_cursor": None}, ttl=5)
+    assert backend.get("incidents", "50:") == {"items": [], "next_cursor": None}
+    assert redis.expiry == {"opsboard:cache:incidents": 50}
+
+    expires_at, _ = json.loads(redis.hashes["opsboard:cache:incidents"]["50:"])
+    assert expires_at > time.time()
+    redis.hashes["opsboard:cache:incidents"]["old"] = json.dumps([time.time() - 1, {"stale": True}])
+    assert backend.get("incidents", "old") is None
+
+    backend.invalidate(("incidents", "cards"))
+    assert redis.hashes == {}
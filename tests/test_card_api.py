@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from app.db import PROJECTIONS
+
+
+def test_create_returns_only_the_new_card(client, fake_db):
+    response = client.post("/api/cards", json={"title": "Rotate keys", "column_name": "In Progress"})
+    assert response.status_code == 201
+    card = response.json()
+    assert set(card) == set(PROJECTIONS["board"])
+    assert card["column_name"] == "In Progress"
+    assert [c["id"] for c in fake_db.cards] == [card["id"]]
+    assert fake_db.audit_events[-1]["action"] == "card_created"
+
+
+def test_create_validates_like_the_form(client):
+    assert client.post("/api/cards", json={"title": "x"}).status_code == 422
+    assert client.post("/api/cards", json={"title": "Rotate", "column_name": "Later"}).status_code == 422
+
+
+def test_move_is_one_request_without_redirect(client, fake_db):
+    card = fake_db.create_card("Patch kernel", "")
+    response = client.patch(f"/api/cards/{card['id']}", json={"column_name": "Done"})
+    assert response.status_code == 200
+    assert response.json()["column_name"] == "Done"
+    assert fake_db.cards[0]["column_name"] == "Done"
+    assert client.patch(f"/api/cards/{uuid4()}", json={"column_name": "Done"}).status_code == 404
+
+
+def test_malformed_card_ids_are_rejected_before_the_database(client):
+    # Postgres would answer a non-UUID id with 22P02, i.e. a 500.
+    assert client.patch("/api/cards/missing", json={"column_name": "Done"}).status_code == 422
+    assert client.delete("/api/cards/1;drop").status_code == 422
+
+
+def test_delete(client, fake_db):
+    card = fake_db.create_card("Patch kernel", "")
+    response = client.delete(f"/api/cards/{card['id']}")
+    assert response.status_code == 204
+    assert fake_db.cards == []
+    assert client.delete(f"/api/cards/{card['id']}").status_code == 404
+
+
+def test_board_forms_opt_into_the_json_api(client, fake_db):
+    fake_db.create_card("Patch kernel", "")
+    body = client.get("/board?view=board").text
+    assert 'data-api="move"' in body and 'data-api="delete"' in body and 'data-api="create"' in body
+    assert "/static/live.js" in body
+
+
+def test_batch_returns_a_result_per_operation(client, fake_db):
+    keep, gone = fake_db.create_card("Patch kernel", ""), fake_db.create_card("Old task", "")
+    missing = str(uuid4())
+    response = client.post(
+        "/api/cards/batch",
+        json={
+            "operations": [
+                {"op": "move", "id": keep["id"], "column_name": "Done"},
+                {"op": "create", "title": "Write postmortem"},
+                {"op": "delete", "id": gone["id"]},
+                {"op": "delete", "id": missing},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["atomic"] is True
+    assert [(r["op"], r["status"]) for r in body["results"]] == [
+        ("move", "moved"),
+        ("create", "created"),
+        ("delete", "deleted"),
+        ("delete", "not_found"),
+    ]
+    assert body["results"][0]["card"]["column_name"] == "Done"
+    assert body["results"][1]["card"]["title"] == "Write postmortem"
+    assert sorted(c["title"] for c in fake_db.cards) == ["Patch kernel", "Write postmortem"]
+
+
+def test_batch_rejects_repeated_ids_and_bad_operations(client, fake_db):
+    card_id = str(uuid4())
+    repeated = [{"op": "move", "id": card_id, "column_name": "Done"}, {"op": "delete", "id": card_id}]
+    assert client.post("/api/cards/batch", json={"operations": repeated}).status_code == 422
+    assert client.post("/api/cards/batch", json={"operations": [{"op": "delete", "id": "c1"}]}).status_code == 422
+    assert client.post("/api/cards/batch", json={"operations": [{"op": "archive", "id": card_id}]}).status_code == 422
+    assert client.post("/api/cards/batch", json={"operations": []}).status_code == 422
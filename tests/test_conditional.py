@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from app.conditional import etag_matches
+
+
+def _listing_calls(fake_db, monkeypatch, name):
+    calls = []
+    listing = getattr(fake_db, name)
+
+    def counted(*args, **kwargs):
+        calls.append(1)
+        return listing(*args, **kwargs)
+
+    monkeypatch.setattr(fake_db, name, counted)
+    return calls
+
+
+def test_etag_comparison_is_weak():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"x", "abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+    assert not etag_matches('W/"abd"', 'W/"abc"')
+
+
+def test_matching_if_none_match_skips_listing_and_render(client, fake_db, monkeypatch):
+    fake_db.create_card("Patch kernel", "")
+    first = client.get("/board")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "no-cache"
+
+    calls = _listing_calls(fake_db, monkeypatch, "list_cards")
+    second = client.get("/board", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert calls == []
+
+
+def test_write_changes_the_etag(client, fake_db):
+    etag = client.get("/alerts").headers["etag"]
+    client.post("/alerts", data={"title": "Disk full", "severity": "low"}, follow_redirects=False)
+    response = client.get("/alerts", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert "Disk full" in response.text
+
+
+def test_etag_depends_on_query_and_route(client):
+    tags = {
+        client.get("/incidents").headers["etag"],
+        client.get("/incidents?limit=5").headers["etag"],
+        client.get("/api/incidents").headers["etag"],
+    }
+    assert len(tags) == 3
+
+
+def test_status_etag_follows_readiness(client, monkeypatch):
+    etag = client.get("/api/status").headers["etag"]
+    assert client.get("/api/status", headers={"If-None-Match": etag}).status_code == 304
+    monkeypatch.setenv("GEMINI_API_KEY", "k")
+    response = client.get("/api/status", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["ai_gemini_key_present"] is True
+
+
+def test_no_etag_without_version_counters(client, fake_db, monkeypatch):
+    monkeypatch.setattr(fake_db, "change_versions", lambda *tables: None)
+    response = client.get("/board", headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+def test_listing_is_read_under_the_etag_version(client, fake_db, monkeypatch):
+    seen = []
+    listing = fake_db.list_alerts
+
+    def recording(limit=None, cursor=None, version=None):
+        seen.append(version)
+        return listing(limit, cursor)
+
+    monkeypatch.setattr(fake_db, "list_alerts", recording)
+    client.get("/api/alerts")
+    assert seen == [fake_db.change_versions("alerts")["alerts"]]
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from postgrest.exceptions import APIError
+
+from app.cache import InMemoryCacheBackend, ListingCache
+from app.db import (
+    ESCALATION_BATCH_SIZE,
+    TABLES,
+    AsyncDataAccess,
+    AuditFilter,
+    DataAccess,
+)
+
+
+class StubQuery:
+    def __init__(self, client, target):
+        self.client = client
+        self.target = target
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return record
+
+    def execute(self):
+        self.client.executed.append(self)
+        return self.client.handler(self)
+
+
+class StubClient:
+    def __init__(self, handler):
+        self.handler = handler
+        self.executed = []
+
+    def table(self, name):
+        return StubQuery(self, name)
+
+    def rpc(self, name, params):
+        query = StubQuery(self, f"rpc:{name}")
+        query.calls.append(("rpc", (params,), {}))
+        return query
+
+
+class AsyncStubQuery(StubQuery):
+    async def execute(self):
+        return super().execute()
+
+
+class AsyncStubClient(StubClient):
+    """StubClient for AsyncDataAccess: same recording, awaitable ``execute``."""
+
+    def table(self, name):
+        return AsyncStubQuery(self, name)
+
+    def rpc(self, name, params):
+        query = AsyncStubQuery(self, f"rpc:{name}")
+        query.calls.append(("rpc", (params,), {}))
+        return query
+
+
+class Blocking:
+    """Runs an AsyncDataAccess's coroutine methods to completion, so one test body covers both."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+        return lambda *args, **kwargs: asyncio.run(attr(*args, **kwargs))
+
+
+@pytest.fixture(params=["sync", "async"])
+def make_db(request):
+    """``make_db(handler, **kwargs) -> (client, db)`` for DataAccess and AsyncDataAccess alike."""
+
+    def make(handler, **kwargs):
+        if request.param == "sync":
+            client = StubClient(handler)
+            return client, DataAccess(client, **kwargs)
+        client = AsyncStubClient(handler)
+        return client, Blocking(AsyncDataAccess(client, **kwargs))
+
+    return make
+
+
+def test_counts_uses_single_rpc_round_trip(make_db):
+    client, db = make_db(lambda q: SimpleNamespace(data={t: 3 for t in TABLES}))
+    assert db.counts(estimated=True) == {t: 3 for t in TABLES}
+    assert [q.target for q in client.executed] == ["rpc:entity_counts"]
+    assert client.executed[0].calls[0][1] == ({"estimated": True},)
+
+
+def test_counts_falls_back_to_per_table_when_rpc_missing(make_db):
+    def handler(query):
+        if query.target.startswith("rpc:"):
+            raise APIError({"code": "PGRST202", "message": "not found"})
+        return SimpleNamespace(count=1, data=[])
+
+    client, db = make_db(handler)
+    assert db.counts() == {t: 1 for t in TABLES}
+    client.executed.clear()
+    db.counts()
+    assert [q.target for q in client.executed] == TABLES
+
+
+def test_counts_propagates_other_rpc_errors(make_db):
+    def handler(query):
+        raise APIError({"code": "57014", "message": "statement timeout"})
+
+    with pytest.raises(APIError):
+        make_db(handler)[1].counts()
+
+
+def test_change_versions_reads_one_row_per_table(make_db):
+    client, db = make_db(lambda q: SimpleNamespace(data=[{"table_name": "cards", "version": 7}]))
+    assert db.change_versions("cards", "alerts") == {"cards": 7, "alerts": 0}
+    assert [q.target for q in client.executed] == ["table_versions"]
+
+
+def test_change_versions_turn_off_when_migration_missing(make_db):
+    def handler(query):
+        raise APIError({"code": "PGRST205", "message": "Could not find the table"})
+
+    client, db = make_db(handler)
+    assert db.change_versions("cards") is None
+    assert db.change_versions("cards") is None
+    assert len(client.executed) == 1
+
+
+def test_card_mutations_report_missing_cards(make_db):
+    client, db = make_db(lambda query: SimpleNamespace(data=[]))
+    assert db.move_card("missing", "Done") is None
+    assert db.delete_card("missing") is False
+    assert [q.target for q in client.executed] == ["cards", "cards"]
+
+
+def test_card_batch_is_one_rpc_transaction(make_db):
+    def handler(query):
+        rows = query.calls[0][1][0]["p_creates"]
+        # RETURNING order is not guaranteed; results come back in the order of the creates.
+        return SimpleNamespace(data={"created": rows[::-1], "moved": [], "deleted": ["c9"]})
+
+    client, db = make_db(handler)
+    result = db.apply_card_batch(
+        creates=[{"title": "One"}, {"title": "Two", "column_name": "Done"}], moves={}, deletes=["c9"]
+    )
+    assert [q.target for q in client.executed] == ["rpc:apply_card_batch"]
+    assert [card["title"] for card in result["created"]] == ["One", "Two"]
+    assert result["deleted"] == ["c9"]
+    assert result["atomic"] is True
+
+
+def test_card_batch_falls_back_to_bulk_requests_when_rpc_missing(make_db):
+    def handler(query):
+        if query.target.startswith("rpc:"):
+            raise APIError({"code": "PGRST202", "message": "not found"})
+        methods = [name for name, _, _ in query.calls]
+        if "update" in methods:
+            column_name = query.calls[0][1][0]["column_name"]
+            ids = next(args[1] for name, args, _ in query.calls if name == "in_")
+            return SimpleNamespace(data=[{"id": card_id, "column_name": column_name} for card_id in ids])
+        if "delete" in methods:
+            return SimpleNamespace(data=[{"id": "c3"}])
+        return SimpleNamespace(data=query.calls[0][1][0] if "insert" in methods else [])
+
+    client, db = make_db(handler)
+    result = db.apply_card_batch(
+        creates=[{"title": "One"}, {"title": "Two"}],
+        moves={"c1": "Done", "c2": "Done", "c5": "Todo"},
+        deletes=["c3", "c4"],
+    )
+    assert [q.target for q in client.executed] == [
+        "rpc:apply_card_batch", "cards", "cards", "cards", "cards", "audit_events"
+    ]
+    assert [card["id"] for card in result["moved"]] == ["c1", "c2", "c5"]
+    assert result["deleted"] == ["c3"]
+    assert result["atomic"] is False
+    audit = client.executed[-1].calls[0][1][0]
+    assert [row["action"] for row in audit] == ["card_created"] * 2 + ["card_moved"] * 3 + ["card_deleted"]
+
+    client.executed.clear()
+    db.apply_card_batch(creates=[{"title": "Three"}], moves={}, deletes=[])
+    assert [q.target for q in client.executed] == ["cards", "audit_events"]
+
+
+def test_async_data_access_mirrors_sync_surface():
+    def public(cls):
+        return {name for name in vars(cls) if not name.startswith("_")}
+
+    assert public(AsyncDataAccess) == public(DataAccess)
+    for name in public(AsyncDataAccess):
+        assert inspect.iscoroutinefunction(getattr(AsyncDataAccess, name)), name
+
+
+def _alerts(n):
+    return [{"id": f"alert-{i}", "title": f"Alert {i}", "severity": "high"} for i in range(n)]
+
+
+def test_escalate_alerts_batches_round_trips(make_db):
+    def handler(query):
+        _, args, _ = query.calls[0]
+        if query.target == "incidents":
+            return SimpleNamespace(data=args[0])
+        return SimpleNamespace(data=[])
+
+    client, db = make_db(handler)
+    alerts = _alerts(ESCALATION_BATCH_SIZE * 2 + 50)
+    created = db.escalate_alerts(alerts)
+
+    assert len(created) == len(alerts)
+    assert [q.target for q in client.executed] == ["incidents", "audit_events", "alerts"] * 3
+    upsert = client.executed[0].calls[0]
+    assert upsert[0] == "upsert"
+    assert upsert[2] == {"on_conflict": "source_alert_id", "ignore_duplicates": True}
+    in_filter = next(c for c in client.executed[2].calls if c[0] == "in_")
+    assert len(in_filter[1][1]) == ESCALATION_BATCH_SIZE
+
+
+def test_escalate_alerts_retry_skips_already_created_incidents(make_db):
+    client, db = make_db(lambda query: SimpleNamespace(data=[]))
+    created = db.escalate_alerts(_alerts(3))
+    assert created == []
+    assert [q.target for q in client.executed] == ["incidents", "alerts"]
+
+
+class RecordingSink:
+    def __init__(self):
+        self.rows = []
+
+    def submit(self, row):
+        self.rows.append(row)
+        return True
+
+    async def asubmit(self, row):
+        return self.submit(row)
+
+
+def test_escalation_audit_rows_go_through_the_audit_sink(make_db):
+    sink = RecordingSink()
+    client, db = make_db(
+        lambda query: SimpleNamespace(data=query.calls[0][1][0] if query.target == "incidents" else []),
+        audit_sink=sink,
+    )
+    created = db.escalate_alerts(_alerts(3))
+
+    assert [q.target for q in client.executed] == ["incidents", "alerts"]
+    assert [row["action"] for row in sink.rows] == ["incident_created"] * 3
+    assert [row["entity_id"] for row in sink.rows] == [incident["id"] for incident in created]
+
+
+def _timestamped_rows(count):
+    return [{"id": f"00000000-0000-0000-0000-{i:012d}", "created_at": f"2026-10-18T10:00:{i:02d}+00:00"} for i in range(count)]
+
+
+def test_list_alerts_fetches_one_bounded_keyset_page(make_db):
+    rows = _timestamped_rows(4)
+    client, db = make_db(lambda query: SimpleNamespace(data=rows))
+    page = db.list_alerts(limit=3)
+
+    assert len(client.executed) == 1
+    assert ("limit", (4,), {}) in client.executed[0].calls
+    assert [row["id"] for row in page.items] == [row["id"] for row in rows[:3]]
+    assert page.next_cursor is not None
+
+    db.list_alerts(limit=3, cursor=page.next_cursor)
+    calls = client.executed[1].calls
+    keyset = next(args[0] for name, args, _ in calls if name == "or_")
+    assert keyset.startswith('created_at.lt."2026-10-18T10:00:02+00:00"')
+    assert keyset.endswith("id.lt.00000000-0000-0000-0000-000000000002)")
+    assert [c for c in calls if c[0] == "order"] == [
+        ("order", ("created_at",), {"desc": True}),
+        ("order", ("id",), {"desc": True}),
+    ]
+
+
+def test_audit_filters_are_pushed_into_the_query(make_db):
+    client, db = make_db(lambda query: SimpleNamespace(data=[]))
+    since = datetime(2026, 10, 1, tzinfo=UTC)
+    db.list_audit_events(filters=AuditFilter(action="watcher_run", entity_id="watcher", since=since))
+    calls = client.executed[0].calls
+    assert ("eq", ("action", "watcher_run"), {}) in calls
+    assert ("eq", ("entity_id", "watcher"), {}) in calls
+    assert ("gte", ("created_at", since.isoformat()), {}) in calls
+    assert not any(name == "eq" and args[0] == "entity_type" for name, args, _ in calls)
+
+
+def test_listings_read_through_cache_until_a_write_invalidates(make_db):
+    rows = _timestamped_rows(2)
+    client, db = make_db(
+        lambda query: SimpleNamespace(data=rows if query.target == "cards" else [{"id": "c9"}]),
+        cache=ListingCache(InMemoryCacheBackend(), ttl=60),
+    )
+
+    assert db.list_cards().items == db.list_cards().items == rows
+    assert [q.target for q in client.executed] == ["cards"]
+
+    db.move_card("c9", "Done")
+    db.list_cards()
+    db.list_cards(limit=1)
+    assert [q.target for q in client.executed] == ["cards", "cards", "audit_events", "cards", "cards"]
+
+
+def test_cached_listing_is_keyed_by_the_version_it_was_read_under(make_db):
+    rows = _timestamped_rows(1)
+    cache = ListingCache(InMemoryCacheBackend(), ttl=60)
+    client, db = make_db(lambda query: SimpleNamespace(data=list(rows)), cache=cache)
+    assert db.list_cards(version=1).items == rows
+
+    # A write from another process moves the version without invalidating this cache.
+    rows.append(_timestamped_rows(2)[1])
+    assert db.list_cards(version=1).items == rows[:1]
+    assert db.list_cards(version=2).items == rows
+    assert [q.target for q in client.executed] == ["cards", "cards"]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.db import AsyncDataAccessPool, DataAccessPool
+
+
+class FakeClientDataAccess:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncClientDataAccess(FakeClientDataAccess):
+    async def close(self):
+        self.closed = True
+
+
+def _counting_factory():
+    built = []
+
+    def factory():
+        time.sleep(0.01)
+        db = FakeClientDataAccess()
+        built.append(db)
+        return db
+
+    return factory, built
+
+
+def test_pool_reuses_single_client_across_threads():
+    factory, built = _counting_factory()
+    pool = DataAccessPool(factory, max_age_seconds=60)
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        return pool.get()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: worker(), range(8)))
+
+    assert len(built) == 1
+    assert all(db is built[0] for db in results)
+
+
+def test_pool_reconnects_after_invalidate_and_max_age():
+    factory, _ = _counting_factory()
+    pool = DataAccessPool(factory, max_age_seconds=60)
+    first = pool.get()
+    pool.invalidate()
+    second = pool.get()
+    assert second is not first
+    assert not first.closed
+
+    aged = DataAccessPool(factory, max_age_seconds=0)
+    assert aged.get() is not aged.get()
+
+
+def test_pool_close_releases_client():
+    factory, _ = _counting_factory()
+    pool = DataAccessPool(factory, max_age_seconds=60)
+    db = pool.get()
+    pool.close()
+    assert db.closed
+    assert pool.get() is not db
+
+
+def test_recycled_client_stays_open_for_requests_still_using_it():
+    factory, _ = _counting_factory()
+    pool = DataAccessPool(factory, max_age_seconds=0, retire_after_seconds=60)
+    in_use = pool.get()
+    replacement = pool.get()
+    assert replacement is not in_use
+    assert not in_use.closed
+
+    pool.close()
+    assert in_use.closed
+    assert replacement.closed
+
+
+def test_retired_client_is_closed_after_its_grace_period():
+    factory, _ = _counting_factory()
+    pool = DataAccessPool(factory, max_age_seconds=60, retire_after_seconds=0.05)
+    old = pool.get()
+    pool.invalidate()
+    new = pool.get()
+    assert not old.closed
+    time.sleep(0.06)
+    assert pool.get() is new
+    assert old.closed
+    assert not new.closed
+
+
+def test_async_pool_retires_recycled_clients_with_a_grace_period():
+    async def factory():
+        return FakeAsyncClientDataAccess()
+
+    async def run():
+        pool = AsyncDataAccessPool(factory, max_age_seconds=0, retire_after_seconds=60)
+        in_use = await pool.get()
+        replacement = await pool.get()
+        survived = not in_use.closed
+        await pool.close()
+        return in_use, replacement, survived
+
+    in_use, replacement, survived = asyncio.run(run())
+    assert replacement is not in_use
+    assert survived
+    assert in_use.closed and replacement.closed
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from app.config import get_settings
+from app.db import DataAccess
+from app.events import RESYNC, EventBroker, RedisEventRelay, get_event_broker
+from tests.test_db import StubClient
+
+
+def _drain(subscription):
+    events = []
+    while subscription.qsize():
+        events.append(json.loads(subscription._queue.get_nowait()[1]))
+    return events
+
+
+def test_mutations_publish_small_diffs():
+    async def run():
+        broker = EventBroker()
+        subscription = broker.subscribe()
+        card = {"id": "c1", "title": "Fix DNS", "description": "", "column_name": "Todo", "created_at": "t"}
+        client = StubClient(lambda query: SimpleNamespace(data=[{**card, "updated_at": "t", "incident_id": None}]))
+        db = DataAccess(client, events=broker)
+        db.create_card("Fix DNS", "")
+        db.move_card("c1", "Done")
+        db.delete_card("c1")
+        db.update_incident_status("i1", "resolved")
+        return _drain(subscription)
+
+    card = {"id": "c1", "title": "Fix DNS", "description": "", "column_name": "Todo", "created_at": "t"}
+    assert asyncio.run(run()) == [
+        {"type": "card_created", "card": card},
+        {"type": "card_moved", "id": "c1", "column_name": "Done"},
+        {"type": "card_deleted", "id": "c1"},
+        {"type": "incident_status_changed", "id": "i1", "status": "resolved"},
+    ]
+
+
+def test_escalation_publishes_one_event_per_batch():
+    async def run():
+        broker = EventBroker()
+        subscription = broker.subscribe()
+        incident = {"id": "i1", "title": "Incident", "severity": "high", "status": "investigating", "created_at": "t"}
+
+        def handler(query):
+            return SimpleNamespace(data=[{**incident, "source_alert_id": "a1"}] if query.target == "incidents" else [])
+
+        alerts = [{"id": f"a{i}", "title": "Spike", "severity": "high"} for i in range(3)]
+        DataAccess(StubClient(handler), events=broker).escalate_alerts(alerts)
+        return _drain(subscription)
+
+    assert asyncio.run(run()) == [
+        {"type": "alerts_escalated", "ids": ["a0", "a1", "a2"]},
+        {"type": "incidents_created", "incidents": [{"id": "i1", "title": "Incident", "severity": "high", "status": "investigating", "created_at": "t"}]},
+    ]
+
+
+def test_resume_replays_missed_events_or_resyncs():
+    async def run():
+        broker = EventBroker(history_size=2)
+        rendered_at = broker.cursor()
+        broker.publish("card_deleted", {"id": "c1"})
+        replayed = _drain(broker.subscribe(since=rendered_at))
+        for i in range(3):
+            broker.publish("card_deleted", {"id": f"c{i + 2}"})
+        stale_page = _drain(broker.subscribe(since=rendered_at))
+        reconnect = _drain(broker.subscribe(last_event_id=rendered_at))
+        other_process = _drain(broker.subscribe(last_event_id="deadbeef:1"))
+        return replayed, stale_page, reconnect, other_process
+
+    replayed, stale_page, reconnect, other_process = asyncio.run(run())
+    assert replayed == [{"type": "card_deleted", "id": "c1"}]
+    assert stale_page == []
+    assert reconnect == [json.loads(RESYNC)]
+    assert other_process == []
+
+
+def test_stalled_viewer_memory_stays_bounded():
+    async def run():
+        broker = EventBroker(queue_size=16, history_size=32)
+        subscription = broker.subscribe()
+        payload = {"card": {"id": "c1", "title": "x" * 200}}
+        for _ in range(100):
+            broker.publish("card_created", payload)
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            for _ in range(10_000):
+                broker.publish("card_created", payload)
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return subscription, after - before
+
+    subscription, growth = asyncio.run(run())
+    # Unbounded, 10k undelivered ~250-byte messages would be ~2.5 MB.
+    assert growth < 64 * 1024
+    assert subscription.qsize() <= 16
+    assert subscription.dropped > 0
+    assert json.loads(subscription._queue.get_nowait()[1]) == json.loads(RESYNC)
+
+
+def test_cross_thread_publish_reaches_the_loop():
+    async def run():
+        broker = EventBroker()
+        subscription = broker.subscribe()
+        await asyncio.to_thread(broker.publish, "card_deleted", {"id": "c1"})
+        return json.loads((await asyncio.wait_for(subscription.get(), 1))[1])
+
+    assert asyncio.run(run()) == {"type": "card_deleted", "id": "c1"}
+
+
+def test_events_endpoint_streams_and_unsubscribes(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "events_max_stream_seconds", 0.05)
+    broker = get_event_broker()
+    since = broker.cursor()
+    broker.publish("card_moved", {"id": "c1", "column_name": "Done"})
+    response = client.get("/events", params={"since": since})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith(f"id: {broker.cursor()}\nretry: ")
+    assert 'data: {"type":"card_moved","id":"c1","column_name":"Done"}' in response.text
+    assert broker.subscribers == 0
+
+
+def test_pages_opt_into_live_updates(client, fake_db):
+    fake_db.create_card("Fix DNS", "")
+    body = client.get("/board?view=board").text
+    assert f'data-live-since="{get_event_broker().epoch}:' in body
+    assert 'data-live-template="card"' in body
+    assert "/static/live.js" in body
+    assert "/static/live.js" not in client.get("/audit").text
+
+
+class FakeRedisBus:
+    """Just the pub/sub commands RedisEventRelay uses, shared by every "process"."""
+
+    def __init__(self):
+        self.queues = []
+
+    def publish(self, channel, payload):
+        for subscribed, inbox in self.queues:
+            if subscribed == channel:
+                inbox.put({"type": "message", "data": payload.encode("utf-8")})
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        bus = self
+
+        class PubSub:
+            def subscribe(self, channel):
+                self.inbox = queue.Queue()
+                bus.queues.append((channel, self.inbox))
+
+            def listen(self):
+                while True:
+                    yield self.inbox.get()
+
+        return PubSub()
+
+
+def test_redis_relay_fans_events_out_across_processes():
+    bus = FakeRedisBus()
+
+    def process():
+        relay = RedisEventRelay("redis://unused", client=bus)
+        broker = EventBroker(relay=relay)
+        relay.start(broker)
+        return broker
+
+    web, watcher = process(), process()
+    deadline = time.monotonic() + 2
+    while len(bus.queues) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    async def run():
+        own = web.subscribe()
+        watcher.publish("incident_status_changed", {"id": "i1", "status": "resolved"})
+        received = json.loads((await asyncio.wait_for(own.get(), 2))[1])
+        # The publishing process does not get its own event back a second time.
+        await asyncio.sleep(0.05)
+        return received, watcher.cursor()
+
+    received, watcher_cursor = asyncio.run(run())
+    assert received == {"type": "incident_status_changed", "id": "i1", "status": "resolved"}
+    assert watcher_cursor.endswith(":1")
+
+
+def test_streams_resync_periodically_without_a_relay():
+    async def run():
+        broker = EventBroker(resync_seconds=0.05)
+        return [chunk async for chunk in broker.stream(None, None, heartbeat=1, max_seconds=5)]
+
+    chunks = asyncio.run(run())
+    assert chunks[-1] == f"data: {RESYNC}\n\n"
+
+
+def test_memory_backend_does_not_force_periodic_reloads_by_default():
+    broker = get_event_broker()
+    assert broker.relay is None
+    assert broker.resync_seconds == 0
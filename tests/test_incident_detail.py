@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.services.incidents import load_incident_detail
+
+
+class SlowAsyncDataAccess:
+    delay = 0.05
+
+    async def get_incident(self, incident_id):
+        await asyncio.sleep(self.delay)
+        return {"id": incident_id, "title": "Incident"}
+
+    async def list_audit_for_entity(self, entity_id):
+        await asyncio.sleep(self.delay)
+        return [{"action": "incident_created"}]
+
+    async def list_incident_notes(self, incident_id):
+        await asyncio.sleep(self.delay)
+        return [{"note_type": "triage", "content": "note"}]
+
+    async def list_agent_cards_for_incident(self, incident_id):
+        await asyncio.sleep(self.delay)
+        return []
+
+
+def test_loader_runs_lookups_concurrently_and_records_timings():
+    started = time.perf_counter()
+    view = asyncio.run(load_incident_detail(SlowAsyncDataAccess(), "inc-1"))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < SlowAsyncDataAccess.delay * 3
+    assert view.incident["id"] == "inc-1"
+    assert view.triage_note["content"] == "note"
+    assert set(view.timings_ms) == {
+        "get_incident",
+        "list_audit_for_entity",
+        "list_incident_notes",
+        "list_agent_cards_for_incident",
+    }
+
+
+def test_loader_returns_none_for_missing_incident():
+    class Missing(SlowAsyncDataAccess):
+        delay = 0
+
+        async def get_incident(self, incident_id):
+            return None
+
+    assert asyncio.run(load_incident_detail(Missing(), "nope")) is None
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import UTC, datetime
+
+from app import obs
+from app.obs import AccessLogSampler, LogQueueHandler, encode_json
+
+
+def test_sampler_keeps_errors_and_slow_requests():
+    sampler = AccessLogSampler(rate=0.0, skip_routes=frozenset({"/livez"}), slow_ms=500)
+    assert not sampler.keep("/board", 200, 10)
+    assert not sampler.keep("/livez", 200, 1)
+    assert sampler.keep("/livez", 503, 1)
+    assert sampler.keep("/board", 200, 800)
+
+
+def test_sampler_rate():
+    draws = iter([0.05, 0.5, 0.09])
+    sampler = AccessLogSampler(rate=0.1, _random=lambda: next(draws))
+    assert [sampler.keep("/board", 200, 1) for _ in range(3)] == [True, False, True]
+
+
+def test_full_queue_drops_access_lines_instead_of_blocking():
+    handler = LogQueueHandler(maxsize=1)
+    logger = logging.getLogger(obs.ACCESS_LOGGER_NAME)
+    logger.addHandler(handler)
+    try:
+        logger.warning("first")
+        logger.warning("second")
+    finally:
+        logger.removeHandler(handler)
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_full_queue_writes_domain_events_synchronously():
+    written = []
+
+    class Recorder(logging.Handler):
+        def emit(self, record):
+            written.append(record.getMessage())
+
+    handler = LogQueueHandler(maxsize=1, overflow=Recorder())
+    logger = logging.getLogger("opsboard.test-queue")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        logger.warning("first")
+        logger.warning("audit_event")
+    finally:
+        logger.removeHandler(handler)
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 0
+    assert written == ["audit_event"]
+
+
+def test_payload_is_encoded_lazily_and_tolerates_non_json_values(monkeypatch):
+    records = []
+    monkeypatch.setattr(logging.Logger, "handle", lambda self, record: records.append(record.msg))
+    obs.log_event("restore_committed", at=datetime(2026, 1, 2, tzinfo=UTC), rows={"cards": 3})
+    message = records[0]
+    assert message._text is None
+    assert json.loads(str(message))["at"] == "2026-01-02T00:00:00+00:00"
+    assert json.loads(encode_json({"a": 1})) == {"a": 1}
+
+
+def test_domain_events_are_never_sampled(client, caplog, monkeypatch):
+    caplog.set_level(logging.INFO, logger="opsboard")
+    monkeypatch.setattr(obs, "access_log", AccessLogSampler(rate=0.0))
+    client.post("/cards", data={"title": "Rotate keys", "column_name": "Todo"}, follow_redirects=False)
+    events = [json.loads(r.getMessage())["event"] for r in caplog.records if r.name.startswith("opsboard")]
+    assert events == ["domain_event"]
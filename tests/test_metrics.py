@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from app.multiproc_metrics import MmapValues, MultiProcessMetrics, compact_dead_workers, read_values
+from app.obs import LATENCY_BUCKETS_SECONDS, InMemoryMetrics, metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    m = InMemoryMetrics()
+    for elapsed_ms in [1, 7, 30, 30, 20_000]:
+        m.observe("GET", "/board", 200, elapsed_ms)
+    lines = m.render_prometheus()
+    labels = 'method="GET",route="/board",status="200"'
+    assert f'opsboard_http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in lines
+    assert f'opsboard_http_request_duration_seconds_bucket{{{labels},le="0.01"}} 2' in lines
+    assert f'opsboard_http_request_duration_seconds_bucket{{{labels},le="{LATENCY_BUCKETS_SECONDS[-1]}"}} 4' in lines
+    assert f'opsboard_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 5' in lines
+    assert f"opsboard_http_request_duration_seconds_count{{{labels}}} 5" in lines
+    assert f"opsboard_http_requests_total{{{labels}}} 5" in lines
+
+
+def test_concurrent_observations_are_not_lost():
+    m = InMemoryMetrics()
+
+    def hammer(_):
+        for _ in range(2000):
+            m.observe("POST", "/cards", 303, 3.0)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(hammer, range(8)))
+    assert m.requests_total == 16_000
+    assert m.series[("POST", "/cards", 303)].buckets[0] == 16_000
+
+
+def test_requests_are_labelled_by_route_template(client, fake_db):
+    alert = fake_db.create_alert("Disk full", "critical", "test")
+    incident = fake_db.create_incident_from_alert(alert)
+    metrics.series.clear()
+    client.get(f"/incidents/{incident['id']}")
+    client.get("/incidents/does-not-exist")
+    client.get("/no/such/page")
+
+    body = client.get("/metrics").text
+    assert 'route="/incidents/{incident_id}",status="200"' in body
+    assert 'route="/incidents/{incident_id}",status="404"' in body
+    assert 'route="unmatched",status="404"' in body
+    assert incident["id"] not in body
+
+
+def _observe_in_child(store, count):
+    for _ in range(count):
+        store.observe("GET", "/board", 200, 30.0)
+
+
+def test_multiprocess_store_sums_all_workers(tmp_path):
+    store = MultiProcessMetrics(str(tmp_path))
+    store.observe("GET", "/board", 200, 30.0)
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_observe_in_child, args=(store, 50)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert store.requests_total == 151
+    labels = 'method="GET",route="/board",status="200"'
+    assert f'opsboard_http_request_duration_seconds_bucket{{{labels},le="0.05"}} 151' in store.render_prometheus()
+    # The exited children were folded into the archive; only this process keeps a worker file.
+    assert sorted(p.name for p in tmp_path.glob("*.db")) == ["archive.db", f"worker_{os.getpid()}.db"]
+
+
+def test_dead_worker_files_are_folded_once(tmp_path):
+    child = subprocess.Popen([sys.executable, "-c", "pass"])
+    child.wait()
+    dead = MmapValues(str(tmp_path / f"worker_{child.pid}.db"))
+    dead.add('["GET", "/alerts", 200]|count', 4)
+    dead.add('["GET", "/alerts", 200]|sum', 0.2)
+    dead.close()
+
+    assert compact_dead_workers(str(tmp_path)) == 1
+    assert compact_dead_workers(str(tmp_path)) == 0
+    store = MultiProcessMetrics(str(tmp_path))
+    assert store.requests_total == 4
+    assert store.request_latency_ms_avg == 50
+
+
+def test_mmap_file_grows_and_reopens(tmp_path):
+    path = str(tmp_path / "worker_1.db")
+    values = MmapValues(path)
+    for i in range(5000):
+        values.add(f"key-{i}", i)
+    values.add("key-7", 1)
+    values.close()
+    reopened = dict(read_values(path))
+    assert len(reopened) == 5000 and reopened["key-7"] == 8
+
+
+def test_multiprocess_counters_are_summed(tmp_path):
+    store = MultiProcessMetrics(str(tmp_path))
+    store.inc("opsboard_cache_requests_total", {"namespace": "cards", "result": "hit"})
+    child = multiprocessing.get_context("fork").Process(
+        target=store.inc, args=("opsboard_cache_requests_total", {"result": "hit", "namespace": "cards"}, 2)
+    )
+    child.start()
+    child.join()
+    assert store.render_counters() == [
+        "# TYPE opsboard_cache_requests_total counter",
+        'opsboard_cache_requests_total{namespace="cards",result="hit"} 3',
+    ]
+    assert store.requests_total == 0
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import base64
+import json
+
+import pytest
+
+from app.pagination import (
+    InvalidCursor,
+    clamp_page_size,
+    decode_cursor,
+    encode_cursor,
+    page_from_rows,
+)
+
+ROW = {"id": "0f8fad5b-d9cb-469f-a165-70867728950e", "created_at": "2026-10-18T09:53:00.120000+00:00"}
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(ROW)) == (ROW["created_at"], ROW["id"])
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-base64!",
+        base64.urlsafe_b64encode(b"{}").decode(),
+        base64.urlsafe_b64encode(json.dumps(["2026-10-18", "x),id.gt.0"]).encode()).decode(),
+        base64.urlsafe_b64encode(json.dumps(['2026"),or(', ROW["id"]]).encode()).decode(),
+    ],
+)
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_page_size_is_capped():
+    assert clamp_page_size(None) == 50
+    assert clamp_page_size(10_000) == 200
+
+
+def test_next_cursor_only_when_more_rows_exist():
+    rows = [dict(ROW, id=f"{i}") for i in range(3)]
+    assert page_from_rows(rows[:2], 2).next_cursor is None
+    page = page_from_rows(rows, 2)
+    assert len(page.items) == 2
+    assert json.loads(base64.urlsafe_b64decode(page.next_cursor + "==")) == [ROW["created_at"], "1"]
+
+
+def test_alert_listing_pages_through_every_row(client, fake_db):
+    created = [fake_db.create_alert(f"Alert {i}", "low", "test")["id"] for i in range(5)]
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/alerts", params=params).json()
+        seen.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(created)
+    assert len(seen) == len(set(seen))
+
+
+def test_html_listing_links_next_page_and_keeps_view(client, fake_db):
+    for i in range(3):
+        fake_db.create_card(f"Card {i}", "", "Todo")
+    response = client.get("/board", params={"view": "board", "limit": 2})
+    assert response.status_code == 200
+    assert "Load more" in response.text
+    assert "view=board" in response.text.split("Load more")[0].rsplit("href=", 1)[1]
+    assert "Load more" not in client.get("/board", params={"limit": 10}).text
+
+
+def test_invalid_cursor_is_a_client_error(client):
+    assert client.get("/api/incidents", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/audit", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/api/cards", params={"limit": 500}).status_code == 422
+
+
+def test_audit_filter_is_applied_before_the_page_limit(client, fake_db):
+    fake_db.create_audit_event("watcher_run", "system", "watcher", {"created_incidents": 0})
+    for i in range(5):
+        fake_db.create_audit_event("card_moved", "card", f"c{i}", {})
+
+    body = client.get("/api/audit", params={"action": "watcher_run", "limit": 2}).json()
+    assert [e["action"] for e in body["items"]] == ["watcher_run"]
+    assert body["next_cursor"] is None
+
+    page = client.get("/audit", params={"entity_type": "card", "entity_id": "c3", "action": ""})
+    assert page.status_code == 200
+    assert "card:c3" in page.text and "card:c2" not in page.text
+
+
+def test_audit_time_range(client, fake_db):
+    fake_db.create_audit_event("card_moved", "card", "c1", {})
+    assert client.get("/api/audit", params={"until": "2000-01-01T00:00"}).json()["items"] == []
+    assert len(client.get("/api/audit", params={"since": "2000-01-01T00:00"}).json()["items"]) == 1
+    assert client.get("/api/audit", params={"since": "yesterday"}).status_code == 400
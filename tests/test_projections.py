@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from jinja2 import Environment, nodes
+
+from app.db import PROJECTIONS, DataAccess
+
+TEMPLATES = Path(__file__).resolve().parents[1] / "app" / "templates"
+
+# (template, loop/context variable) -> projection its rows come from.
+TEMPLATE_ROWS = {
+    ("board.html", "card"): "board",
+    ("alerts.html", "alert"): "alerts",
+    ("incidents.html", "incident"): "incidents",
+    ("audit.html", "event"): "audit",
+    ("incident_detail.html", "incident"): "incident",
+    ("incident_detail.html", "triage_note"): "incident_notes",
+    ("incident_detail.html", "card"): "incident_cards",
+    ("incident_detail.html", "event"): "timeline",
+}
+# Fields routes add to rows before rendering.
+COMPUTED = {"payload_summary"}
+
+
+def _attributes(template: str) -> dict[str, set[str]]:
+    ast = Environment().parse((TEMPLATES / template).read_text(encoding="utf-8"))
+    used: dict[str, set[str]] = {}
+    for node in ast.find_all(nodes.Getattr):
+        if isinstance(node.node, nodes.Name):
+            used.setdefault(node.node.name, set()).add(node.attr)
+    return used
+
+
+def test_templates_only_use_projected_fields():
+    missing = {}
+    for (template, variable), view in TEMPLATE_ROWS.items():
+        used = _attributes(template).get(variable)
+        assert used, f"{template} no longer renders {variable}; update TEMPLATE_ROWS"
+        unprojected = used - set(PROJECTIONS[view]) - COMPUTED
+        if unprojected:
+            missing[f"{template}:{variable}"] = sorted(unprojected)
+    assert missing == {}
+
+
+def test_paginated_projections_carry_the_cursor_columns():
+    for view in ["board", "alerts", "incidents", "audit"]:
+        assert {"id", "created_at"} <= set(PROJECTIONS[view])
+
+
+def test_listings_request_projected_columns():
+    selects = []
+
+    class Query:
+        def __getattr__(self, name):
+            def record(*args, **kwargs):
+                if name == "select":
+                    selects.append(args[0])
+                return self
+
+            return record
+
+        def execute(self):
+            return SimpleNamespace(data=[])
+
+    class Client:
+        def table(self, name):
+            return Query()
+
+    db = DataAccess(Client())
+    db.list_cards()
+    db.list_audit_events()
+    db.get_incident("inc-1")
+    assert selects == [
+        ",".join(PROJECTIONS["board"]),
+        ",".join(PROJECTIONS["audit"]),
+        ",".join(PROJECTIONS["incident"]),
+    ]
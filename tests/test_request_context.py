@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import logging
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.obs import RequestContextMiddleware, log_event, request_id_var
+
+
+def _events(caplog, name):
+    lines = [json.loads(record.getMessage()) for record in caplog.records if record.name.startswith("opsboard")]
+    return [line for line in lines if line["event"] == name]
+
+
+def test_request_id_reaches_log_events_without_being_passed(client, caplog):
+    caplog.set_level(logging.INFO, logger="opsboard")
+    response = client.post(
+        "/cards",
+        data={"title": "Fix DNS", "column_name": "Todo"},
+        headers={"x-request-id": "req-42"},
+        follow_redirects=False,
+    )
+    assert response.headers["x-request-id"] == "req-42"
+    assert _events(caplog, "domain_event")[0]["request_id"] == "req-42"
+    assert [e["status_code"] for e in _events(caplog, "http_request") if e["request_id"] == "req-42"] == [303]
+    assert request_id_var.get() is None
+
+
+def test_request_id_is_generated_and_visible_in_threadpool():
+    def blocking():
+        return request_id_var.get()
+
+    async def endpoint(request):
+        return JSONResponse({"state": request.state.request_id, "thread": await run_in_threadpool(blocking)})
+
+    client = TestClient(RequestContextMiddleware(Starlette(routes=[Route("/", endpoint)])))
+    response = client.get("/")
+    body = response.json()
+    assert body["state"] == body["thread"] == response.headers["x-request-id"]
+
+
+def test_streamed_body_passes_through_chunk_by_chunk(caplog):
+    caplog.set_level(logging.INFO, logger="opsboard")
+    sent = []
+
+    async def body():
+        for i in range(3):
+            log_event("chunk", index=i)
+            sent.append(i)
+            yield f"{i}\n".encode()
+
+    async def endpoint(request):
+        return StreamingResponse(body(), media_type="text/plain")
+
+    client = TestClient(RequestContextMiddleware(Starlette(routes=[Route("/export", endpoint)])))
+    with client.stream("GET", "/export", headers={"x-request-id": "stream-1"}) as response:
+        assert response.headers["x-request-id"] == "stream-1"
+        assert list(response.iter_lines()) == ["0", "1", "2"]
+    assert sent == [0, 1, 2]
+    assert {e["request_id"] for e in _events(caplog, "chunk")} == {"stream-1"}
@@ -8,3 +8,43 @@ def test_metrics(client):
     response = client.get("/metrics")
     assert response.status_code == 200
     assert "opsboard_requests_total" in response.text
+
+
+def test_livez_does_no_io(client, fake_db):
+    response = client.get("/livez")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert fake_db.pings == 0
+
+
+def test_readiness_is_cached_across_probes(client, fake_db):
+    for path in ["/readyz", "/health", "/api/status", "/readyz"]:
+        assert client.get(path).status_code == 200
+    assert fake_db.pings == 1
+    assert client.get("/api/status").json()["db_ok"] is True
+
+
+def test_readyz_reports_unavailable(client, fake_db, monkeypatch):
+    def broken_ping():
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(fake_db, "ping", broken_ping)
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json() == {
+        "status": "unavailable",
+        "db_ok": False,
+        "checked_at": response.json()["checked_at"],
+        "error": "ConnectionError",
+    }
+    assert client.get("/health").status_code == 503
+
+
+def test_incident_detail_renders(client, fake_db):
+    alert = fake_db.create_alert("Disk full", "critical", "test")
+    incident = fake_db.create_incident_from_alert(alert)
+    fake_db.upsert_incident_note(incident["id"], "triage", "Triage note body")
+    response = client.get(f"/incidents/{incident['id']}")
+    assert response.status_code == 200
+    assert "Triage note body" in response.text
+    assert client.get("/incidents/missing").status_code == 404
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from scripts.watcher import PgAlertListener, Watcher
+
+
+def test_only_lease_holder_escalates(fake_db):
+    fake_db.create_alert("CPU above 95%", "high", "test")
+    leader = Watcher(fake_db, holder="a")
+    standby = Watcher(fake_db, holder="b")
+
+    assert standby.tick().leader is True
+    result = leader.tick()
+    assert result.leader is False
+    assert result.incidents_created == 0
+    assert len(fake_db.incidents) == 1
+    assert leader.interval == leader.max_interval
+
+
+def test_adaptive_backoff_and_watermark(fake_db):
+    watcher = Watcher(fake_db, holder="a", min_interval=1, max_interval=8, heartbeat_seconds=3600)
+    fake_db.create_alert("Disk full", "critical", "test")
+
+    busy = watcher.tick()
+    assert (busy.alerts_scanned, busy.incidents_created) == (1, 1)
+    assert watcher.interval == 1
+    assert watcher.watermark is not None
+
+    intervals = [watcher.tick() and watcher.interval for _ in range(4)]
+    assert intervals == [2, 4, 8, 8]
+
+    fake_db.create_alert("Disk full again", "high", "test")
+    assert watcher.tick().incidents_created == 1
+    assert watcher.interval == 1
+    runs = [e for e in fake_db.audit_events if e["action"] == "watcher_run"]
+    assert len(runs) == 2
+
+
+def test_stop_ends_loop_and_releases_lease(fake_db):
+    watcher = Watcher(fake_db, holder="a", min_interval=0.01, max_interval=0.01)
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    watcher.stop()
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+    assert fake_db.leases == {}
+
+
+class QueueListener:
+    def __init__(self):
+        self.queue = []
+        self.closed = False
+
+    def wait(self, timeout):
+        if self.queue:
+            batch, self.queue = self.queue, []
+            return batch
+        time.sleep(min(timeout, 0.01))
+        return []
+
+    def close(self):
+        self.closed = True
+
+
+def test_pushed_alert_is_escalated_without_waiting_for_sweep(fake_db):
+    listener = QueueListener()
+    watcher = Watcher(fake_db, holder="a", min_interval=60, max_interval=60, listener=listener)
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 2
+        while watcher.ticks == 0 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        listener.queue.append(fake_db.create_alert("Pushed", "critical", "test"))
+        while not fake_db.incidents and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert len(fake_db.incidents) == 1
+        assert watcher.ticks == 1
+    finally:
+        watcher.stop()
+        thread.join(timeout=3)
+    assert listener.closed
+
+
+@pytest.mark.skipif(not os.getenv("OPSBOARD_TEST_DATABASE_URL"), reason="needs a local Postgres")
+def test_pg_listener_receives_trigger_notification():
+    psycopg = pytest.importorskip("psycopg")
+    dsn = os.environ["OPSBOARD_TEST_DATABASE_URL"]
+    migrations = Path(__file__).resolve().parent.parent / "migrations"
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute((migrations / "001_init.sql").read_text())
+        conn.execute((migrations / "008_alert_notify.sql").read_text())
+
+    listener = PgAlertListener(dsn)
+    alert_id = str(uuid.uuid4())
+    try:
+        assert listener.wait(0.1) == []
+        with psycopg.connect(dsn, autocommit=True) as conn:
+            conn.execute(
+                "insert into public.alerts (id, title, severity) values (%s, 'Push test', 'high'), (%s, 'Low', 'low')",
+                (alert_id, str(uuid.uuid4())),
+            )
+        received = listener.wait(5)
+        assert [alert["id"] for alert in received] == [alert_id]
+        assert received[0]["severity"] == "high"
+    finally:
+        listener.close()
+        with psycopg.connect(dsn, autocommit=True) as conn:
+            conn.execute("delete from public.alerts where title in ('Push test', 'Low')")